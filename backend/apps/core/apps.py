@@ -5,3 +5,11 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Core'
+    
+    def ready(self):
+        from django.conf import settings
+        from . import audit, checks  # noqa: F401
+        from .metrics import install_serializer_timing
+        
+        if settings.METRICS_ENABLED:
+            install_serializer_timing()
@@ -0,0 +1,250 @@
+"""
+Buffered audit log writer.
+
+log_admin_action() queues AuditLog entries in memory instead of inserting
+them on the request path. Entries are written with bulk_create when:
+
+- the buffer reaches AUDIT_BATCH_SIZE (flushed by the background thread),
+- AUDIT_FLUSH_INTERVAL seconds have passed,
+- the request finishes (after the response has been handed to the server),
+- the process exits.
+
+If the database rejects a flush, or the buffer backs up past
+AUDIT_MAX_PENDING while a slow flush is running, entries are appended to the
+JSONL spool file at AUDIT_SPOOL_PATH (when configured) and loaded later with
+`python manage.py drain_audit_spool`.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, close_old_connections, transaction
+from django.dispatch import receiver
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+SPOOL_FIELDS = ('admin_user_id', 'action', 'resource_type', 'resource_id', 'details', 'success')
+
+
+def entry_to_record(entry):
+    """Serializable dict of an unsaved AuditLog entry (spool line)."""
+    record = {field: getattr(entry, field) for field in SPOOL_FIELDS}
+    record['created_at'] = entry.created_at.isoformat()
+    return record
+
+
+def record_to_entry(record):
+    """Unsaved AuditLog entry from a spool line."""
+    from .models import AuditLog
+    values = {field: record.get(field) for field in SPOOL_FIELDS}
+    return AuditLog(created_at=parse_datetime(record['created_at']), **values)
+
+
+class AuditWriter:
+    """
+    Process-wide audit entry buffer with a background flusher thread.
+
+    Args:
+        batch_size (int): Entries per bulk_create; reaching it wakes the flusher
+        flush_interval (float): Maximum seconds an entry waits in the buffer
+        max_pending (int): Buffered entries above which new entries go to the
+            spool while a flush is running
+        spool_path (str): Append-only JSONL spool file, or None to disable
+    """
+
+    def __init__(self, batch_size=100, flush_interval=2.0, max_pending=5000, spool_path=None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.spool_path = spool_path
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _ensure_thread(self):
+        # After a fork (gunicorn preload) the flusher thread does not exist
+        # in the child, and the inherited buffer belongs to the parent
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._buffer = []
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush failed")
+            finally:
+                close_old_connections()
+
+    def enqueue(self, entry):
+        """
+        Queue an unsaved AuditLog entry.
+        Never blocks on the database.
+        """
+        with self._lock:
+            self._ensure_thread()
+            if (self.spool_path and len(self._buffer) >= self.max_pending
+                    and self._flush_lock.locked()):
+                overflow = True
+            else:
+                overflow = False
+                self._buffer.append(entry)
+                pending = len(self._buffer)
+
+        if overflow:
+            self.spool([entry])
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+
+    def pending(self):
+        """Number of entries waiting to be written."""
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self):
+        """
+        Write all buffered entries with bulk_create.
+
+        Returns:
+            int: Number of entries written to the database
+        """
+        from .models import AuditLog
+
+        with self._flush_lock:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return 0
+
+            try:
+                with transaction.atomic():
+                    AuditLog.objects.bulk_create(entries, batch_size=self.batch_size)
+            except DatabaseError:
+                logger.exception(f"Could not write {len(entries)} audit entries")
+                if self.spool_path:
+                    self.spool(entries)
+                else:
+                    # Keep them for the next attempt rather than losing them
+                    with self._lock:
+                        self._buffer[:0] = entries
+                return 0
+            return len(entries)
+
+    def spool(self, entries):
+        """Append entries to the spool file (one JSON object per line)."""
+        lines = ''.join(
+            json.dumps(entry_to_record(entry), separators=(',', ':')) + '\n'
+            for entry in entries
+        )
+        with self._lock:
+            with open(self.spool_path, 'a', encoding='utf-8') as spool_file:
+                spool_file.write(lines)
+                spool_file.flush()
+                os.fsync(spool_file.fileno())
+        logger.warning(f"Spooled {len(entries)} audit entries to {self.spool_path}")
+
+    def close(self):
+        """Flush on shutdown; spool whatever the database does not take."""
+        if self._pid != os.getpid():
+            return
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Audit flush at shutdown failed")
+        remaining = self.pending()
+        if remaining and self.spool_path:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            self.spool(entries)
+        elif remaining:
+            logger.error(f"{remaining} audit entries could not be written at shutdown")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer():
+    """Get the process-wide audit writer, creating it on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter(
+                    batch_size=settings.AUDIT_BATCH_SIZE,
+                    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+                    max_pending=settings.AUDIT_MAX_PENDING,
+                    spool_path=settings.AUDIT_SPOOL_PATH
+                )
+                atexit.register(_writer.close)
+    return _writer
+
+
+def flush_audit_log():
+    """Write buffered audit entries now (e.g. before reading the audit table)."""
+    if _writer is not None:
+        return _writer.flush()
+    return 0
+
+
+@receiver(request_finished)
+def flush_audit_log_on_request_end(sender, **kwargs):
+    """
+    Flush entries buffered by the request. request_finished fires when the
+    server closes the response, so the client is not kept waiting.
+    """
+    if settings.AUDIT_FLUSH_ON_REQUEST_END and _writer is not None and _writer.pending():
+        try:
+            _writer.flush()
+        except Exception:
+            logger.exception("Audit flush at request end failed")
+
+
+def drain_spool(spool_path, batch_size=1000):
+    """
+    Load a spool file into the database and remove it.
+    The file is renamed first, so entries spooled meanwhile go to a new file.
+
+    Returns:
+        int: Number of entries written
+    """
+    from .models import AuditLog
+
+    if not os.path.exists(spool_path):
+        return 0
+
+    draining_path = f'{spool_path}.draining'
+    if not os.path.exists(draining_path):
+        os.replace(spool_path, draining_path)
+
+    written = 0
+    batch = []
+    with open(draining_path, encoding='utf-8') as spool_file, transaction.atomic():
+        for line in spool_file:
+            if not line.strip():
+                continue
+            batch.append(record_to_entry(json.loads(line)))
+            if len(batch) >= batch_size:
+                AuditLog.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            AuditLog.objects.bulk_create(batch)
+            written += len(batch)
+
+    os.remove(draining_path)
+    return written
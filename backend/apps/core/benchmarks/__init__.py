@@ -0,0 +1,16 @@
+"""
+Performance benchmarks for ShieldHer.
+
+Endpoint benchmarks (`python manage.py benchmark_endpoints`) seed a throwaway
+test database with factory-generated data at production-like volumes and
+replay requests through the full middleware stack, recording latency
+percentiles and queries per request. Results are written as JSON and
+compared against a stored baseline with `python manage.py benchmark_compare`.
+
+Micro-benchmarks (`python manage.py benchmark_micro`) time the CPU-bound
+functions behind the public POST endpoints (PII processing, chatbot,
+encryption) without a database; compare them with
+`benchmark_compare --suite micro`.
+
+Endpoint benchmarks require the development requirements (factory-boy, Faker).
+"""
@@ -0,0 +1,177 @@
+"""
+Endpoint scenarios replayed through the Django test client.
+
+Each request goes through the full middleware and DRF stack (throttling,
+authentication, serializers, audit buffering) against the seeded database;
+only the network hop is skipped. Every anonymous request gets its own client
+address so the anonymous rate limit does not turn the run into 429s.
+"""
+
+import json
+import statistics
+import time
+import uuid
+
+from django.core.cache import cache
+from django.test import Client
+
+from apps.core.querybudget import inspect_queries
+
+REPORT_SENTENCES = [
+    "Someone has been sending me threatening messages every night.",
+    "A former colleague keeps posting edited photos of me online.",
+    "I think my phone is being tracked, the same person always knows where I am.",
+    "An account impersonating me is messaging my friends and asking for money.",
+]
+CHATBOT_MESSAGES = [
+    "I need help",
+    "Someone is stalking me online, what should I do?",
+    "How do I report harassment on social media?",
+    "I feel unsafe at home",
+    "What are my legal rights if someone shares my photos?",
+]
+SEARCH_TERMS = ['safety', 'password', 'privacy', 'report', 'harassment', 'account', 'legal']
+
+
+class BenchmarkError(Exception):
+    """A scenario request returned an unexpected status."""
+
+
+class Scenario:
+    """
+    One benchmarked request.
+
+    path, payload and headers may be callables taking the iteration number,
+    so each request can vary (search terms, idempotency keys, ...).
+    """
+
+    def __init__(self, name, method, path, payload=None, headers=None,
+                 admin=False, cold_cache=False, expected_status=200):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.headers = headers
+        self.admin = admin
+        self.cold_cache = cold_cache
+        self.expected_status = expected_status
+
+    @staticmethod
+    def _value(value, iteration):
+        return value(iteration) if callable(value) else value
+
+    def send(self, client, iteration, auth_header=None):
+        headers = dict(self._value(self.headers, iteration) or {})
+        if self.admin and auth_header:
+            headers['Authorization'] = auth_header
+        extra = {'REMOTE_ADDR': _client_address(iteration), 'headers': headers}
+        path = self._value(self.path, iteration)
+        payload = self._value(self.payload, iteration)
+        if self.method == 'GET':
+            return client.get(path, payload, **extra)
+        return client.generic(
+            self.method, path, _json(payload), content_type='application/json', **extra
+        )
+
+
+def _json(payload):
+    return json.dumps(payload) if payload is not None else ''
+
+
+def _client_address(iteration):
+    return f'10.{(iteration >> 16) & 255}.{(iteration >> 8) & 255}.{iteration & 255}'
+
+
+def _report_payload(iteration):
+    sentences = REPORT_SENTENCES * (1 + iteration % 8)
+    return {
+        'incident_type': 'harassment',
+        'description': ' '.join(sentences),
+        'timestamp': '2025-06-01T12:00:00Z',
+        'location_free_text': 'Online',
+    }
+
+
+SCENARIOS = [
+    Scenario('report_create', 'POST', '/api/reports/', payload=_report_payload, expected_status=201),
+    Scenario('report_stats', 'GET', '/api/reports/stats/', admin=True),
+    Scenario('report_stats_daily', 'GET', '/api/reports/stats/',
+             payload={'granularity': 'day'}, admin=True),
+    Scenario('chatbot_message', 'POST', '/api/chatbot/message/',
+             payload=lambda i: {'message': CHATBOT_MESSAGES[i % len(CHATBOT_MESSAGES)]}),
+    Scenario('lesson_list', 'GET', '/api/lessons/'),
+    Scenario('lesson_list_uncached', 'GET', '/api/lessons/', cold_cache=True),
+    Scenario('lesson_search', 'GET', '/api/lessons/',
+             payload=lambda i: {'search': SEARCH_TERMS[i % len(SEARCH_TERMS)]}, cold_cache=True),
+    Scenario('resource_search', 'GET', '/api/resources/',
+             payload=lambda i: {'search': SEARCH_TERMS[i % len(SEARCH_TERMS)]}, cold_cache=True),
+    Scenario('donation_create', 'POST', '/api/donations/',
+             payload={'amount': '25.00', 'currency': 'USD', 'is_anonymous': True},
+             headers=lambda i: {'Idempotency-Key': uuid.uuid4().hex}, expected_status=202),
+]
+
+
+def get_admin_auth_header():
+    """Bearer token for a benchmark superuser (created in the benchmark database)."""
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    User = get_user_model()
+    user = User.objects.filter(username='benchmark-admin').first()
+    if user is None:
+        user = User.objects.create_superuser(
+            username='benchmark-admin', email='benchmark@example.org', password=uuid.uuid4().hex
+        )
+    return f'Bearer {RefreshToken.for_user(user).access_token}'
+
+
+def summarize(latencies, queries):
+    """
+    Returns:
+        dict: Iterations, latency mean/percentiles/max in milliseconds and
+        median/max queries per request
+    """
+    ms = sorted(value * 1000 for value in latencies)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method='inclusive')
+    else:
+        cuts = ms * 99
+    return {
+        'iterations': len(ms),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'p50_ms': round(cuts[49], 3),
+        'p95_ms': round(cuts[94], 3),
+        'p99_ms': round(cuts[98], 3),
+        'max_ms': round(ms[-1], 3),
+        'queries': statistics.median(queries),
+        'max_queries': max(queries),
+    }
+
+
+def run_scenario(scenario, iterations=200, warmup=10, auth_header=None, client=None):
+    """
+    Replay a scenario and measure it; warmup requests are not recorded.
+
+    Returns:
+        dict: See summarize()
+    """
+    client = client or Client()
+    latencies, queries = [], []
+    for iteration in range(warmup + iterations):
+        if scenario.cold_cache:
+            cache.clear()
+        with inspect_queries() as inspector:
+            start = time.perf_counter()
+            response = scenario.send(client, iteration, auth_header)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        if response.status_code != scenario.expected_status:
+            raise BenchmarkError(
+                f"{scenario.name}: expected {scenario.expected_status}, "
+                f"got {response.status_code}: {response.content[:300]!r}"
+            )
+        if iteration >= warmup:
+            latencies.append(elapsed)
+            queries.append(inspector.count)
+    return summarize(latencies, queries)
@@ -0,0 +1,123 @@
+"""
+factory_boy factories producing realistic ShieldHer data for benchmarks.
+
+Rows are built in memory (build_batch) and inserted in bulk by
+apps.core.benchmarks.seed; save() side effects that bulk_create skips
+(encryption, confirmation codes) are done by the factories themselves.
+"""
+
+from datetime import timedelta
+
+import factory
+from factory import fuzzy
+from factory.random import randgen
+from django.utils import timezone
+from faker import Faker
+
+from apps.core.codes import format_code
+from apps.core.utils import encrypt_field
+from apps.donations.models import Donation
+from apps.lessons.models import Lesson
+from apps.reports.models import Report
+from apps.resources.models import Resource
+
+HISTORY_DAYS = 365
+
+fake = Faker()
+
+INCIDENT_SENTENCES = [
+    "Someone keeps sending me threatening messages from new accounts.",
+    "My former partner created a fake profile using my photos.",
+    "I am being followed to work and the same car waits outside my building.",
+    "A group chat shared private pictures of me without my consent.",
+    "I receive dozens of abusive comments every time I post.",
+    "They tracked my location through a shared family account.",
+]
+
+
+def _choices(choices):
+    return [value for value, _ in choices]
+
+
+def _created_at(days=HISTORY_DAYS):
+    """Creation times spread over the last `days` days."""
+    return factory.LazyFunction(
+        lambda: timezone.now() - timedelta(seconds=randgen.uniform(0, days * 86400))
+    )
+
+
+class LessonFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Lesson
+
+    title = factory.Faker('sentence', nb_words=6)
+    description = factory.Faker('paragraph', nb_sentences=4)
+    category = fuzzy.FuzzyChoice(_choices(Lesson.CATEGORY_CHOICES))
+    difficulty = fuzzy.FuzzyChoice(_choices(Lesson.DIFFICULTY_CHOICES))
+    duration_minutes = fuzzy.FuzzyInteger(5, 45)
+    content = factory.LazyFunction(
+        lambda: {'sections': [
+            {'heading': fake.sentence(), 'body': fake.paragraph(nb_sentences=8)}
+            for _ in range(3)
+        ]}
+    )
+    quiz = factory.LazyFunction(lambda: {'questions': []})
+    published = True
+    created_at = _created_at()
+    updated_at = factory.SelfAttribute('created_at')
+
+
+class ResourceFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Resource
+
+    title = factory.Faker('sentence', nb_words=5)
+    description = factory.Faker('paragraph', nb_sentences=3)
+    content = factory.Faker('text', max_nb_chars=3000)
+    category = fuzzy.FuzzyChoice(_choices(Resource.CATEGORY_CHOICES))
+    resource_type = fuzzy.FuzzyChoice(_choices(Resource.TYPE_CHOICES))
+    external_url = factory.Faker('url')
+    tags = factory.Faker('words', nb=3)
+    is_published = True
+    created_at = _created_at()
+    updated_at = factory.SelfAttribute('created_at')
+
+
+class ReportFactory(factory.django.DjangoModelFactory):
+    """Reports as stored: description encrypted, code in the SH-YYYY-XXXXXX format."""
+
+    class Meta:
+        model = Report
+
+    class Params:
+        plaintext = factory.LazyFunction(
+            lambda: ' '.join(randgen.choices(INCIDENT_SENTENCES, k=randgen.randint(1, 8)))
+        )
+
+    confirmation_code = factory.Sequence(lambda n: format_code("SH", n))
+    incident_type = fuzzy.FuzzyChoice(_choices(Report.INCIDENT_TYPE_CHOICES))
+    description = factory.LazyAttribute(lambda o: encrypt_field(o.plaintext))
+    created_at = _created_at()
+    updated_at = factory.SelfAttribute('created_at')
+    timestamp = factory.LazyAttribute(
+        lambda o: o.created_at - timedelta(hours=randgen.uniform(0, 72))
+    )
+    location_free_text = factory.Faker('city')
+    evidence_links = factory.LazyFunction(list)
+    consent_for_followup = factory.Faker('boolean', chance_of_getting_true=20)
+    redaction_applied = factory.Faker('boolean', chance_of_getting_true=15)
+
+
+class DonationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Donation
+
+    confirmation_code = factory.Sequence(lambda n: format_code("DON", n))
+    amount = fuzzy.FuzzyDecimal(1, 500)
+    currency = fuzzy.FuzzyChoice(['USD', 'USD', 'USD', 'EUR', 'GBP'])
+    is_anonymous = factory.Faker('boolean', chance_of_getting_true=60)
+    donor_email = factory.Maybe('is_anonymous', yes_declaration='', no_declaration=factory.Faker('email'))
+    status = fuzzy.FuzzyChoice(['completed'] * 18 + ['failed', 'refunded'])
+    payment_intent_id = factory.Sequence(lambda n: f"pi_bench_{n:08d}")
+    created_at = _created_at()
+    updated_at = factory.SelfAttribute('created_at')
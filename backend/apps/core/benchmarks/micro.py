@@ -0,0 +1,256 @@
+"""
+Micro-benchmarks for the CPU-bound functions on every public POST.
+
+Measures PII processing (reports and donation messages), the chatbot
+matcher and field encryption over generated corpora, from short messages
+to 5000-character report descriptions, plus adversarial inputs built to
+trigger regex backtracking. Reports throughput in operations and input
+bytes per second. No database access is needed.
+"""
+
+import random
+import string
+import time
+
+SIZES = {
+    'short_200': 200,
+    'medium_1000': 1000,
+    'long_5000': 5000,
+}
+
+SENTENCES = [
+    "He keeps sending messages late at night and I do not know what to do.",
+    "The account started following all of my friends last month.",
+    "I reported the profile twice but it is still online.",
+    "She said she would share the pictures if I stopped answering.",
+    "They posted my workplace in a public group yesterday.",
+    "My name is Maria Lopez and my number is 555-123-4567.",
+    "You can reach me at survivor.help@example.org if needed.",
+    "I live near 42 Oak Street and I see the car every morning.",
+]
+CHATBOT_MESSAGES = [
+    "I need help",
+    "I feel unsafe and I am scared right now",
+    "How do I get a restraining order?",
+    "Where can I find a shelter for me and my kids?",
+    "I can't afford rent after leaving, is there financial assistance?",
+    "hello",
+]
+
+
+def _text(size, rng):
+    """Natural-looking report text of exactly size characters (some with PII)."""
+    parts = []
+    length = 0
+    while length < size:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return ' '.join(parts)[:size]
+
+
+def adversarial_inputs(size=5000):
+    """
+    Inputs that are cheap to send but expensive for backtracking regexes:
+    long runs that almost match a pattern and fail at the end.
+    """
+    return {
+        'adv_digits': '1' * size,
+        'adv_digit_groups': ('123-456-' * size)[:size],
+        'adv_email_no_tld': ('a.' * size)[:size - 1] + '@',
+        'adv_at_dots': ('a@' + 'b.' * size)[:size],
+        'adv_capitalized': ('Aaaa ' * size)[:size],
+        'adv_name_intro': ("i am " * size)[:size],
+        'adv_whitespace': ' ' * size,
+        'adv_plus_digits': ('+1' * size)[:size],
+    }
+
+
+def build_corpora(seed=42):
+    """
+    Returns:
+        dict: corpus name -> list of texts
+    """
+    rng = random.Random(seed)
+    corpora = {name: [_text(size, rng) for _ in range(20)] for name, size in SIZES.items()}
+    corpora['random_5000'] = [
+        ''.join(rng.choices(string.ascii_letters + string.digits + ' .@-+()', k=5000))
+        for _ in range(5)
+    ]
+    for name, text in adversarial_inputs().items():
+        corpora[name] = [text]
+    return corpora
+
+
+# Fragments recombined by the fuzzer: pieces of PII shapes that almost match
+FUZZ_FRAGMENTS = [
+    '1', '12', '123', '1234', '-', '.', ' ', '(', ')', '+', '+1', '@', 'a', 'a.', 'b@',
+    'Aaaa', 'Aaaa ', 'i am ', 'my name is ', '42 ', 'Oak ', 'Street', '\n', '%', '_',
+]
+
+
+def fuzz_inputs(count=200, size=5000, seed=42):
+    """Random recombinations of FUZZ_FRAGMENTS, each size characters long."""
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(count):
+        # A short random vocabulary repeated, so runs of near-matches form
+        vocabulary = rng.sample(FUZZ_FRAGMENTS, rng.randint(1, 4))
+        parts, length = [], 0
+        while length < size:
+            fragment = rng.choice(vocabulary)
+            parts.append(fragment)
+            length += len(fragment)
+        inputs.append(''.join(parts)[:size])
+    return inputs
+
+
+def pii_worst_case(func, sizes=(1250, 2500, 5000), fuzz_count=200, seed=42):
+    """
+    Worst-case cost of a PII function on hostile input.
+
+    Times every adversarial input at each size and a fuzzed corpus at the
+    largest size. growth is the worst time ratio between consecutive sizes
+    divided by their length ratio: about 1 for linear scanning, about 2 per
+    doubling for quadratic backtracking.
+
+    Returns:
+        dict: worst_ms (slowest single input of the largest size), its
+        input name and growth
+    """
+    timings = {}
+    for size in sizes:
+        for name, text in adversarial_inputs(size).items():
+            timings[(name, size)] = _time_once(func, text)
+
+    largest = sizes[-1]
+    worst_name, worst = max(
+        ((name, seconds) for (name, size), seconds in timings.items() if size == largest),
+        key=lambda item: item[1]
+    )
+    for index, text in enumerate(fuzz_inputs(fuzz_count, largest, seed)):
+        seconds = _time_once(func, text)
+        if seconds > worst:
+            worst_name, worst = f'fuzz_{index}', seconds
+
+    growth = 0.0
+    names = {name for name, _ in timings}
+    for smaller, larger in zip(sizes, sizes[1:]):
+        for name in names:
+            ratio = timings[(name, larger)] / max(timings[(name, smaller)], 1e-9)
+            growth = max(growth, ratio / (larger / smaller))
+    return {'worst_ms': round(worst * 1000, 3), 'worst_input': worst_name, 'growth': round(growth, 2)}
+
+
+def _time_once(func, text, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+PII_FUNCTIONS = {'process_report_text', 'detect_pii', 'redact_pii'}
+
+
+def _benchmarks():
+    """
+    name -> (function of one input, corpora it runs on, optional function
+    turning a corpus into inputs outside the timed loop).
+    """
+    from apps.core.utils import decrypt_field, detect_pii, encrypt_field, redact_pii
+    from apps.reports.utils import process_report_text
+    from apps.resources.chatbot import EnhancedChatbot
+
+    text_corpora = list(SIZES) + ['random_5000'] + list(adversarial_inputs())
+
+    def encrypted(texts):
+        return [encrypt_field(text) for text in texts]
+
+    return {
+        'process_report_text': (process_report_text, text_corpora, None),
+        'detect_pii': (detect_pii, text_corpora, None),
+        'redact_pii': (redact_pii, text_corpora, None),
+        'chatbot_get_response': (EnhancedChatbot.get_response, ['chatbot'] + list(SIZES), None),
+        'encrypt_field': (encrypt_field, list(SIZES), None),
+        'decrypt_field': (decrypt_field, list(SIZES), encrypted),
+    }
+
+
+def measure(func, inputs, min_time=0.2, repeat=5):
+    """
+    Time func over inputs, timeit style: the inputs are cycled until a run
+    lasts min_time, and the best of repeat runs is kept.
+
+    Returns:
+        dict: ops_per_sec, mean_us per call and calls per run
+    """
+    # Calibrate the number of calls per run
+    calls = len(inputs)
+    while True:
+        elapsed = _run(func, inputs, calls)
+        if elapsed >= min_time or calls >= 10_000_000:
+            break
+        calls = calls * 2 if elapsed <= 0 else max(calls * 2, int(calls * min_time / elapsed * 1.1))
+
+    best = min([elapsed] + [_run(func, inputs, calls) for _ in range(repeat - 1)])
+    return {
+        'ops_per_sec': round(calls / best, 1),
+        'mean_us': round(best / calls * 1e6, 3),
+        'calls': calls,
+    }
+
+
+def _run(func, inputs, calls):
+    count = len(inputs)
+    start = time.perf_counter()
+    for index in range(calls):
+        func(inputs[index % count])
+    return time.perf_counter() - start
+
+
+def run_micro_benchmarks(only=None, min_time=0.2, repeat=5, seed=42, log=None):
+    """
+    Run every function over each of its corpora.
+
+    Args:
+        only (list): Restrict to these function names
+        min_time (float): Minimum seconds per timed run
+        repeat (int): Timed runs per benchmark (best is kept)
+        seed (int): Corpus generation seed
+        log (callable): Optional callback receiving (name, result)
+
+    Returns:
+        dict: "function/corpus" -> ops_per_sec, bytes_per_sec, mean_us,
+        input_bytes
+    """
+    corpora = build_corpora(seed)
+    corpora['chatbot'] = CHATBOT_MESSAGES
+    results = {}
+    for function_name, (func, corpus_names, prepare) in _benchmarks().items():
+        if only and function_name not in only:
+            continue
+        for corpus_name in corpus_names:
+            texts = corpora[corpus_name]
+            inputs = prepare(texts) if prepare else texts
+            # Throughput is counted in bytes of the original text
+            input_bytes = sum(len(text.encode('utf-8')) for text in texts) / len(texts)
+            result = measure(func, inputs, min_time, repeat)
+            result['input_bytes'] = round(input_bytes)
+            result['bytes_per_sec'] = round(result['ops_per_sec'] * input_bytes, 1)
+            name = f'{function_name}/{corpus_name}'
+            results[name] = result
+            if log:
+                log(name, result)
+        if function_name in PII_FUNCTIONS:
+            name = f'{function_name}/worst_case'
+            results[name] = pii_worst_case(func, seed=seed)
+            if log:
+                log(name, results[name])
+    return results
+
+
+def benchmark_names():
+    return list(_benchmarks())
@@ -0,0 +1,161 @@
+"""
+Benchmark result files and baseline comparison.
+
+A result file is JSON:
+
+    {
+        "suite": "endpoints",
+        "created_at": "...",
+        "environment": {"python": "...", "database": "sqlite", ...},
+        "parameters": {...},
+        "results": {"report_create": {"p95_ms": 12.3, "queries": 2, ...}, ...}
+    }
+
+The committed baseline of a suite lives at BENCHMARK_DIR/<suite>-baseline.json
+and the latest run at BENCHMARK_DIR/<suite>-latest.json. Baselines are only
+comparable on the same machine and database, so environment is recorded
+and shown when comparing.
+"""
+
+import json
+import os
+import platform
+import sys
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+# Metric -> True when lower values are better
+METRIC_DIRECTIONS = {
+    'p50_ms': True,
+    'p95_ms': True,
+    'p99_ms': True,
+    'queries': True,
+    'worst_ms': True,
+    'ops_per_sec': False,
+    'bytes_per_sec': False,
+}
+# Deterministic metrics: any increase is a regression, whatever the threshold
+EXACT_METRICS = {'queries'}
+
+
+def baseline_path(suite):
+    return Path(settings.BENCHMARK_DIR) / f'{suite}-baseline.json'
+
+
+def latest_path(suite):
+    return Path(settings.BENCHMARK_DIR) / f'{suite}-latest.json'
+
+
+def get_environment(database=True):
+    environment = {
+        'python': platform.python_version(),
+        'implementation': sys.implementation.name,
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+    if database:
+        environment['database'] = connection.vendor
+    return environment
+
+
+def build_report(suite, results, parameters=None, database=True):
+    return {
+        'suite': suite,
+        'created_at': timezone.now().isoformat(),
+        'environment': get_environment(database),
+        'parameters': parameters or {},
+        'results': results,
+    }
+
+
+def write_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+    return path
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def describe_differences(baseline, current):
+    """
+    Returns:
+        list: Reasons why two result files may not be comparable
+    """
+    differences = []
+    if baseline.get('environment') != current.get('environment'):
+        differences.append('they come from different environments')
+    base_parameters, current_parameters = baseline.get('parameters', {}), current.get('parameters', {})
+    for key in sorted(set(base_parameters) | set(current_parameters)):
+        if base_parameters.get(key) != current_parameters.get(key):
+            differences.append(
+                f"{key} differs ({base_parameters.get(key)!r} vs {current_parameters.get(key)!r})"
+            )
+    return differences
+
+
+def compare_reports(baseline, current, threshold=0.15):
+    """
+    Compare the tracked metrics of two result files.
+
+    Args:
+        baseline (dict): Baseline report
+        current (dict): New report
+        threshold (float): Relative change tolerated before a timing or
+            throughput metric counts as a regression (0.15 = 15%)
+
+    Returns:
+        list: (benchmark, metric, baseline value, current value, relative
+        change, status) rows; status is ok, regression, improvement, new
+        or missing
+    """
+    rows = []
+    base_results, current_results = baseline['results'], current['results']
+
+    for name in sorted(set(base_results) | set(current_results)):
+        if name not in current_results:
+            rows.append((name, '-', None, None, None, 'missing'))
+            continue
+        if name not in base_results:
+            rows.append((name, '-', None, None, None, 'new'))
+            continue
+        for metric, lower_is_better in METRIC_DIRECTIONS.items():
+            old, new = base_results[name].get(metric), current_results[name].get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float('inf'))
+            worse = change if lower_is_better else -change
+            tolerance = 0 if metric in EXACT_METRICS else threshold
+            if worse > tolerance:
+                status = 'regression'
+            elif worse < -tolerance:
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append((name, metric, old, new, change, status))
+    return rows
+
+
+def format_comparison(rows):
+    """Render compare_reports() rows as an aligned text table."""
+    lines = [f"{'benchmark':<28}{'metric':<15}{'baseline':>14}{'current':>14}{'change':>10}  status"]
+    for name, metric, old, new, change, status in rows:
+        if change is None:
+            lines.append(f"{name:<28}{metric:<15}{'':>14}{'':>14}{'':>10}  {status}")
+            continue
+        change_text = 'inf' if change == float('inf') else f'{change:+.1%}'
+        lines.append(
+            f"{name:<28}{metric:<15}{old:>14.3f}{new:>14.3f}{change_text:>10}  {status}"
+        )
+    return '\n'.join(lines)
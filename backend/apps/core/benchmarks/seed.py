@@ -0,0 +1,119 @@
+"""
+Bulk seeding of benchmark data.
+
+Volumes mirror a busy production deployment; --scale shrinks them for quick
+local runs. Rows are built by the factories and inserted with bulk_create,
+so post_save work is redone here in bulk: daily rollups are rebuilt and, on
+PostgreSQL, search vectors are computed in one UPDATE per table.
+"""
+
+import io
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.db import transaction
+
+from apps.core.search import build_search_vector, uses_postgres_search
+
+VOLUMES = {
+    'reports': 100_000,
+    'donations': 50_000,
+    'lessons': 1_000,
+    'resources': 1_000,
+}
+BATCH_SIZE = 2000
+
+
+@contextmanager
+def preserve_timestamps(model):
+    """
+    Let bulk_create keep factory-generated created_at/updated_at values
+    instead of overwriting them with the current time.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_seed(factory_class, count, batch_size=BATCH_SIZE):
+    """
+    Insert count factory-built rows in batches.
+
+    Returns:
+        int: Number of rows inserted
+    """
+    model = factory_class._meta.model
+    inserted = 0
+    with preserve_timestamps(model):
+        while inserted < count:
+            size = min(batch_size, count - inserted)
+            with transaction.atomic():
+                model.objects.bulk_create(factory_class.build_batch(size), batch_size=size)
+            inserted += size
+    return inserted
+
+
+def get_volumes(scale=1.0):
+    """Target row counts, scaled (at least one row per table)."""
+    return {name: max(1, int(count * scale)) for name, count in VOLUMES.items()}
+
+
+def seed_benchmark_data(scale=1.0, seed=42, log=None):
+    """
+    Bring each table up to its target volume.
+    Existing rows count towards the target, so a kept database is reused.
+
+    Args:
+        scale (float): Multiplier applied to VOLUMES
+        seed (int): Random seed, so repeated runs generate the same data
+        log (callable): Optional progress callback taking a message
+
+    Returns:
+        dict: Table name -> row count after seeding
+    """
+    import factory.random
+
+    from .factories import DonationFactory, LessonFactory, ReportFactory, ResourceFactory, fake
+
+    factory.random.reseed_random(seed)
+    fake.seed_instance(seed)
+    log = log or (lambda message: None)
+
+    factories = {
+        'lessons': LessonFactory,
+        'resources': ResourceFactory,
+        'reports': ReportFactory,
+        'donations': DonationFactory,
+    }
+    counts = {}
+    seeded = set()
+    for name, target in get_volumes(scale).items():
+        factory_class = factories[name]
+        model = factory_class._meta.model
+        existing = model.objects.count()
+        if existing < target:
+            # Continue the sequences used for unique codes after existing rows
+            factory_class.reset_sequence(existing)
+            log(f"Seeding {target - existing} {name}...")
+            bulk_seed(factory_class, target - existing)
+            seeded.add(name)
+        counts[name] = model.objects.count()
+
+    if seeded & {'reports', 'donations'}:
+        log("Rebuilding daily rollups...")
+        call_command('backfill_rollups', stdout=io.StringIO())
+    if uses_postgres_search():
+        for name in seeded & {'lessons', 'resources'}:
+            model = factories[name]._meta.model
+            model.objects.update(search_vector=build_search_vector(model))
+    return counts
+
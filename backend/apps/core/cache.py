@@ -0,0 +1,104 @@
+"""
+Response caching for read-mostly catalog endpoints.
+Serialized list/retrieve responses and their conditional GET validators are
+cached per namespace, scope, path and query string. Each namespace has a version that is bumped whenever one of its
+models is saved or deleted, which makes every older entry unreachable.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from .conditional import ConditionalGetMixin
+from .dbrouter import use_primary
+
+
+def get_catalog_cache():
+    """Get the cache backend configured for catalog responses."""
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f'catalog:version:{namespace}'
+
+
+def get_cache_version(namespace):
+    """
+    Get the current cache version of a namespace.
+    A missing version (first use or eviction) is initialised to the current
+    time, so it can never collide with a version used before.
+    """
+    cache = get_catalog_cache()
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_version_key(namespace), version, timeout=None):
+            version = cache.get(_version_key(namespace), version)
+    return version
+
+
+def bump_cache_version(namespace):
+    """Invalidate all cached responses of a namespace."""
+    get_catalog_cache().set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+class CachedCatalogMixin(ConditionalGetMixin):
+    """
+    ViewSet mixin that caches serialized list and retrieve responses,
+    together with their ETag/Last-Modified validators, so both full and
+    conditional requests are answered without touching the database.
+
+    Cache keys include whether the requester is authenticated, since admins
+    see unpublished/inactive rows that the public must not.
+
+    Attributes:
+        cache_namespace: Name bumped by the model signals to invalidate entries
+    """
+    cache_namespace = None
+
+    def get_cache_scope(self, request):
+        """Public (published-only) or admin scope."""
+        return 'admin' if request.user and request.user.is_authenticated else 'public'
+
+    def get_cache_key(self, request):
+        query = '&'.join(
+            f'{key}={value}'
+            for key, values in sorted(request.query_params.lists())
+            for value in sorted(values)
+        )
+        digest = hashlib.sha256(f'{request.path}?{query}'.encode('utf-8')).hexdigest()[:32]
+        version = get_cache_version(self.cache_namespace)
+        if time.time_ns() - version < settings.DATABASE_REPLICA_MAX_LAG * 1e9:
+            # Versions are bump times: the replica may not have the change yet,
+            # and what is read now gets cached under the new version
+            use_primary()
+        return f'catalog:{self.cache_namespace}:{version}:{self.get_cache_scope(request)}:{digest}'
+
+    def get_validators(self, request, *args, **kwargs):
+        """Use the validators stored with a cached response, or compute them."""
+        self._cache_key = self.get_cache_key(request)
+        self._cache_entry = get_catalog_cache().get(self._cache_key)
+        if self._cache_entry is not None:
+            return self._cache_entry['etag'], self._cache_entry['last_modified']
+
+        self._validators = super().get_validators(request, *args, **kwargs)
+        return self._validators
+
+    def get_fresh_response(self, handler, request, *args, **kwargs):
+        """Serve the cached response, or run handler and cache a successful result."""
+        if self._cache_entry is not None:
+            return Response(self._cache_entry['data'])
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and self._validators is not None:
+            etag, last_modified = self._validators
+            get_catalog_cache().set(
+                self._cache_key,
+                {'etag': etag, 'last_modified': last_modified, 'data': response.data},
+                timeout=settings.CATALOG_CACHE_TIMEOUT
+            )
+        return response
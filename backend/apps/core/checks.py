@@ -0,0 +1,23 @@
+"""
+System checks for deployment settings.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_catalog_cache(app_configs, **kwargs):
+    """
+    Refuse a per-process catalog cache outside DEBUG: a save only bumps the
+    cache version in the worker that handled it, so the others would keep
+    serving the old responses until CATALOG_CACHE_TIMEOUT.
+    """
+    backend = settings.CACHES.get(settings.CATALOG_CACHE_ALIAS, {}).get('BACKEND', '')
+    if settings.DEBUG or not backend.endswith('.LocMemCache'):
+        return []
+    return [Error(
+        'The catalog cache uses a per-process LocMemCache.',
+        hint="Set CACHE_BACKEND to 'file' or 'redis' so all workers share invalidations.",
+        id='core.E001',
+    )]
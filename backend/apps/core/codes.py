@@ -0,0 +1,282 @@
+"""
+Confirmation codes for reports and donations.
+
+Codes look like DON-2026-7ZK4Q9M2XDS or SH-2026-04JDWN3RT1F: a prefix, the
+year, 10 Crockford base32 symbols (50 random bits) and a check symbol.
+Codes fit the 20-character model fields for prefixes of up to 4 letters.
+
+The check symbol is itself one of the 32 code symbols, so codes only ever
+contain letters, digits and dashes and need no escaping in URLs or emails.
+It reads the body symbols as a polynomial over GF(32) evaluated at x, which
+catches every single mistyped symbol and every swap of adjacent symbols.
+
+- validate_code / normalize_code check a code's shape and check symbol
+  without touching the database, so lookups of mistyped codes are cheap.
+  Crockford's aliases are accepted (lowercase, O for 0, I and L for 1).
+  Codes in the earlier 6-hex-digit format (SH-2025-A7B9C2) stay valid.
+- save_with_unique_code saves a new row and retries with a fresh code if
+  another row took its code first, instead of failing with a 500.
+- With CONFIRMATION_CODE_POOL_SIZE set, codes come from a per-process pool
+  of candidates checked against the table in one query per refill.
+"""
+
+import re
+import secrets
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+BODY_LENGTH = 10
+BODY_BITS = 5 * BODY_LENGTH
+
+# Crockford decoding aliases for symbols that are easy to mistype
+_ALIASES = str.maketrans({'O': '0', 'I': '1', 'L': '1'})
+_DECODE = {symbol: value for value, symbol in enumerate(ALPHABET)}
+
+CODE_PATTERN = re.compile(r'^([A-Z]{1,4})-(\d{4})-([0-9A-Z]{10})([0-9A-Z])$')
+LEGACY_CODE_PATTERN = re.compile(r'^([A-Z]{1,4})-(\d{4})-([0-9A-F]{6})$')
+
+# Saves attempted before a code collision is raised as an IntegrityError
+CODE_ATTEMPTS = 3
+
+
+def encode(value, length=BODY_LENGTH):
+    """Encode a non-negative integer as fixed-width Crockford base32."""
+    symbols = []
+    for _ in range(length):
+        value, remainder = divmod(value, 32)
+        symbols.append(ALPHABET[remainder])
+    return ''.join(reversed(symbols))
+
+
+def decode(symbols):
+    """Decode Crockford base32 symbols (aliases already resolved) to an integer."""
+    value = 0
+    for symbol in symbols:
+        value = value * 32 + _DECODE[symbol]
+    return value
+
+
+def check_symbol(value):
+    """
+    Check symbol for an encoded integer below 2**50.
+
+    Horner evaluation of sum(symbol_i * x**(BODY_LENGTH - i)) over GF(32)
+    (modulus x**5 + x**2 + 1). Every position has a distinct nonzero weight,
+    so any single changed symbol or adjacent swap changes the result.
+    """
+    check = 0
+    for shift in range(BODY_BITS - 5, -5, -5):
+        check ^= (value >> shift) & 31
+        # Multiply by x
+        check <<= 1
+        if check & 32:
+            check ^= 0b100101
+    return ALPHABET[check]
+
+
+def format_code(prefix, value, year=None):
+    """
+    Build a confirmation code from an integer below 2**50.
+
+    Args:
+        prefix (str): Code prefix, e.g. "SH" or "DON"
+        value (int): Code body value
+        year (int): Year part (default: current year)
+
+    Returns:
+        str: A confirmation code like "SH-2026-04JDWN3RT1F"
+    """
+    year = year or timezone.now().year
+    return f"{prefix}-{year}-{encode(value)}{check_symbol(value)}"
+
+
+def generate_code(prefix):
+    """
+    Generate a random confirmation code.
+
+    Args:
+        prefix (str): Code prefix, e.g. "SH" or "DON"
+
+    Returns:
+        str: A confirmation code with 50 random bits
+    """
+    return format_code(prefix, secrets.randbits(BODY_BITS))
+
+
+def normalize_code(code, prefix=None):
+    """
+    Validate a confirmation code and return its canonical form.
+    No database access.
+
+    Args:
+        code (str): Code as typed by a user
+        prefix (str): Required prefix (default: any)
+
+    Returns:
+        str: The canonical code, or None if the code is malformed or its
+            check symbol does not match
+    """
+    if not isinstance(code, str):
+        return None
+    code = code.strip().upper()
+    parts = code.split('-')
+    if len(parts) == 3:
+        code = f"{parts[0]}-{parts[1]}-{parts[2].translate(_ALIASES)}"
+
+    match = CODE_PATTERN.match(code)
+    if match is not None:
+        value = decode(match.group(3))
+        if match.group(4) != check_symbol(value):
+            return None
+    else:
+        match = LEGACY_CODE_PATTERN.match(code)
+        if match is None:
+            return None
+
+    if prefix is not None and match.group(1) != prefix:
+        return None
+    return code
+
+
+def validate_code(code, prefix=None):
+    """
+    Check a confirmation code's shape and check symbol without a database lookup.
+
+    Returns:
+        bool: True if the code is well-formed
+    """
+    return normalize_code(code, prefix) is not None
+
+
+def unused_codes(model, prefix, count, field='confirmation_code'):
+    """
+    Generate distinct codes not yet used in model's table.
+
+    Args:
+        model: Model class with a unique code field
+        prefix (str): Code prefix
+        count (int): Number of codes
+        field (str): Code field name
+
+    Returns:
+        list: count codes, checked with one query per round
+    """
+    codes = set()
+    while len(codes) < count:
+        candidates = {generate_code(prefix) for _ in range(count - len(codes))} - codes
+        taken = set(
+            model._default_manager.filter(**{f'{field}__in': candidates})
+            .order_by()
+            .values_list(field, flat=True)
+        )
+        codes |= candidates - taken
+    return list(codes)
+
+
+class CodePool:
+    """
+    Per-process pool of pre-checked codes for one model and prefix.
+    Refilled in batches of `size`, so taking a code usually costs no query
+    and saves rarely collide. Codes from a past year are discarded.
+    """
+
+    def __init__(self, model, prefix, size, field='confirmation_code'):
+        self.model = model
+        self.prefix = prefix
+        self.size = size
+        self.field = field
+        self.year = None
+        self.codes = []
+        self.lock = threading.Lock()
+
+    def take(self, count=1):
+        """
+        Returns:
+            list: count unused codes
+        """
+        with self.lock:
+            year = timezone.now().year
+            if year != self.year:
+                self.year = year
+                self.codes = []
+            if len(self.codes) < count:
+                self.codes.extend(unused_codes(
+                    self.model, self.prefix, max(self.size, count) - len(self.codes), self.field
+                ))
+            taken, self.codes = self.codes[:count], self.codes[count:]
+        return taken
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_code_pool(model, prefix, field='confirmation_code'):
+    """
+    Get the code pool for a model and prefix.
+
+    Returns:
+        CodePool: The shared pool, or None if CONFIRMATION_CODE_POOL_SIZE is 0
+    """
+    size = settings.CONFIRMATION_CODE_POOL_SIZE
+    if size <= 0:
+        return None
+
+    key = (model._meta.label, prefix, field)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.size != size:
+            pool = _pools[key] = CodePool(model, prefix, size, field)
+    return pool
+
+
+def new_codes(model, prefix, count=1, field='confirmation_code'):
+    """
+    Codes for new rows: from the pool when enabled, otherwise freshly generated.
+
+    Returns:
+        list: count codes
+    """
+    pool = get_code_pool(model, prefix, field)
+    if pool is not None:
+        return pool.take(count)
+    return [generate_code(prefix) for _ in range(count)]
+
+
+def save_with_unique_code(instance, prefix, save, field='confirmation_code'):
+    """
+    Save a new row under a generated code, retrying with a fresh code if
+    another row already has it.
+
+    Rows that already have a code, and updates, are saved as-is. Inside a
+    transaction the insert runs in a savepoint so a collision can be retried;
+    in autocommit mode the failed insert is simply repeated.
+
+    Args:
+        instance: Model instance being saved
+        prefix (str): Code prefix
+        save (callable): Performs the actual save (e.g. super().save)
+        field (str): Code field name
+    """
+    if getattr(instance, field) or not instance._state.adding:
+        return save()
+
+    model = type(instance)
+    connection = connections[router.db_for_write(model, instance=instance)]
+    for attempt in range(CODE_ATTEMPTS):
+        code = new_codes(model, prefix, field=field)[0]
+        setattr(instance, field, code)
+        try:
+            if connection.in_atomic_block:
+                with transaction.atomic(using=connection.alias):
+                    return save()
+            return save()
+        except IntegrityError:
+            # Only a collision on the code is retried
+            if attempt == CODE_ATTEMPTS - 1 or not model._default_manager.filter(**{field: code}).exists():
+                setattr(instance, field, '')
+                raise
@@ -0,0 +1,102 @@
+"""
+Conditional GET support (ETag / Last-Modified) for read endpoints.
+Validators come from the models' updated_at timestamps, so a 304 can be
+answered without serializing anything.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding ETag and Last-Modified validators to list and retrieve.
+
+    - list: ETag from Max('updated_at') and the row count of the filtered
+      queryset, plus the path and query string (pagination, filters). No
+      Last-Modified: deleting a row does not move Max('updated_at') forward,
+      so If-Modified-Since would answer 304 with the deleted row still listed.
+    - retrieve: ETag and Last-Modified from the row's updated_at.
+
+    Matching If-None-Match / If-Modified-Since requests get a 304.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def _make_etag(self, request, *parts):
+        query = '&'.join(
+            f'{key}={value}'
+            for key, values in sorted(request.query_params.lists())
+            for value in sorted(values)
+        )
+        source = '|'.join([request.path, query, *map(str, parts)])
+        return quote_etag(hashlib.sha256(source.encode('utf-8')).hexdigest()[:32])
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Compute (etag, last_modified) for the current request.
+
+        Returns:
+            tuple: (quoted etag, last-modified datetime, None for lists), or
+            None if the object does not exist (the handler then returns the 404)
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                updated_at = queryset.filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                ).values_list('updated_at', flat=True).first()
+            except (TypeError, ValueError):
+                return None
+            if updated_at is None:
+                return None
+            return self._make_etag(request, updated_at.isoformat()), updated_at
+
+        aggregate = queryset.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        last_modified = aggregate['last_modified']
+        etag = self._make_etag(
+            request,
+            last_modified.isoformat() if last_modified else '',
+            aggregate['count']
+        )
+        return etag, None
+
+    def get_fresh_response(self, handler, request, *args, **kwargs):
+        """Produce the full response (hook for response caching)."""
+        return handler(request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Answer with 304 when the client's copy is current, otherwise the full response."""
+        validators = self.get_validators(request, *args, **kwargs)
+
+        if validators is not None:
+            etag, last_modified = validators
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if not_modified is not None:
+                self._set_validator_headers(not_modified, etag, timestamp)
+                return not_modified
+
+        response = self.get_fresh_response(handler, request, *args, **kwargs)
+
+        if validators is not None and response.status_code == status.HTTP_200_OK:
+            self._set_validator_headers(response, etag, timestamp)
+        return response
+
+    @staticmethod
+    def _set_validator_headers(response, etag, timestamp):
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # Admins can see unpublished rows, so shared caches must key on auth
+        patch_vary_headers(response, ['Authorization'])
@@ -0,0 +1,171 @@
+"""
+Read-replica database routing.
+
+Views opt in to replica reads the way they declare query budgets:
+
+    class LessonViewSet(viewsets.ModelViewSet):
+        replica_actions = {'list', 'retrieve', 'categories'}
+
+    @replica_reads
+    @api_view(['GET'])
+    def some_view(request): ...
+
+ReplicaRoutingMiddleware marks safe (GET, HEAD, OPTIONS) requests to those
+views, and while they run ReplicaRouter sends reads to the
+DATABASE_REPLICA_ALIAS connection, including reads made while a streaming
+response is generated. Everything else goes to the primary ('default'):
+writes, reads inside a transaction, reads of other requests, and every read
+after the request wrote to the primary, so a request never reads around its
+own write.
+
+Without the replica alias in DATABASES everything uses the primary.
+"""
+
+import contextvars
+import re
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_WRITE_STATEMENT = re.compile(
+    r'\s*(INSERT|UPDATE|DELETE|MERGE|REPLACE|CREATE|ALTER|DROP|TRUNCATE|COPY)\b', re.IGNORECASE
+)
+
+_state = contextvars.ContextVar('db_routing', default=None)
+
+
+class RoutingState:
+    """Routing decision for one request (or route_reads block)."""
+
+    def __init__(self, use_replica=False):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def get_replica_alias():
+    """The configured replica alias, or None if it is not in DATABASES."""
+    alias = settings.DATABASE_REPLICA_ALIAS
+    if alias and alias != DEFAULT_DB_ALIAS and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+def activate(state):
+    """Apply a routing state to the current context; returns a token for deactivate()."""
+    return _state.set(state)
+
+
+def deactivate(token):
+    _state.reset(token)
+
+
+class WriteDetector:
+    """
+    connection.execute_wrapper callback on the primary that sticks the
+    routing state to the primary once a writing statement runs.
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.state.wrote and _WRITE_STATEMENT.match(sql):
+            self.state.wrote = True
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def routing(state):
+    """Apply a routing state, and watch the primary for writes, inside the block."""
+    token = activate(state)
+    try:
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(WriteDetector(state)):
+            yield state
+    finally:
+        deactivate(token)
+
+
+def route_reads(use_replica=True):
+    """
+    Route the reads of a block as a replica-enabled request would be,
+    e.g. in management commands or tests.
+    """
+    return routing(RoutingState(use_replica))
+
+
+def use_primary():
+    """Send the rest of the current request's reads to the primary."""
+    state = _state.get()
+    if state is not None:
+        state.wrote = True
+
+
+def replica_reads(view):
+    """
+    Decorator letting a function view read from the replica.
+    Apply it above @api_view so it marks the final view function.
+    """
+    view.replica_reads = True
+    return view
+
+
+def view_uses_replica(view_func, method):
+    """
+    Whether a request may read from the replica: a safe method on a view
+    declaring replica_actions (ViewSets) or marked @replica_reads.
+    """
+    if method not in SAFE_METHODS:
+        return False
+    if getattr(view_func, 'replica_reads', False):
+        return True
+
+    view_class = getattr(view_func, 'cls', None)
+    actions = getattr(view_func, 'actions', None) or {}
+    return actions.get(method.lower()) in (getattr(view_class, 'replica_actions', None) or ())
+
+
+def stream_with_routing(content, state):
+    """
+    Iterate a streaming response's content under the request's routing
+    state; the content is generated after the middleware has returned.
+    """
+    iterator = iter(content)
+    while True:
+        with routing(state):
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+
+class ReplicaRouter:
+    """Database router for DATABASE_ROUTERS (see module docstring)."""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None:
+            return None
+        if not state.use_replica or state.wrote:
+            return DEFAULT_DB_ALIAS
+
+        alias = get_replica_alias()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Reads inside a transaction must see its writes
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Also asked when no write follows (e.g. assigning a related object),
+        # so stickiness comes from WriteDetector instead
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        aliases = {DEFAULT_DB_ALIAS, get_replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,240 @@
+"""
+Index analysis for the project's models (manage.py index_advisor).
+
+Every index a model creates is collected from its field flags (primary key,
+unique, db_index, foreign keys), Meta.indexes and unique constraints. An
+index is redundant when another plain B-tree index starts with the same
+columns: every lookup it serves is served by the other one, and each INSERT
+pays for maintaining both. Unique indexes are only redundant next to another
+unique index on the same columns, since they also enforce a constraint.
+
+On PostgreSQL, indexes never scanned since statistics were last reset are
+read from pg_stat_user_indexes.
+"""
+
+from django.apps import apps
+from django.db import connection, migrations, models
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+# Declarations in the order they are kept when two of them duplicate each other
+PRIMARY_KEY = 'primary key'
+UNIQUE_CONSTRAINT = 'unique constraint'
+UNIQUE_FIELD = 'unique field'
+META_INDEX = 'Meta.indexes'
+FOREIGN_KEY = 'foreign key'
+DB_INDEX = 'db_index field'
+PRECEDENCE = [PRIMARY_KEY, UNIQUE_CONSTRAINT, UNIQUE_FIELD, META_INDEX, FOREIGN_KEY, DB_INDEX]
+
+
+class IndexInfo:
+    """An index a model creates, as columns with their sort direction."""
+
+    def __init__(self, model, source, columns, unique=False, plain=True, field=None, declaration=None):
+        self.model = model
+        self.source = source
+        self.columns = tuple(columns)
+        self.unique = unique
+        self.plain = plain
+        self.field = field
+        self.declaration = declaration
+
+    @property
+    def label(self):
+        columns = ', '.join(f"{column}{' DESC' if descending else ''}" for column, descending in self.columns)
+        if self.field is not None:
+            name = self.field.name
+        else:
+            name = getattr(self.declaration, 'name', 'unique_together')
+        return f"{self.source} {name} ({columns})"
+
+    def covers(self, other):
+        """
+        True if this index serves every lookup and ordering other does.
+        """
+        if not (self.plain and other.plain) or self is other:
+            return False
+        if other.unique and not (self.unique and self.columns == other.columns):
+            return False
+        if other.source == PRIMARY_KEY:
+            return False
+
+        prefix = self.columns[:len(other.columns)]
+        if [column for column, _ in prefix] != [column for column, _ in other.columns]:
+            return False
+        if len(other.columns) == 1:
+            # A single-column B-tree is scanned in either direction
+            return True
+        directions = [descending for _, descending in prefix]
+        other_directions = [descending for _, descending in other.columns]
+        return directions == other_directions or directions == [not d for d in other_directions]
+
+
+def project_models(app_labels=None):
+    """Concrete, managed models of the project's own apps (apps.*)."""
+    for model in apps.get_models():
+        if not model.__module__.startswith('apps.'):
+            continue
+        if not model._meta.managed or model._meta.proxy:
+            continue
+        if app_labels and model._meta.app_label not in app_labels:
+            continue
+        yield model
+
+
+def _column(model, name):
+    descending = name.startswith('-')
+    return model._meta.get_field(name.lstrip('-')).column, descending
+
+
+def model_indexes(model):
+    """
+    Collect the indexes a model creates.
+
+    Returns:
+        list: IndexInfo per index, in PRECEDENCE order
+    """
+    indexes = []
+    for field in model._meta.local_fields:
+        column = [(field.column, False)]
+        if field.primary_key:
+            indexes.append(IndexInfo(model, PRIMARY_KEY, column, unique=True, field=field))
+        elif field.unique:
+            indexes.append(IndexInfo(model, UNIQUE_FIELD, column, unique=True, field=field))
+        elif field.db_index:
+            source = FOREIGN_KEY if field.is_relation else DB_INDEX
+            indexes.append(IndexInfo(model, source, column, field=field))
+
+    for index in model._meta.indexes:
+        plain = (
+            type(index) is models.Index and not index.expressions and index.condition is None
+            and not index.opclasses and not index.include
+        )
+        columns = [_column(model, name) for name in index.fields]
+        indexes.append(IndexInfo(model, META_INDEX, columns, plain=plain, declaration=index))
+
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            plain = constraint.condition is None and not constraint.include and not constraint.opclasses
+            columns = [_column(model, name) for name in constraint.fields]
+            indexes.append(IndexInfo(
+                model, UNIQUE_CONSTRAINT, columns, unique=True, plain=plain, declaration=constraint
+            ))
+    for fields in model._meta.unique_together:
+        columns = [_column(model, name) for name in fields]
+        indexes.append(IndexInfo(model, UNIQUE_CONSTRAINT, columns, unique=True))
+
+    return sorted(indexes, key=lambda info: PRECEDENCE.index(info.source))
+
+
+def find_redundant_indexes(app_labels=None):
+    """
+    Find indexes covered by another index of the same model.
+
+    Returns:
+        list: (redundant IndexInfo, covering IndexInfo) pairs
+    """
+    findings = []
+    for model in project_models(app_labels):
+        indexes = model_indexes(model)
+        dropped = set()
+        # Lowest precedence first, so of two identical indexes the later
+        # declaration is dropped and the other one kept
+        for candidate in reversed(indexes):
+            covering = next(
+                (info for info in indexes if id(info) not in dropped and info.covers(candidate)),
+                None
+            )
+            if covering is not None:
+                dropped.add(id(candidate))
+                findings.append((candidate, covering))
+    return findings
+
+
+def find_ignored_db_index_flags(app_labels=None):
+    """
+    Fields declaring both unique=True and db_index=True. The unique index
+    already serves lookups, so Django ignores db_index; the flag only
+    suggests a second index that does not exist.
+
+    Returns:
+        list: Fields
+    """
+    return [
+        field
+        for model in project_models(app_labels)
+        for field in model._meta.local_fields
+        if field.unique and field.db_index and not field.primary_key
+    ]
+
+
+def find_unused_indexes(app_labels=None, max_scans=0):
+    """
+    Indexes scanned at most max_scans times since PostgreSQL statistics were
+    last reset. Unique and primary key indexes are skipped: they enforce
+    constraints even when never scanned.
+
+    Returns:
+        list: (table, index, scans, size in bytes), largest first,
+            or None when the database is not PostgreSQL
+    """
+    if connection.vendor != 'postgresql':
+        return None
+
+    tables = sorted({model._meta.db_table for model in project_models(app_labels)})
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT s.relname, s.indexrelname, s.idx_scan, pg_relation_size(s.indexrelid)
+            FROM pg_stat_user_indexes s
+            JOIN pg_index i ON i.indexrelid = s.indexrelid
+            WHERE s.idx_scan <= %s
+              AND NOT i.indisunique
+              AND NOT i.indisprimary
+              AND s.relname = ANY(%s)
+            ORDER BY pg_relation_size(s.indexrelid) DESC
+            """,
+            [max_scans, tables]
+        )
+        return cursor.fetchall()
+
+
+def drop_operation(info):
+    """
+    Migration operation dropping a redundant index, or None when it has to
+    be removed by hand (unique indexes, unnamed unique_together entries).
+    """
+    model_name = info.model._meta.model_name
+    if info.source == META_INDEX:
+        return migrations.RemoveIndex(model_name=model_name, name=info.declaration.name)
+    if info.source in (DB_INDEX, FOREIGN_KEY):
+        field = info.field.clone()
+        field.db_index = False
+        return migrations.AlterField(model_name=model_name, name=info.field.name, field=field)
+    return None
+
+
+def build_migrations(operations_by_app, name='drop_redundant_indexes'):
+    """
+    Build one migration per app from lists of operations.
+
+    Args:
+        operations_by_app (dict): App label -> operations
+        name (str): Migration name suffix
+
+    Returns:
+        list: MigrationWriter per app (writer.path, writer.as_string())
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    writers = []
+    for app_label, operations in sorted(operations_by_app.items()):
+        leaves = loader.graph.leaf_nodes(app_label)
+        number = max(
+            (MigrationAutodetector.parse_number(leaf) or 0 for _, leaf in leaves), default=0
+        ) + 1
+        migration = migrations.Migration(f"{number:04d}_{name}", app_label)
+        migration.dependencies = leaves
+        migration.operations = operations
+        writers.append(MigrationWriter(migration))
+    return writers
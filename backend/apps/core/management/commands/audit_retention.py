@@ -0,0 +1,71 @@
+"""
+Management command to apply audit log retention.
+Usage: python manage.py audit_retention [--dry-run] [--no-archive] [--chunk-size 5000]
+       python manage.py audit_retention --convert-to-partitioned   (PostgreSQL, once)
+
+Run it daily (cron). On a partitioned PostgreSQL table it also creates the
+partitions for the coming months.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core import retention
+
+
+class Command(BaseCommand):
+    help = "Archive and remove audit log entries past their per-action retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be removed')
+        parser.add_argument('--archive-dir', help='Archive directory (default: AUDIT_ARCHIVE_DIR)')
+        parser.add_argument('--no-archive', action='store_true', help='Remove without archiving')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per delete transaction')
+        parser.add_argument('--months-ahead', type=int, default=3,
+                            help='Monthly partitions to create ahead of time (default: 3)')
+        parser.add_argument('--convert-to-partitioned', action='store_true',
+                            help='Rebuild audit_logs as a monthly partitioned table (PostgreSQL)')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        archive_dir = None if options['no_archive'] else (options['archive_dir'] or settings.AUDIT_ARCHIVE_DIR)
+
+        if options['convert_to_partitioned']:
+            self.convert(options['months_ahead'], dry_run)
+
+        cutoffs = retention.get_retention_cutoffs()
+        verb = 'Would remove' if dry_run else 'Removed'
+
+        if retention.uses_partitions():
+            if not dry_run:
+                retention.ensure_partitions(options['months_ahead'])
+            # Months past the longest retention are expired for every action
+            dropped = retention.drop_expired_partitions(
+                min(cutoffs.values()), archive_dir=archive_dir, dry_run=dry_run
+            )
+            self.stdout.write(f"{verb} {len(dropped)} partitions: {', '.join(dropped) or '-'}")
+
+        for action, cutoff in cutoffs.items():
+            removed = retention.purge_expired(
+                action, cutoff,
+                archive_dir=archive_dir,
+                chunk_size=options['chunk_size'],
+                dry_run=dry_run
+            )
+            days = retention.get_retention_days(action)
+            self.stdout.write(f"{verb} {removed} '{action}' entries older than {days} days")
+
+        self.stdout.write(self.style.SUCCESS("Audit retention completed"))
+
+    def convert(self, months_ahead, dry_run):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioning requires PostgreSQL")
+        if retention.uses_partitions():
+            self.stdout.write("audit_logs is already partitioned")
+            return
+        if dry_run:
+            self.stdout.write("Would convert audit_logs to a partitioned table")
+            return
+        retention.convert_to_partitioned(months_ahead)
+        self.stdout.write(self.style.SUCCESS("Converted audit_logs to monthly partitions"))
@@ -0,0 +1,83 @@
+"""
+Management command to rebuild the daily analytics rollups from source tables.
+Usage: python manage.py backfill_rollups [--from 2025-01-01] [--to 2025-12-31] [--only reports|donations]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils.dateparse import parse_date
+
+from apps.core.rollups import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild report and donation daily rollups from the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='end', help='Last day to rebuild, inclusive (YYYY-MM-DD)')
+        parser.add_argument('--only', choices=['reports', 'donations'], help='Rebuild a single rollup')
+
+    def handle(self, *args, **options):
+        date_range = self.parse_range(options['start'], options['end'])
+        only = options['only']
+
+        if only in (None, 'reports'):
+            count = self.rebuild_reports(date_range)
+            self.stdout.write(f"Report rollups: {count} rows")
+        if only in (None, 'donations'):
+            count = self.rebuild_donations(date_range)
+            self.stdout.write(f"Donation rollups: {count} rows")
+
+        self.stdout.write(self.style.SUCCESS("Rollup backfill completed"))
+
+    @staticmethod
+    def parse_range(start, end):
+        """Validate --from/--to; both or neither must be given."""
+        if not start and not end:
+            return None
+        if not (start and end):
+            raise CommandError("--from and --to must be given together")
+        start_date, end_date = parse_date(start), parse_date(end)
+        if not start_date or not end_date or start_date > end_date:
+            raise CommandError("Invalid date range")
+        return start_date, end_date
+
+    @staticmethod
+    def rebuild_reports(date_range):
+        from apps.reports.models import Report, ReportDailyRollup
+
+        queryset = Report.objects.all()
+        if date_range:
+            queryset = queryset.filter(created_at__date__range=date_range)
+        rows = (
+            queryset
+            .annotate(date=TruncDate('created_at'))
+            .values('date', 'incident_type')
+            .annotate(
+                report_count=Count('id'),
+                redacted_count=Count('id', filter=Q(redaction_applied=True)),
+            )
+            .order_by()
+        )
+        return rebuild_rollup(ReportDailyRollup, rows, date_range)
+
+    @staticmethod
+    def rebuild_donations(date_range):
+        from apps.donations.models import Donation, DonationDailyRollup
+
+        queryset = Donation.objects.all()
+        if date_range:
+            queryset = queryset.filter(created_at__date__range=date_range)
+        rows = (
+            queryset
+            .annotate(date=TruncDate('created_at'))
+            .values('date', 'currency', 'status')
+            .annotate(
+                donation_count=Count('id'),
+                total_amount=Sum('amount'),
+            )
+            .order_by()
+        )
+        return rebuild_rollup(DonationDailyRollup, rows, date_range)
@@ -0,0 +1,53 @@
+"""
+Management command to compare benchmark results against a baseline.
+Usage: python manage.py benchmark_compare [--suite endpoints|micro] [--threshold 0.15]
+       python manage.py benchmark_compare baseline.json current.json
+
+Exits with an error when a metric regressed: latency or throughput worse
+than the threshold, or any increase in queries per request.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.benchmarks.results import (
+    baseline_path,
+    compare_reports,
+    describe_differences,
+    format_comparison,
+    latest_path,
+    load_report,
+)
+
+
+class Command(BaseCommand):
+    help = "Compare benchmark results with a baseline and flag regressions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('baseline', nargs='?', help='Baseline file (default: the suite baseline)')
+        parser.add_argument('current', nargs='?', help='Results file (default: the suite latest run)')
+        parser.add_argument('--suite', default='endpoints', help='Suite name (default: endpoints)')
+        parser.add_argument('--threshold', type=float, default=0.15,
+                            help='Relative change tolerated for timings (default: 0.15)')
+
+    def handle(self, *args, **options):
+        suite = options['suite']
+        baseline_file = options['baseline'] or baseline_path(suite)
+        current_file = options['current'] or latest_path(suite)
+        try:
+            baseline, current = load_report(baseline_file), load_report(current_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read benchmark results: {e}")
+
+        for difference in describe_differences(baseline, current):
+            self.stdout.write(self.style.WARNING(f"Not directly comparable: {difference}"))
+
+        rows = compare_reports(baseline, current, options['threshold'])
+        self.stdout.write(format_comparison(rows))
+
+        regressions = [row for row in rows if row[-1] == 'regression']
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} regressions: "
+                + ', '.join(f"{name}.{metric}" for name, metric, *_ in regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions"))
@@ -0,0 +1,139 @@
+"""
+Management command to benchmark the main API endpoints.
+Usage: python manage.py benchmark_endpoints [--scale 0.1] [--iterations 200] [--only report_create]
+       python manage.py benchmark_endpoints --save-baseline
+
+Seeds a throwaway test database (never the configured one) with factory data
+at production-like volumes, replays each scenario and writes latency
+percentiles and queries per request to BENCHMARK_DIR/endpoints-latest.json.
+The run is compared against endpoints-baseline.json when it exists.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from apps.core.benchmarks.results import (
+    baseline_path,
+    build_report,
+    compare_reports,
+    describe_differences,
+    format_comparison,
+    latest_path,
+    load_report,
+    write_report,
+)
+
+SUITE = 'endpoints'
+
+
+class Command(BaseCommand):
+    help = "Benchmark API endpoints (p50/p95/p99 latency, queries) against seeded data."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Multiplier for the seeded volumes (default: 1.0 = 100k reports)')
+        parser.add_argument('--iterations', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario')
+        parser.add_argument('--only', action='append', help='Run only this scenario (repeatable)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the generated data')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the seeded test database for the next run')
+        parser.add_argument('--output', help='Result file (default: BENCHMARK_DIR/endpoints-latest.json)')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Also store the results as the new baseline')
+        parser.add_argument('--threshold', type=float, default=0.15,
+                            help='Relative slowdown flagged as a regression (default: 0.15)')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Exit with an error when the baseline comparison finds regressions')
+
+    def handle(self, *args, **options):
+        try:
+            from apps.core.benchmarks.endpoints import (
+                SCENARIOS,
+                BenchmarkError,
+                get_admin_auth_header,
+                run_scenario,
+            )
+            from apps.core.benchmarks.seed import seed_benchmark_data
+        except ImportError as e:
+            raise CommandError(f"Benchmarks need the development requirements: {e}")
+        from apps.donations.settlement import shutdown_executor
+
+        scenarios = SCENARIOS
+        if options['only']:
+            known = {scenario.name for scenario in SCENARIOS}
+            unknown = set(options['only']) - known
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))} "
+                                   f"(available: {', '.join(sorted(known))})")
+            scenarios = [scenario for scenario in SCENARIOS if scenario.name in options['only']]
+
+        verbosity = options['verbosity']
+        keepdb = options['keepdb']
+        # SQLite's in-memory test database cannot take writes from the
+        # settlement threads while requests write, so donations settle inline
+        inline_settlement = connection.vendor == 'sqlite'
+        setup_test_environment()
+        old_config = setup_databases(verbosity=verbosity, interactive=False, keepdb=keepdb)
+        settings_override = override_settings(PAYMENT_SETTLEMENT_WORKERS=0) if inline_settlement else None
+        if settings_override:
+            settings_override.enable()
+        try:
+            volumes = seed_benchmark_data(options['scale'], options['seed'], log=self.stdout.write)
+            self.stdout.write(f"Data: {volumes}")
+            auth_header = get_admin_auth_header()
+
+            results = {}
+            for scenario in scenarios:
+                try:
+                    summary = run_scenario(
+                        scenario, options['iterations'], options['warmup'], auth_header
+                    )
+                except BenchmarkError as e:
+                    raise CommandError(str(e))
+                results[scenario.name] = summary
+                self.stdout.write(
+                    f"{scenario.name:<24} p50 {summary['p50_ms']:>8.2f} ms  "
+                    f"p95 {summary['p95_ms']:>8.2f} ms  p99 {summary['p99_ms']:>8.2f} ms  "
+                    f"queries {summary['queries']}"
+                )
+            # Background settlements must finish before the database goes away
+            shutdown_executor()
+        finally:
+            if settings_override:
+                settings_override.disable()
+            teardown_databases(old_config, verbosity=verbosity, keepdb=keepdb)
+            teardown_test_environment()
+
+        report = build_report(SUITE, results, parameters={
+            'scale': options['scale'],
+            'iterations': options['iterations'],
+            'warmup': options['warmup'],
+            'seed': options['seed'],
+            'volumes': volumes,
+            'inline_settlement': inline_settlement,
+        })
+        path = write_report(report, options['output'] or latest_path(SUITE))
+        self.stdout.write(f"Results written to {path}")
+
+        if options['save_baseline']:
+            path = write_report(report, baseline_path(SUITE))
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {path}"))
+            return
+
+        if baseline_path(SUITE).exists():
+            baseline = load_report(baseline_path(SUITE))
+            for difference in describe_differences(baseline, report):
+                self.stdout.write(self.style.WARNING(f"Not directly comparable: {difference}"))
+            rows = compare_reports(baseline, report, options['threshold'])
+            self.stdout.write(format_comparison(rows))
+            regressions = [row for row in rows if row[-1] == 'regression']
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} regressions against the baseline")
@@ -0,0 +1,101 @@
+"""
+Management command to micro-benchmark the CPU hot paths.
+Usage: python manage.py benchmark_micro [--only detect_pii] [--min-time 0.2] [--save-baseline]
+
+Times PII processing, the chatbot matcher and field encryption over
+generated and adversarial corpora (see apps.core.benchmarks.micro) and
+writes ops/sec and bytes/sec to BENCHMARK_DIR/micro-latest.json. Does not
+touch the database.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.benchmarks.micro import benchmark_names, run_micro_benchmarks
+from apps.core.benchmarks.results import (
+    baseline_path,
+    build_report,
+    compare_reports,
+    describe_differences,
+    format_comparison,
+    latest_path,
+    load_report,
+    write_report,
+)
+
+SUITE = 'micro'
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark PII processing, the chatbot and field encryption (ops/sec, bytes/sec)."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', action='append', help='Benchmark only this function (repeatable)')
+        parser.add_argument('--min-time', type=float, default=0.2,
+                            help='Minimum seconds per timed run (default: 0.2)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark, best kept')
+        parser.add_argument('--seed', type=int, default=42, help='Corpus generation seed')
+        parser.add_argument('--output', help='Result file (default: BENCHMARK_DIR/micro-latest.json)')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Also store the results as the new baseline')
+        parser.add_argument('--threshold', type=float, default=0.15,
+                            help='Relative slowdown flagged as a regression (default: 0.15)')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Exit with an error when the baseline comparison finds regressions')
+
+    def handle(self, *args, **options):
+        if options['only']:
+            unknown = set(options['only']) - set(benchmark_names())
+            if unknown:
+                raise CommandError(f"Unknown benchmarks: {', '.join(sorted(unknown))} "
+                                   f"(available: {', '.join(benchmark_names())})")
+
+        def log(name, result):
+            if 'worst_ms' in result:
+                self.stdout.write(
+                    f"{name:<44} worst {result['worst_ms']:>10.2f} ms ({result['worst_input']}), "
+                    f"growth {result['growth']:.2f}x linear"
+                )
+                return
+            self.stdout.write(
+                f"{name:<44} {result['ops_per_sec']:>14,.1f} ops/s "
+                f"{result['bytes_per_sec'] / 1e6:>10.2f} MB/s {result['mean_us']:>12.2f} us/op"
+            )
+
+        # PII hits are logged as warnings on every call; keep the output readable
+        logging.disable(logging.WARNING)
+        try:
+            results = run_micro_benchmarks(
+                only=options['only'],
+                min_time=options['min_time'],
+                repeat=options['repeat'],
+                seed=options['seed'],
+                log=log,
+            )
+        finally:
+            logging.disable(logging.NOTSET)
+
+        report = build_report(SUITE, results, database=False, parameters={
+            'min_time': options['min_time'],
+            'repeat': options['repeat'],
+            'seed': options['seed'],
+        })
+        path = write_report(report, options['output'] or latest_path(SUITE))
+        self.stdout.write(f"Results written to {path}")
+
+        if options['save_baseline']:
+            path = write_report(report, baseline_path(SUITE))
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {path}"))
+            return
+
+        if baseline_path(SUITE).exists():
+            baseline = load_report(baseline_path(SUITE))
+            for difference in describe_differences(baseline, report):
+                self.stdout.write(self.style.WARNING(f"Not directly comparable: {difference}"))
+            rows = compare_reports(baseline, report, options['threshold'])
+            self.stdout.write(format_comparison(rows))
+            regressions = [row for row in rows if row[-1] == 'regression']
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} regressions against the baseline")
@@ -0,0 +1,25 @@
+"""
+Management command to load spooled audit entries into the database.
+Usage: python manage.py drain_audit_spool [--path /var/spool/shieldher/audit.jsonl]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.audit import drain_spool
+
+
+class Command(BaseCommand):
+    help = "Write audit entries from the AUDIT_SPOOL_PATH spool file to the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Spool file (default: AUDIT_SPOOL_PATH)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Entries per INSERT (default: 1000)')
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.AUDIT_SPOOL_PATH
+        if not path:
+            raise CommandError("No spool file: pass --path or set AUDIT_SPOOL_PATH")
+
+        written = drain_spool(path, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Loaded {written} audit entries from {path}"))
@@ -0,0 +1,96 @@
+"""
+Management command to find redundant and unused database indexes.
+Usage: python manage.py index_advisor [--app reports] [--max-scans 0]
+       python manage.py index_advisor --emit-migrations [--dry-run]
+
+Redundant indexes are found from the model declarations (see apps.core.indexes);
+unused ones from pg_stat_user_indexes when running on PostgreSQL.
+--emit-migrations writes a migration per app dropping the redundant indexes;
+remove the matching declarations from the models so makemigrations stays clean.
+"""
+
+import os
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import migrations
+
+from apps.core.indexes import (
+    build_migrations,
+    drop_operation,
+    find_ignored_db_index_flags,
+    find_redundant_indexes,
+    find_unused_indexes,
+)
+
+
+class Command(BaseCommand):
+    help = "Report duplicate, redundant and unused indexes and emit migrations dropping them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--app', action='append', dest='apps', help='Limit to an app label (repeatable)')
+        parser.add_argument('--max-scans', type=int, default=0,
+                            help='Report PostgreSQL indexes scanned at most this often (default: 0)')
+        parser.add_argument('--emit-migrations', action='store_true',
+                            help='Write migrations dropping the redundant indexes')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='With --emit-migrations, print the migrations instead of writing them')
+
+    def handle(self, *args, **options):
+        app_labels = options['apps']
+        operations = defaultdict(list)
+
+        redundant = find_redundant_indexes(app_labels)
+        self.stdout.write(self.style.MIGRATE_HEADING("Redundant indexes:"))
+        for info, covering in redundant:
+            self.stdout.write(f"  {info.model._meta.label}: {info.label}")
+            self.stdout.write(f"      covered by {covering.label}")
+            operation = drop_operation(info)
+            if operation is None:
+                self.stdout.write(self.style.WARNING("      drop by hand (unique)"))
+            else:
+                operations[info.model._meta.app_label].append(operation)
+        if not redundant:
+            self.stdout.write("  none")
+
+        flags = find_ignored_db_index_flags(app_labels)
+        if flags:
+            self.stdout.write(self.style.MIGRATE_HEADING("Ignored db_index=True on unique fields:"))
+            for field in flags:
+                self.stdout.write(f"  {field.model._meta.label}.{field.name}")
+                clone = field.clone()
+                clone.db_index = False
+                operations[field.model._meta.app_label].append(migrations.AlterField(
+                    model_name=field.model._meta.model_name, name=field.name, field=clone
+                ))
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Unused indexes:"))
+        unused = find_unused_indexes(app_labels, options['max_scans'])
+        if unused is None:
+            self.stdout.write("  usage statistics need PostgreSQL (pg_stat_user_indexes)")
+        elif not unused:
+            self.stdout.write("  none")
+        for table, index, scans, size in unused or []:
+            self.stdout.write(f"  {table}.{index}: {scans} scans, {size / 1024:.0f} KiB")
+
+        if options['emit_migrations'] and operations:
+            self.emit_migrations(operations, options['dry_run'])
+
+    def emit_migrations(self, operations, dry_run):
+        for writer in build_migrations(operations):
+            if dry_run:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{writer.path}:"))
+                self.stdout.write(writer.as_string())
+                continue
+            if os.path.exists(writer.path):
+                self.stdout.write(self.style.WARNING(f"Skipped, already exists: {writer.path}"))
+                continue
+            with open(writer.path, 'w', encoding='utf-8') as fh:
+                fh.write(writer.as_string())
+            self.stdout.write(self.style.SUCCESS(f"Wrote {writer.path}"))
+
+        if not dry_run:
+            self.stdout.write(
+                "Now remove the dropped declarations (Meta.indexes entries, db_index=True) "
+                "from the models; makemigrations --check should report no changes."
+            )
@@ -0,0 +1,182 @@
+"""
+In-process request metrics with Prometheus text exposition.
+
+Privacy: labels are only the HTTP method, the resolved view name (never the
+raw path, so no IDs or confirmation codes) and the status code. No IP
+addresses, user identifiers, query strings or bodies are recorded, in line
+with SensitiveDataFilter.
+
+Metrics are kept per process; with several gunicorn workers each scrape
+sees the worker that answered it (identified by the process_start_time
+gauge), and counters are summed across workers by Prometheus with sum().
+"""
+
+import contextvars
+import math
+import threading
+import time
+from functools import wraps
+
+# Upper bounds of the histogram buckets (+Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+NAMESPACE = 'shieldher'
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and histograms keyed by label tuples.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}  # name -> (type, help, buckets, {labels: value})
+        self.start_time = time.time()
+
+    def _series(self, name, metric_type, help_text, buckets=None):
+        if name not in self._metrics:
+            self._metrics[name] = (metric_type, help_text, buckets, {})
+        return self._metrics[name][3]
+
+    def inc(self, name, labels, amount=1, help_text=''):
+        """Add amount to a counter."""
+        with self._lock:
+            series = self._series(name, 'counter', help_text)
+            series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name, labels, value, buckets, help_text=''):
+        """Record a histogram observation."""
+        with self._lock:
+            series = self._series(name, 'histogram', help_text, buckets)
+            if labels not in series:
+                series[labels] = Histogram(buckets)
+            series[labels].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def render(self):
+        """
+        Render all metrics in the Prometheus text format (version 0.0.4).
+
+        Returns:
+            str: Exposition text
+        """
+        lines = [
+            f'# HELP {NAMESPACE}_process_start_time_seconds Start time of this worker process.',
+            f'# TYPE {NAMESPACE}_process_start_time_seconds gauge',
+            f'{NAMESPACE}_process_start_time_seconds {self.start_time:.3f}',
+        ]
+        with self._lock:
+            for name in sorted(self._metrics):
+                metric_type, help_text, buckets, series = self._metrics[name]
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels in sorted(series):
+                    value = series[labels]
+                    if metric_type == 'counter':
+                        lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                        continue
+                    cumulative = 0
+                    for bound, count in zip((*buckets, math.inf), value.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == math.inf else _format_value(bound)
+                        lines.append(
+                            f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}'
+                        )
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value.total)}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
+
+
+registry = MetricsRegistry()
+
+
+# Serializer timing
+#
+# DRF serializers produce their output in the `data` property; timing it on
+# BaseSerializer covers Serializer and ListSerializer alike. Time is added to
+# the current request's accumulator (a context variable set by the middleware).
+
+_serializer_time = contextvars.ContextVar('serializer_time', default=None)
+_installed = False
+
+
+def start_serializer_timer():
+    """Start accumulating serializer time for the current request."""
+    return _serializer_time.set([0.0, 0])
+
+
+def stop_serializer_timer(token):
+    """
+    Stop accumulating and return the seconds spent in serializers.
+    """
+    accumulator = _serializer_time.get()
+    _serializer_time.reset(token)
+    return accumulator[0] if accumulator else 0.0
+
+
+def install_serializer_timing():
+    """Wrap BaseSerializer.data so serializer time is measured (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    from rest_framework.serializers import BaseSerializer
+
+    data_property = BaseSerializer.data
+
+    @wraps(data_property.fget)
+    def timed_data(self):
+        accumulator = _serializer_time.get()
+        if accumulator is None or accumulator[1]:
+            # Not in a request, or nested inside an already timed serializer
+            return data_property.fget(self)
+        accumulator[1] += 1
+        start = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            accumulator[0] += time.perf_counter() - start
+            accumulator[1] -= 1
+
+    BaseSerializer.data = property(timed_data)
+    _installed = True
@@ -0,0 +1,185 @@
+"""
+Custom middleware for ShieldHer.
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .dbrouter import (
+    RoutingState,
+    get_replica_alias,
+    routing,
+    stream_with_routing,
+    view_uses_replica,
+)
+from .metrics import (
+    LATENCY_BUCKETS,
+    NAMESPACE,
+    QUERY_COUNT_BUCKETS,
+    SIZE_BUCKETS,
+    registry,
+    start_serializer_timer,
+    stop_serializer_timer,
+)
+from .querybudget import QueryBudgetExceeded, get_view_budget, inspect_queries
+
+logger = logging.getLogger(__name__)
+
+KNOWN_METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'}
+
+
+class QueryTimer:
+    """
+    connection.execute_wrapper callback counting queries and their time.
+    Only counts and durations are kept, never SQL or parameters.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Records per-view request metrics (see apps.core.metrics):
+    latency, database query count and time, serializer time and response
+    size. Views are identified by their URL name, never by the raw path.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        token = start_serializer_timer()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            serializer_time = stop_serializer_timer(token)
+        duration = time.perf_counter() - start
+
+        self.record(request, response, duration, timer, serializer_time)
+        return response
+
+    @staticmethod
+    def get_view_label(request):
+        match = getattr(request, 'resolver_match', None)
+        return match.view_name if match is not None else 'unmatched'
+
+    def record(self, request, response, duration, timer, serializer_time):
+        view = self.get_view_label(request)
+        method = request.method if request.method in KNOWN_METHODS else 'other'
+        labels = (('method', method), ('view', view))
+
+        registry.inc(
+            f'{NAMESPACE}_http_requests_total',
+            labels + (('status', str(response.status_code)),),
+            help_text='HTTP requests by view and status code.'
+        )
+        registry.observe(
+            f'{NAMESPACE}_http_request_duration_seconds', labels, duration, LATENCY_BUCKETS,
+            help_text='Time to produce the response.'
+        )
+        registry.observe(
+            f'{NAMESPACE}_db_queries_per_request', labels, timer.count, QUERY_COUNT_BUCKETS,
+            help_text='Database queries executed per request.'
+        )
+        registry.inc(
+            f'{NAMESPACE}_db_query_duration_seconds_total', labels, timer.duration,
+            help_text='Time spent executing database queries.'
+        )
+        registry.inc(
+            f'{NAMESPACE}_serializer_duration_seconds_total', labels, serializer_time,
+            help_text='Time spent serializing response data.'
+        )
+        if not response.streaming:
+            registry.observe(
+                f'{NAMESPACE}_http_response_size_bytes', labels, len(response.content), SIZE_BUCKETS,
+                help_text='Response body size (streaming responses excluded).'
+            )
+
+
+class QueryBudgetMiddleware:
+    """
+    Development/CI guard against query regressions (see apps.core.querybudget).
+
+    Compares each request's query count with the budget declared by its view
+    and flags query shapes repeated more than QUERY_DUPLICATE_LIMIT times.
+    QUERY_BUDGET_MODE: 'off', 'warn' (log and add X-Query-Budget headers)
+    or 'raise' (QueryBudgetExceeded, so tests fail).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if mode == 'off':
+            return self.get_response(request)
+
+        with inspect_queries() as inspector:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return response
+
+        budget = get_view_budget(match, request.method)
+        response['X-Query-Count'] = str(inspector.count)
+        if budget is None:
+            return response
+
+        problems = inspector.check(budget, settings.QUERY_DUPLICATE_LIMIT)
+        response['X-Query-Budget'] = str(budget)
+
+        if problems:
+            message = f"{request.method} {match.view_name}: {'; '.join(problems)}"
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(f"Query budget exceeded: {message}")
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe requests to views declaring replica reads read from the
+    replica (see apps.core.dbrouter), including while a streaming response
+    is generated. Reads after the request's first write use the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        request.db_routing = state
+        with routing(state):
+            response = self.get_response(request)
+
+        if response.streaming and state.use_replica:
+            response.streaming_content = stream_with_routing(response.streaming_content, state)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.db_routing.use_replica = (
+            get_replica_alias() is not None and view_uses_replica(view_func, request.method)
+        )
@@ -3,9 +3,12 @@ Core models for ShieldHer platform.
 Provides base models and utilities for all apps.
 """
 
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from .audit import get_audit_writer
+
 
 class TimeStampedModel(models.Model):
     """
@@ -55,11 +58,18 @@ class AuditLog(TimeStampedModel):
         ('view', 'View'),
     ]
     
+    # Time of the action itself; entries are written later in batches
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        help_text="Timestamp when the action happened"
+    )
     admin_user = models.ForeignKey(
         'authentication.AdminUser',
         on_delete=models.SET_NULL,
         null=True,
         related_name='audit_logs',
+        db_index=False,  # served by the (admin_user, -created_at) index
         help_text="Admin user who performed the action"
     )
     action = models.CharField(
@@ -100,10 +110,14 @@ class AuditLog(TimeStampedModel):
         return f"{self.action} on {self.resource_type} by {self.admin_user}"
 
 
-def log_admin_action(admin_user, action, resource_type, resource_id, details=None, success=True):
+def log_admin_action(admin_user, action, resource_type, resource_id, details=None, success=True,
+                     buffered=None):
     """
     Utility function to log admin actions.
     
+    Entries are buffered and written in batches off the request path
+    (see apps.core.audit) unless buffering is disabled.
+    
     Args:
         admin_user: The AdminUser instance
         action: Action type ('create', 'update', 'delete', 'view')
@@ -111,11 +125,12 @@ def log_admin_action(admin_user, action, resource_type, resource_id, details=Non
         resource_id: ID of the resource
         details: Optional dict with additional details
         success: Whether the action succeeded
+        buffered: Override settings.AUDIT_BUFFER_ENABLED for this entry
         
     Returns:
-        AuditLog: The created audit log entry
+        AuditLog: The audit log entry (unsaved until flushed when buffered)
     """
-    return AuditLog.objects.create(
+    entry = AuditLog(
         admin_user=admin_user,
         action=action,
         resource_type=resource_type,
@@ -123,3 +138,11 @@ def log_admin_action(admin_user, action, resource_type, resource_id, details=Non
         details=details or {},
         success=success
     )
+    
+    if buffered is None:
+        buffered = settings.AUDIT_BUFFER_ENABLED
+    if buffered:
+        get_audit_writer().enqueue(entry)
+    else:
+        entry.save()
+    return entry
@@ -2,7 +2,16 @@
 Custom pagination classes for ShieldHer API.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.db import connections
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -13,3 +22,159 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+def estimate_count(queryset):
+    """
+    Row count estimate from the PostgreSQL planner (EXPLAIN), without
+    running the query. Falls back to an exact count on other databases.
+    
+    Returns:
+        int: Estimated number of rows
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (created_at, id), newest first.
+    
+    Each page is read with a range condition on the position of the previous
+    page's edge row instead of an OFFSET, so deep pages cost the same as the
+    first one. Cursors are opaque and carry the edge row's created_at and id,
+    which also keeps pages stable while new rows are inserted.
+    
+    Query parameters:
+        cursor: Opaque position from a next/previous link
+        page_size: Items per page (max max_page_size)
+        count: 'exact' (default) or 'estimate' to use the planner's row
+            estimate instead of COUNT(*)
+    
+    Response structure matches StandardResultsSetPagination, plus
+    count_estimated when ?count=estimate was used.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+    
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+    
+    def encode_cursor(self, item, reverse=False):
+        position = {'c': item.created_at.isoformat(), 'i': item.pk, 'r': int(reverse)}
+        token = base64.urlsafe_b64encode(
+            json.dumps(position, separators=(',', ':')).encode('ascii')
+        ).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+    
+    def decode_cursor(self, request):
+        """
+        Returns:
+            tuple: (created_at, id, reverse), or None if no cursor was given
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            created_at = parse_datetime(position['c'])
+            if created_at is None:
+                raise ValueError
+            return created_at, int(position['i']), bool(position.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size_value = self.get_page_size(request)
+        self.count_estimated = request.query_params.get(self.count_query_param) == 'estimate'
+        self.count = estimate_count(queryset) if self.count_estimated else queryset.count()
+        
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+        
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        
+        if cursor:
+            created_at, pk, _ = cursor
+            if reverse:
+                queryset = queryset.filter(created_at__gte=created_at).exclude(
+                    created_at=created_at, id__lte=pk
+                )
+            else:
+                queryset = queryset.filter(created_at__lte=created_at).exclude(
+                    created_at=created_at, id__gte=pk
+                )
+        
+        # One extra row tells whether there is another page in this direction
+        results = list(queryset[:self.page_size_value + 1])
+        has_more = len(results) > self.page_size_value
+        results = results[:self.page_size_value]
+        
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        
+        self.page = results
+        return results
+    
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+    
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+    
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.count_estimated:
+            payload['count_estimated'] = True
+        return Response(payload)
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'count_estimated': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
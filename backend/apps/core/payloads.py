@@ -0,0 +1,120 @@
+"""
+Precomputed static API payloads.
+Enum lists (categories, types, ...) and chatbot quick resources never change
+while the process runs, so each is rendered to JSON bytes once, with a strong
+ETag, and served with long-lived Cache-Control headers.
+
+Apps register payload builders from their payloads.py (imported in ready()):
+
+    @register_payload('lessons.categories')
+    def lesson_categories():
+        return {'categories': [...]}
+
+Payloads are rendered when they are registered, i.e. during app loading, so
+no request pays for building them.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+_registry = {}
+_meta = None
+
+
+class StaticPayload:
+    """
+    A JSON payload rendered once.
+
+    Attributes:
+        data: The payload as Python data
+        content: UTF-8 JSON bytes (compact, like DRF's JSONRenderer)
+        etag: Strong, quoted ETag of content
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+        self._rendered = None
+
+    def render(self):
+        """Build and serialize the payload, unless already done."""
+        if self._rendered is None:
+            data = self.builder()
+            content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            etag = quote_etag(hashlib.sha256(content).hexdigest()[:32])
+            self._rendered = (data, content, etag)
+        return self._rendered
+
+    @property
+    def data(self):
+        return self.render()[0]
+
+    @property
+    def content(self):
+        return self.render()[1]
+
+    @property
+    def etag(self):
+        return self.render()[2]
+
+    def as_response(self, request):
+        """
+        Serve the payload, or a 304 if the client already has it.
+        """
+        response = get_conditional_response(request, etag=self.etag)
+        if response is None:
+            response = HttpResponse(self.content, content_type='application/json')
+        response['ETag'] = self.etag
+        patch_cache_control(response, public=True, max_age=settings.STATIC_PAYLOAD_MAX_AGE)
+        return response
+
+
+def _build_meta():
+    meta = {}
+    for name in sorted(_registry):
+        group = name.split('.', 1)[0]
+        meta.setdefault(group, {}).update(_registry[name].data)
+    return meta
+
+
+def register_payload(name):
+    """
+    Decorator registering a payload builder under a dotted name ('group.key').
+    The group and key become the nesting in the combined /api/meta/ payload.
+    The payload and the combined payload are rendered right away.
+    """
+    def decorator(builder):
+        global _meta
+        payload = StaticPayload(builder)
+        payload.render()
+        _registry[name] = payload
+        meta = StaticPayload(_build_meta)
+        meta.render()
+        _meta = meta
+        return builder
+    return decorator
+
+
+def get_payload(name):
+    """Get a registered payload by name."""
+    return _registry[name]
+
+
+def payload_response(request, name):
+    """Serve a registered payload (or 304)."""
+    return get_payload(name).as_response(request)
+
+
+def get_meta_payload():
+    """
+    Combined payload of every registered payload, grouped by name prefix:
+    'lessons.categories' -> {'lessons': {'categories': [...]}}.
+    """
+    global _meta
+    if _meta is None:
+        _meta = StaticPayload(_build_meta)
+    return _meta
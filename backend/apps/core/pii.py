@@ -0,0 +1,219 @@
+"""
+PII scanning engine for ShieldHer.
+Scans text for a set of PII rules and redacts it in one call, with matches
+of different rules that overlap merged so no fragment of either survives.
+
+Scanning runs on unauthenticated input, so its cost is bounded:
+
+- Every rule must have a maximum match length (bounded quantifiers only);
+  the scanner refuses unbounded patterns. Text is scanned in fixed-size
+  chunks, each searched with a window extended by the longest possible
+  match, so one regex attempt never looks at more than that many
+  characters and total work grows linearly with the text.
+- An optional CPU budget (pii_scan_budget) is checked between chunks;
+  scans that exceed it raise PIIScanBudgetExceeded so callers can reject
+  the input instead of pinning a worker.
+"""
+
+import contextvars
+import re
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Characters scanned between two budget checks
+CHUNK_SIZE = 2048
+# Longest match a rule may declare; keeps the per-position cost small
+MAX_RULE_LENGTH = 1024
+
+_deadline = contextvars.ContextVar('pii_scan_deadline', default=None)
+
+
+class PIIScanBudgetExceeded(Exception):
+    """The scan used more CPU time than the active pii_scan_budget allows."""
+
+
+@contextmanager
+def pii_scan_budget(seconds):
+    """
+    Limit the thread CPU time all PII scans inside the block may use together
+    (e.g. one request). Nested budgets keep the earliest deadline.
+    """
+    deadline = time.thread_time() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def max_match_length(pattern, flags=0):
+    """
+    Longest string a pattern can match, or None if it is unbounded.
+    """
+    width = sre_parse.parse(pattern, flags).getwidth()[1]
+    return width if width < sre_parse.MAXREPEAT else None
+
+
+class PIIRule:
+    """
+    A single PII pattern and how to redact it.
+
+    Args:
+        pii_type: Name reported when the pattern matches (e.g. 'email')
+        pattern: Regex string or compiled pattern
+        replacement: Replacement template (may use \\1-style backreferences
+            into the pattern's own groups), or None for detect-only rules
+        flags: Regex flags
+    """
+
+    def __init__(self, pii_type, pattern, replacement=None, flags=0):
+        if isinstance(pattern, re.Pattern):
+            flags |= pattern.flags
+            pattern = pattern.pattern
+        self.pii_type = pii_type
+        self.pattern = pattern
+        self.replacement = replacement
+        self.flags = flags
+        self.regex = re.compile(pattern, flags)
+
+    def __repr__(self):
+        return f"PIIRule({self.pii_type!r})"
+
+
+class PIIScanner:
+    """
+    PII scanner for a list of rules.
+
+    Every rule is searched on the original text, so a match of one rule
+    never hides a match of another. Overlapping matches of redacting rules
+    are merged and the merged span is replaced as a whole, using the
+    replacement of its longest match (on a tie, the earlier rule): no
+    fragment of any match survives redaction. Detect-only rules (no
+    replacement) are only reported, and are not searched further once found.
+
+    Raises:
+        ValueError: If a rule can match an unbounded or very long string
+    """
+
+    def __init__(self, rules: Sequence[PIIRule], chunk_size: int = CHUNK_SIZE):
+        self.rules = list(rules)
+        self.types = [rule.pii_type for rule in self.rules]
+        self.chunk_size = chunk_size
+
+        self.max_length = 0
+        for rule in self.rules:
+            length = max_match_length(rule.pattern, rule.flags)
+            if length is None or length > MAX_RULE_LENGTH:
+                raise ValueError(
+                    f"PII rule {rule.pii_type!r} must have a maximum match length of at most "
+                    f"{MAX_RULE_LENGTH} characters; use bounded quantifiers such as {{1,64}}"
+                )
+            self.max_length = max(self.max_length, length)
+
+    def _find(self, text: str, redacting: Sequence[bool]):
+        """
+        Search every rule over text, chunk by chunk.
+
+        Returns:
+            tuple: (set of detected types, list of (start, end, rule index,
+            match) for redacting rules)
+        """
+        found = set()
+        spans = []
+        deadline = _deadline.get()
+        length = len(text)
+        # Window past the chunk so every match starting in the chunk, and
+        # the boundary checks right after it, sees the real text
+        overlap = self.max_length + 1
+        # Per rule, where its next match may start (matches of one rule do not overlap)
+        resume = [0] * len(self.rules)
+
+        position = 0
+        while position < length:
+            chunk_end = min(position + self.chunk_size, length)
+            window_end = min(chunk_end + overlap, length)
+
+            for index, rule in enumerate(self.rules):
+                if not redacting[index] and rule.pii_type in found:
+                    continue
+                start_at = max(position, resume[index])
+                for match in rule.regex.finditer(text, start_at, window_end):
+                    start, end = match.span()
+                    if start >= chunk_end:
+                        break
+                    resume[index] = max(end, start + 1)
+                    found.add(rule.pii_type)
+                    if not redacting[index]:
+                        break
+                    spans.append((start, end, index, match))
+
+            position = chunk_end
+            if deadline is not None and position < length and time.thread_time() > deadline:
+                raise PIIScanBudgetExceeded(
+                    f"PII scan stopped after {position} of {length} characters"
+                )
+
+        return found, spans
+
+    def scan(self, text: str, redact_types: Optional[Sequence[str]] = None) -> Tuple[str, List[str]]:
+        """
+        Detect and redact PII.
+
+        Args:
+            text: Text to scan
+            redact_types: Optional subset of types to redact (default: all)
+
+        Returns:
+            tuple: (redacted_text, detected_types) with types in rule order
+
+        Raises:
+            PIIScanBudgetExceeded: If the active pii_scan_budget runs out
+        """
+        if not text:
+            return text, []
+
+        redacting = [
+            rule.replacement is not None and (redact_types is None or rule.pii_type in redact_types)
+            for rule in self.rules
+        ]
+        found, spans = self._find(text, redacting)
+        detected = [pii_type for pii_type in self.types if pii_type in found]
+        if not spans:
+            return text, detected
+
+        spans.sort(key=lambda span: (span[0], span[2]))
+        pieces = []
+        last_end = 0
+        i = 0
+        while i < len(spans):
+            start, end, _, _ = spans[i]
+            best = spans[i]
+            i += 1
+            # Merge every match overlapping the span so far
+            while i < len(spans) and spans[i][0] < end:
+                span = spans[i]
+                end = max(end, span[1])
+                if (span[1] - span[0], -span[2]) > (best[1] - best[0], -best[2]):
+                    best = span
+                i += 1
+            pieces.append(text[last_end:start])
+            pieces.append(best[3].expand(self.rules[best[2]].replacement))
+            last_end = end
+        pieces.append(text[last_end:])
+
+        return ''.join(pieces), detected
+
+    def detect(self, text: str) -> List[str]:
+        """Return the PII types found in text, in rule order."""
+        return self.scan(text, redact_types=())[1]
+
+    def redact(self, text: str, redact_types: Optional[Sequence[str]] = None) -> str:
+        """Return text with PII redacted."""
+        return self.scan(text, redact_types)[0]
@@ -0,0 +1,165 @@
+"""
+Query budgets and N+1 detection.
+
+Views declare how many database queries an endpoint may run:
+
+    class ReportViewSet(viewsets.ModelViewSet):
+        query_budgets = {'list': 3, 'retrieve': 2, 'stats': 2}
+
+    @query_budget(1)
+    @api_view(['GET'])
+    def health_check(request): ...
+
+QueryBudgetMiddleware (development, CI, staging) counts the queries of each
+request and fingerprints them (literals stripped), then warns or raises when
+an endpoint exceeds its budget or runs the same query shape more than
+QUERY_DUPLICATE_LIMIT times, the typical N+1 signature. A budget of None
+exempts a batch endpoint whose queries repeat per chunk by design.
+In tests, wrap code in `with assert_query_budget(3): ...`.
+
+Budgets are worst cases: they count the JWT user lookup of authenticated
+requests (one query, on public endpoints too), cold caches and the first
+rollup row of a day, and savepoints. Work a request only hosts, such as
+inline donation settlement in development, runs inside `unbudgeted()`.
+"""
+
+import contextvars
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+
+_unbudgeted = contextvars.ContextVar('query_budget_unbudgeted', default=False)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in 'raise' mode when a request breaks its query budget."""
+
+
+def fingerprint(sql):
+    """
+    Normalize SQL to its shape: literals and IN lists become placeholders,
+    so the same query with different values yields the same fingerprint.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+class QueryInspector:
+    """
+    connection.execute_wrapper callback counting queries by fingerprint.
+    """
+
+    def __init__(self):
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not _unbudgeted.get():
+            self.fingerprints[fingerprint(sql)] += 1
+        return execute(sql, params, many, context)
+
+    @property
+    def count(self):
+        return sum(self.fingerprints.values())
+
+    def duplicates(self, limit):
+        """
+        Returns:
+            list: (fingerprint, count) of query shapes run more than limit times
+        """
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > limit]
+
+    def check(self, budget, duplicate_limit):
+        """
+        Returns:
+            list: Human-readable violations (empty when within budget)
+        """
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} queries (budget {budget})")
+        for sql, count in self.duplicates(duplicate_limit):
+            problems.append(f"same query {count} times: {sql[:200]}")
+        return problems
+
+
+@contextmanager
+def inspect_queries():
+    """Collect the queries run on every connection inside the block."""
+    inspector = QueryInspector()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(inspector))
+        yield inspector
+
+
+@contextmanager
+def unbudgeted():
+    """
+    Leave the queries run inside the block out of query budgets, for work
+    that runs inside a request but is not part of it (e.g. a background
+    job run inline in development).
+    """
+    token = _unbudgeted.set(True)
+    try:
+        yield
+    finally:
+        _unbudgeted.reset(token)
+
+
+@contextmanager
+def assert_query_budget(budget, duplicate_limit=None):
+    """
+    Fail (QueryBudgetExceeded) if the block runs more than budget queries
+    or repeats a query shape more than duplicate_limit times.
+    """
+    if duplicate_limit is None:
+        duplicate_limit = settings.QUERY_DUPLICATE_LIMIT
+    with inspect_queries() as inspector:
+        yield inspector
+    problems = inspector.check(budget, duplicate_limit)
+    if problems:
+        raise QueryBudgetExceeded('; '.join(problems))
+
+
+def query_budget(max_queries):
+    """
+    Decorator declaring the query budget of a function view.
+    Apply it above @api_view so it marks the final view function.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def get_view_budget(resolver_match, method):
+    """
+    Find the budget declared for the view handling a request.
+
+    ViewSets declare `query_budgets` ({action: budget}); function views use
+    @query_budget. Falls back to QUERY_BUDGET_DEFAULT.
+    Returns None for views declared exempt.
+    """
+    func = resolver_match.func
+    if hasattr(func, 'query_budget'):
+        return func.query_budget
+
+    view_class = getattr(func, 'cls', None)
+    budgets = getattr(view_class, 'query_budgets', None) or {}
+    actions = getattr(func, 'actions', None) or {}
+    action = actions.get(method.lower())
+    if action in budgets:
+        return budgets[action]
+    return settings.QUERY_BUDGET_DEFAULT
@@ -0,0 +1,342 @@
+"""
+Audit log retention.
+
+Each AuditLog action has its own retention period (AUDIT_RETENTION_DAYS,
+falling back to AUDIT_RETENTION_DEFAULT_DAYS). Expired rows are archived to
+gzip-compressed JSONL files in AUDIT_ARCHIVE_DIR, one file per month and
+action, before they are removed.
+
+Two removal strategies:
+
+- PostgreSQL with audit_logs partitioned by month on created_at (see
+  convert_to_partitioned): months older than the longest retention are
+  detached, archived and dropped whole, so nothing is deleted row by row and
+  each insert only maintains the indexes of the current month.
+- Everywhere (and for actions kept shorter than the longest retention):
+  rows are archived and deleted in primary-key chunks, one transaction each,
+  so locks stay short.
+
+Driven by `python manage.py audit_retention`.
+"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = (
+    'id', 'created_at', 'updated_at', 'admin_user_id', 'action',
+    'resource_type', 'resource_id', 'details', 'success'
+)
+PARTITION_PREFIX = f'{AuditLog._meta.db_table}_p'
+DEFAULT_PARTITION = f'{AuditLog._meta.db_table}_default'
+
+
+def get_retention_days(action):
+    """Retention period in days for an audit action."""
+    return settings.AUDIT_RETENTION_DAYS.get(action, settings.AUDIT_RETENTION_DEFAULT_DAYS)
+
+
+def get_retention_cutoffs(now=None):
+    """
+    Returns:
+        dict: action -> datetime before which entries are expired
+    """
+    now = now or timezone.now()
+    return {
+        action: now - timedelta(days=get_retention_days(action))
+        for action, _ in AuditLog.ACTION_CHOICES
+    }
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def archive_rows(rows, archive_dir):
+    """
+    Append rows to gzip JSONL archives, one file per month and action
+    (audit_logs-2025-01-view.jsonl.gz). Appending adds a gzip member, which
+    gzip readers handle transparently.
+
+    Args:
+        rows (iterable): Dicts with ARCHIVE_FIELDS
+        archive_dir (str): Directory for archive files
+
+    Returns:
+        int: Number of rows archived
+    """
+    groups = {}
+    for row in rows:
+        key = (row['created_at'].strftime('%Y-%m'), row['action'])
+        groups.setdefault(key, []).append(
+            json.dumps(row, default=_json_default, separators=(',', ':'))
+        )
+
+    Path(archive_dir).mkdir(parents=True, exist_ok=True)
+    count = 0
+    for (month, action), lines in groups.items():
+        path = Path(archive_dir) / f'{AuditLog._meta.db_table}-{month}-{action}.jsonl.gz'
+        with open(path, 'ab') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+            archive.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        with open(path, 'ab') as raw:
+            os.fsync(raw.fileno())
+        count += len(lines)
+    return count
+
+
+def purge_expired(action, cutoff, archive_dir=None, chunk_size=5000, dry_run=False):
+    """
+    Archive and delete entries of one action older than cutoff, in chunks.
+
+    Args:
+        action (str): AuditLog action
+        cutoff (datetime): Entries created before this are removed
+        archive_dir (str): Archive directory, or None to delete without archiving
+        chunk_size (int): Rows per transaction
+        dry_run (bool): Only count
+
+    Returns:
+        int: Number of entries removed (or that would be removed)
+    """
+    expired = AuditLog.objects.filter(action=action, created_at__lt=cutoff)
+    if dry_run:
+        return expired.count()
+
+    removed = 0
+    while True:
+        with transaction.atomic():
+            ids = list(expired.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            if archive_dir:
+                archive_rows(
+                    AuditLog.objects.filter(pk__in=ids).order_by('pk').values(*ARCHIVE_FIELDS),
+                    archive_dir
+                )
+            AuditLog.objects.filter(pk__in=ids).delete()
+        removed += len(ids)
+    return removed
+
+
+# PostgreSQL partitioning
+
+
+def uses_partitions():
+    """Whether audit_logs is a partitioned PostgreSQL table."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace
+            """,
+            [AuditLog._meta.db_table]
+        )
+        return cursor.fetchone() is not None
+
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value):
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{PARTITION_PREFIX}{month:%Y%m}'
+
+
+def list_partitions():
+    """
+    Returns:
+        list: (partition name, first day of its month) pairs, oldest first;
+        the default partition is not included
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s AND p.relnamespace = current_schema()::regnamespace
+            """,
+            [AuditLog._meta.db_table]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        suffix = name[len(PARTITION_PREFIX):]
+        if name.startswith(PARTITION_PREFIX) and suffix.isdigit() and len(suffix) == 6:
+            partitions.append((name, date(int(suffix[:4]), int(suffix[4:]), 1)))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def create_partition(cursor, month):
+    """Create the partition for the month starting at month (if missing)."""
+    table = connection.ops.quote_name(AuditLog._meta.db_table)
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(partition_name(month))} '
+        f'PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)',
+        [month.isoformat(), _next_month(month).isoformat()]
+    )
+
+
+def ensure_partitions(months_ahead=3):
+    """
+    Create partitions for the current month and the next months_ahead.
+    Rows outside every partition land in the default partition.
+    Month boundaries are UTC, the database connection's time zone.
+
+    Returns:
+        list: Names of partitions that exist for the covered months
+    """
+    month = _month_start(timezone.now())
+    names = []
+    with connection.cursor() as cursor:
+        for _ in range(months_ahead + 1):
+            create_partition(cursor, month)
+            names.append(partition_name(month))
+            month = _next_month(month)
+    return names
+
+
+def _partition_row(row):
+    record = dict(zip(ARCHIVE_FIELDS, row))
+    # Django's psycopg2 setup returns jsonb as text from raw cursors
+    if isinstance(record['details'], str):
+        record['details'] = json.loads(record['details'])
+    return record
+
+
+def drop_expired_partitions(cutoff, archive_dir=None, dry_run=False):
+    """
+    Detach, archive and drop monthly partitions that end before cutoff.
+
+    Args:
+        cutoff (datetime): Every row older than this is expired for all actions
+        archive_dir (str): Archive directory, or None to drop without archiving
+        dry_run (bool): Only report which partitions would be dropped
+
+    Returns:
+        list: Names of dropped partitions
+    """
+    table = connection.ops.quote_name(AuditLog._meta.db_table)
+    cutoff_day = cutoff.astimezone(dt_timezone.utc).date()
+    dropped = []
+
+    for name, month in list_partitions():
+        if _next_month(month) > cutoff_day:
+            break
+        dropped.append(name)
+        if dry_run:
+            continue
+
+        quoted = connection.ops.quote_name(name)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {quoted}')
+            if archive_dir:
+                # Server-side cursor: a month of audit rows is not loaded at once
+                with connection.chunked_cursor() as cursor:
+                    cursor.execute(f'SELECT {", ".join(ARCHIVE_FIELDS)} FROM {quoted} ORDER BY id')
+                    while True:
+                        rows = cursor.fetchmany(5000)
+                        if not rows:
+                            break
+                        archive_rows([_partition_row(row) for row in rows], archive_dir)
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {quoted}')
+        logger.info(f"Dropped audit partition {name}")
+
+    return dropped
+
+
+def convert_to_partitioned(months_ahead=3):
+    """
+    Rebuild audit_logs as a table partitioned by month on created_at.
+
+    Rows are copied into monthly partitions covering the existing data, the
+    model's indexes are recreated on the partitioned table (and so on every
+    partition) and the old table is dropped. The primary key becomes
+    (id, created_at), as PostgreSQL requires the partition key in it.
+    Runs in one transaction and locks the table; use a maintenance window.
+    """
+    from django.contrib.auth import get_user_model
+
+    qn = connection.ops.quote_name
+    table = AuditLog._meta.db_table
+    old_table = f'{table}_unpartitioned'
+    sequence = f'{table}_id_seq'
+    user_table = get_user_model()._meta.db_table
+
+    with transaction.atomic(), connection.schema_editor(atomic=False) as schema_editor:
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old_table)}')
+            # The id sequence (identity, or serial on older databases) stays
+            # with the renamed table under its old name: drop it so the new
+            # table's sequence can take the name. Ids continue from MAX(id).
+            cursor.execute(f'ALTER TABLE {qn(old_table)} ALTER COLUMN id DROP IDENTITY IF EXISTS')
+            cursor.execute(f'ALTER TABLE {qn(old_table)} ALTER COLUMN id DROP DEFAULT')
+            cursor.execute(f'DROP SEQUENCE IF EXISTS {qn(sequence)}')
+            # Same for the primary key index name
+            cursor.execute(
+                f'ALTER TABLE {qn(old_table)} RENAME CONSTRAINT {qn(f"{table}_pkey")} '
+                f'TO {qn(f"{old_table}_pkey")}'
+            )
+
+            cursor.execute(
+                f'CREATE TABLE {qn(table)} (LIKE {qn(old_table)} INCLUDING DEFAULTS) '
+                f'PARTITION BY RANGE (created_at)'
+            )
+            cursor.execute(f'CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id')
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')"
+            )
+            cursor.execute(f'ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, created_at)')
+            cursor.execute(f'CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(table)} DEFAULT')
+
+            cursor.execute(f'SELECT MIN(created_at) FROM {qn(old_table)}')
+            oldest = cursor.fetchone()[0]
+            month = _month_start(oldest or timezone.now())
+            last = _month_start(timezone.now())
+            while month <= last:
+                create_partition(cursor, month)
+                month = _next_month(month)
+
+            cursor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old_table)}')
+            cursor.execute(
+                f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {qn(old_table)}), 0) + 1, false)"
+            )
+            cursor.execute(f'DROP TABLE {qn(old_table)}')
+
+        # Django's names, so later migrations can still find the indexes;
+        # admin_user_id has no index of its own (db_index=False)
+        for index in AuditLog._meta.indexes:
+            schema_editor.add_index(AuditLog, index)
+        # Added once the rows are in, so they are checked at once instead of
+        # leaving deferred checks pending (which blocks CREATE INDEX)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f"{table}_admin_user_id_fk")} '
+                f'FOREIGN KEY (admin_user_id) REFERENCES {qn(user_table)} (id) '
+                f'DEFERRABLE INITIALLY DEFERRED'
+            )
+
+    ensure_partitions(months_ahead)
@@ -0,0 +1,92 @@
+"""
+Helpers for materialized daily rollup tables.
+Rollup rows are keyed by a set of dimension fields and hold counters that are
+adjusted incrementally with F-expression updates, so analytics endpoints read
+a small number of pre-aggregated rows instead of scanning source tables.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+def apply_rollup_delta(model, keys, deltas):
+    """
+    Add deltas to the counters of the rollup row identified by keys,
+    creating the row if it does not exist yet.
+
+    Args:
+        model: Rollup model class
+        keys (dict): Dimension field values identifying the row
+        deltas (dict): Counter field -> amount to add (may be negative)
+    """
+    if not any(deltas.values()):
+        return
+
+    updates = {field: F(field) + amount for field, amount in deltas.items()}
+    updates['updated_at'] = timezone.now()
+
+    if model.objects.filter(**keys).update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **deltas)
+    except IntegrityError:
+        # Another writer created the row first; add to it instead
+        model.objects.filter(**keys).update(**updates)
+
+
+def apply_rollup_change(model, previous, current):
+    """
+    Move a source row's contribution between rollup rows.
+
+    Args:
+        model: Rollup model class
+        previous (tuple): (keys, deltas) the row contributed before, or None
+        current (tuple): (keys, deltas) the row contributes now, or None
+    """
+    if previous and current and previous[0] == current[0]:
+        keys = current[0]
+        fields = set(previous[1]) | set(current[1])
+        apply_rollup_delta(model, keys, {
+            field: current[1].get(field, 0) - previous[1].get(field, 0)
+            for field in fields
+        })
+        return
+
+    if previous:
+        keys, deltas = previous
+        apply_rollup_delta(model, keys, {field: -amount for field, amount in deltas.items()})
+    if current:
+        keys, deltas = current
+        apply_rollup_delta(model, keys, deltas)
+
+
+def rollup_date(value):
+    """Day bucket for a timestamp, in the current timezone."""
+    return timezone.localdate(value)
+
+
+def rebuild_rollup(model, rows, date_range=None):
+    """
+    Replace rollup rows with freshly aggregated ones.
+
+    Args:
+        model: Rollup model class
+        rows (iterable): Dicts with dimension and counter fields
+        date_range (tuple): Optional (start_date, end_date) inclusive;
+            only rows in this range are replaced
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    existing = model.objects.all()
+    if date_range:
+        existing = existing.filter(date__range=date_range)
+
+    objects = [model(**row) for row in rows]
+    with transaction.atomic():
+        existing.delete()
+        model.objects.bulk_create(objects, batch_size=1000)
+    return len(objects)
@@ -0,0 +1,291 @@
+"""
+Full-text search for catalog content.
+
+On PostgreSQL, models keep a weighted SearchVectorField (GIN indexed) that is
+refreshed on save and queried with ranking and highlighted snippets.
+On other databases (SQLite in tests and local setups) an in-memory inverted
+index with the same weighting is built from the rows the view's queryset
+returns and reused until they change.
+
+Models opt in with:
+    SEARCH_WEIGHTS = {'title': 'A', 'tags': 'B', 'description': 'C', 'content': 'D'}
+    SEARCH_HEADLINE_FIELD = 'description'
+    search_vector = SearchVectorField(null=True, editable=False)
+"""
+
+import json
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, models
+from django.db.models import Case, Count, F, FloatField, Max, Value, When
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
+
+# Rank weights for A/B/C/D, same defaults as PostgreSQL's ts_rank
+WEIGHT_VALUES = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+HEADLINE_START = '<b>'
+HEADLINE_STOP = '</b>'
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+SUFFIXES = ('ing', 'es', 'ed', 's')
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def _field_expression(model, field_name):
+    """Text expression for a field; JSON fields are cast to text."""
+    field = model._meta.get_field(field_name)
+    if isinstance(field, models.JSONField):
+        return Cast(field_name, models.TextField())
+    return F(field_name)
+
+
+def build_search_vector(model):
+    """Weighted SearchVector expression over the model's SEARCH_WEIGHTS."""
+    vector = None
+    for field_name, weight in model.SEARCH_WEIGHTS.items():
+        part = SearchVector(
+            _field_expression(model, field_name),
+            weight=weight,
+            config=settings.SEARCH_CONFIG
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(instance, update_fields=None):
+    """
+    Refresh the stored search vector of a saved instance (PostgreSQL only).
+    Uses an UPDATE so the vector is computed by the database.
+
+    Args:
+        instance: Saved model instance
+        update_fields: The save's update_fields; skipped if no searched field changed
+    """
+    if not uses_postgres_search():
+        return
+    if update_fields is not None and not set(update_fields) & set(type(instance).SEARCH_WEIGHTS):
+        return
+    model = type(instance)
+    model.objects.filter(pk=instance.pk).update(search_vector=build_search_vector(model))
+
+
+def tokenize(text):
+    """Lowercase word tokens with light suffix stripping."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        for suffix in SUFFIXES:
+            if len(token) > len(suffix) + 2 and token.endswith(suffix):
+                token = token[:-len(suffix)]
+                break
+        tokens.append(token)
+    return tokens
+
+
+def _as_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+class InMemorySearchIndex:
+    """
+    Weighted inverted index used when PostgreSQL full-text search is unavailable.
+
+    Scores follow the same A/B/C/D weighting as the PostgreSQL vector,
+    scaled by term frequency and inverse document frequency. All query terms
+    must match.
+    """
+
+    def __init__(self, model, rows):
+        self.headline_field = model.SEARCH_HEADLINE_FIELD
+        self.postings = defaultdict(dict)
+        self.headlines = {}
+
+        for row in rows:
+            pk = row['pk']
+            self.headlines[pk] = _as_text(row[self.headline_field])
+            for field_name, weight in model.SEARCH_WEIGHTS.items():
+                for token in tokenize(_as_text(row[field_name])):
+                    self.postings[token][pk] = (
+                        self.postings[token].get(pk, 0.0) + WEIGHT_VALUES[weight]
+                    )
+        self.document_count = len(self.headlines)
+
+    def search(self, query, limit):
+        """
+        Rank documents matching every term of query.
+
+        Returns:
+            list: (pk, score) pairs, best first, at most limit
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        scores = None
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                return []
+            idf = math.log(1 + self.document_count / len(postings))
+            # Dampen repeated occurrences, like ts_rank's log normalisation
+            term_scores = {pk: math.log1p(weight) * idf for pk, weight in postings.items()}
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {pk: score + term_scores[pk] for pk, score in scores.items() if pk in term_scores}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def headline(self, pk, query, max_words=35):
+        """
+        Snippet of the headline field around the first matching term,
+        with matches wrapped like PostgreSQL's ts_headline.
+        """
+        words = self.headlines.get(pk, '').split()
+        terms = set(tokenize(query))
+
+        def matches(word):
+            return any(token in terms for token in tokenize(word))
+
+        first = next((i for i, word in enumerate(words) if matches(word)), 0)
+        start = max(0, first - max_words // 3)
+        snippet = [
+            f'{HEADLINE_START}{word}{HEADLINE_STOP}' if matches(word) else word
+            for word in words[start:start + max_words]
+        ]
+        return ' '.join(snippet)
+
+
+# Indexes kept per process, one per distinct filtered queryset
+FALLBACK_INDEX_LIMIT = 32
+
+_fallback_indexes = {}
+_fallback_lock = threading.Lock()
+
+
+def get_fallback_index(queryset):
+    """
+    Get the in-memory index of the rows queryset returns, rebuilding it when
+    they changed (detected from the row count and latest updated_at).
+
+    Indexing only the queryset's rows (e.g. published ones for the public)
+    means hidden rows never take places under SEARCH_FALLBACK_MAX_RESULTS.
+    """
+    model = queryset.model
+    queryset = queryset.order_by()
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return InMemorySearchIndex(model, [])
+
+    signature = tuple(queryset.aggregate(count=Count('pk'), last=Max('updated_at')).values())
+    key = (model._meta.label, sql, tuple(map(str, params)))
+    cached = _fallback_indexes.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    fields = set(model.SEARCH_WEIGHTS) | {model.SEARCH_HEADLINE_FIELD}
+    rows = queryset.values('pk', *fields)
+    index = InMemorySearchIndex(model, rows)
+    with _fallback_lock:
+        _fallback_indexes.pop(key, None)
+        _fallback_indexes[key] = (signature, index)
+        while len(_fallback_indexes) > FALLBACK_INDEX_LIMIT:
+            _fallback_indexes.pop(next(iter(_fallback_indexes)))
+    return index
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search on ?search=.
+
+    Annotates results with search_rank and search_headline and orders by rank,
+    unless the client asked for an explicit ?ordering=. List it after
+    OrderingFilter in filter_backends so rank ordering is not overridden.
+    """
+    search_param = 'search'
+    ordering_param = 'ordering'
+
+    def get_search_query(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if not query:
+            return queryset
+
+        if uses_postgres_search():
+            queryset = self.filter_postgres(queryset, query)
+        else:
+            queryset = self.filter_fallback(queryset, query)
+
+        if self.ordering_param not in request.query_params:
+            queryset = queryset.order_by('-search_rank', 'pk')
+        return queryset
+
+    def filter_postgres(self, queryset, query):
+        model = queryset.model
+        search_query = SearchQuery(query, search_type='websearch', config=settings.SEARCH_CONFIG)
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query),
+            search_headline=SearchHeadline(
+                _field_expression(model, model.SEARCH_HEADLINE_FIELD),
+                search_query,
+                config=settings.SEARCH_CONFIG,
+                start_sel=HEADLINE_START,
+                stop_sel=HEADLINE_STOP,
+            ),
+        )
+
+    def filter_fallback(self, queryset, query):
+        index = get_fallback_index(queryset)
+        ranked = index.search(query, limit=settings.SEARCH_FALLBACK_MAX_RESULTS)
+        if not ranked:
+            return queryset.none().annotate(
+                search_rank=Value(0.0, output_field=FloatField()),
+                search_headline=Value('', output_field=models.TextField()),
+            )
+
+        return queryset.filter(pk__in=[pk for pk, _ in ranked]).annotate(
+            search_rank=Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in ranked],
+                output_field=FloatField()
+            ),
+            search_headline=Case(
+                *[When(pk=pk, then=Value(index.headline(pk, query))) for pk, _ in ranked],
+                output_field=models.TextField()
+            ),
+        )
+
+
+class SearchResultSerializerMixin:
+    """
+    Serializer mixin adding search_rank and search_headline to the output
+    when the instance was returned by FullTextSearchFilter.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, 'search_rank'):
+            data['search_rank'] = round(float(instance.search_rank or 0), 6)
+            data['search_headline'] = instance.search_headline
+        return data
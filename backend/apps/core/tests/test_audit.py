@@ -0,0 +1,223 @@
+"""
+Tests for the buffered audit log writer and its spool.
+"""
+
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.core import audit
+from apps.core.audit import AuditWriter, drain_spool, entry_to_record
+from apps.core.models import AuditLog, log_admin_action
+
+
+@pytest.fixture
+def admin(db):
+    return AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+
+
+@pytest.fixture
+def spool_path(tmp_path):
+    return str(tmp_path / 'audit.jsonl')
+
+
+def make_writer(**options):
+    """A writer without the flusher thread, so tests decide when it flushes."""
+    writer = AuditWriter(**{'batch_size': 10, 'flush_interval': 3600, **options})
+    writer._pid = os.getpid()
+    return writer
+
+
+@pytest.fixture
+def writer(monkeypatch, settings):
+    settings.AUDIT_BUFFER_ENABLED = True
+    writer = make_writer()
+    monkeypatch.setattr(audit, '_writer', writer)
+    return writer
+
+
+def make_entry(admin, resource_id='1', action='view'):
+    """An unsaved entry, as log_admin_action() queues it."""
+    return AuditLog(
+        admin_user=admin, action=action, resource_type='Report', resource_id=resource_id,
+        details={'format': 'csv'},
+    )
+
+
+def log_view(admin, resource_id='1', **options):
+    return log_admin_action(admin, 'view', 'Report', resource_id, details={'format': 'csv'}, **options)
+
+
+def fail_bulk_create(monkeypatch):
+    def bulk_create(*args, **kwargs):
+        raise DatabaseError('database is down')
+    monkeypatch.setattr(AuditLog.objects, 'bulk_create', bulk_create)
+
+
+def read_spool(path):
+    with open(path, encoding='utf-8') as spool_file:
+        return [json.loads(line) for line in spool_file]
+
+
+@pytest.mark.django_db
+class TestBufferedWrites:
+    """Entries wait in the buffer until a flush."""
+
+    def test_entries_written_on_flush(self, admin, writer):
+        log_view(admin, '1')
+        log_view(admin, '2')
+
+        assert not AuditLog.objects.exists()
+        assert writer.pending() == 2
+
+        assert audit.flush_audit_log() == 2
+        assert writer.pending() == 0
+        assert sorted(AuditLog.objects.values_list('resource_id', flat=True)) == ['1', '2']
+
+    def test_unbuffered_entry_written_immediately(self, admin, writer):
+        entry = log_view(admin, buffered=False)
+
+        assert entry.pk is not None
+        assert AuditLog.objects.get().details == {'format': 'csv'}
+        assert writer.pending() == 0
+
+    def test_buffering_disabled_in_settings(self, admin, writer, settings):
+        settings.AUDIT_BUFFER_ENABLED = False
+
+        log_view(admin)
+
+        assert AuditLog.objects.count() == 1
+        assert writer.pending() == 0
+
+    def test_flushed_at_request_end(self, admin, writer):
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        # Rejected uploads are logged too
+        response = client.post('/api/reports/bulk/', [42], format='json')
+
+        assert response.status_code == 400
+        entry = AuditLog.objects.get()
+        assert (entry.action, entry.resource_id) == ('create', 'bulk')
+        assert writer.pending() == 0
+
+    def test_request_end_flush_can_be_disabled(self, admin, writer, settings):
+        settings.AUDIT_FLUSH_ON_REQUEST_END = False
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        client.post('/api/reports/bulk/', [42], format='json')
+
+        assert not AuditLog.objects.exists()
+        assert writer.pending() == 1
+
+    def test_full_batch_wakes_flusher(self, admin, writer):
+        for index in range(writer.batch_size - 1):
+            log_view(admin, str(index))
+        assert not writer._wakeup.is_set()
+
+        log_view(admin)
+
+        assert writer._wakeup.is_set()
+
+
+@pytest.mark.django_db
+class TestSpool:
+    """Entries the database cannot take go to the spool file."""
+
+    def test_failed_flush_spooled(self, admin, monkeypatch, spool_path):
+        writer = make_writer(spool_path=spool_path)
+        writer.enqueue(make_entry(admin, '7'))
+        fail_bulk_create(monkeypatch)
+
+        assert writer.flush() == 0
+
+        assert writer.pending() == 0
+        [record] = read_spool(spool_path)
+        assert record['resource_id'] == '7'
+        assert record['admin_user_id'] == admin.id
+        assert record['details'] == {'format': 'csv'}
+
+    def test_failed_flush_without_spool_keeps_entries(self, admin, monkeypatch):
+        writer = make_writer()
+        writer.enqueue(make_entry(admin))
+        fail_bulk_create(monkeypatch)
+
+        assert writer.flush() == 0
+        assert writer.pending() == 1
+
+        monkeypatch.undo()
+        assert writer.flush() == 1
+        assert AuditLog.objects.count() == 1
+
+    def test_overflow_spooled_while_flush_runs(self, admin, spool_path):
+        writer = make_writer(max_pending=2, spool_path=spool_path)
+        entries = [make_entry(admin, str(index)) for index in range(3)]
+
+        with writer._flush_lock:
+            for entry in entries:
+                writer.enqueue(entry)
+
+        assert writer.pending() == 2
+        assert [record['resource_id'] for record in read_spool(spool_path)] == ['2']
+
+    def test_close_spools_what_cannot_be_written(self, admin, monkeypatch, spool_path):
+        writer = make_writer(spool_path=spool_path)
+        writer.enqueue(make_entry(admin, action='delete'))
+        fail_bulk_create(monkeypatch)
+
+        writer.close()
+
+        assert writer.pending() == 0
+        assert [record['action'] for record in read_spool(spool_path)] == ['delete']
+
+
+@pytest.mark.django_db
+class TestDrainSpool:
+    """Replaying the spool into the audit table."""
+
+    def write_spool(self, path, admin, count):
+        entries = [make_entry(admin, str(index)) for index in range(count)]
+        with open(path, 'a', encoding='utf-8') as spool_file:
+            for entry in entries:
+                spool_file.write(json.dumps(entry_to_record(entry)) + '\n')
+        return entries
+
+    def test_entries_replayed_and_file_removed(self, admin, spool_path):
+        entries = self.write_spool(spool_path, admin, 5)
+
+        assert drain_spool(spool_path, batch_size=2) == 5
+
+        assert not os.path.exists(spool_path)
+        assert not os.path.exists(f'{spool_path}.draining')
+        stored = AuditLog.objects.order_by('resource_id')
+        assert [entry.resource_id for entry in stored] == ['0', '1', '2', '3', '4']
+        assert stored[0].created_at == entries[0].created_at
+        assert stored[0].admin_user == admin
+
+    def test_interrupted_drain_resumed(self, admin, spool_path):
+        self.write_spool(f'{spool_path}.draining', admin, 2)
+        self.write_spool(spool_path, admin, 1)
+
+        # The file being drained is finished first; the new spool waits
+        assert drain_spool(spool_path) == 2
+        assert os.path.exists(spool_path)
+        assert drain_spool(spool_path) == 1
+        assert AuditLog.objects.count() == 3
+
+    def test_missing_spool(self, spool_path):
+        assert drain_spool(spool_path) == 0
+
+    def test_command(self, admin, spool_path, settings, capsys):
+        settings.AUDIT_SPOOL_PATH = spool_path
+        self.write_spool(spool_path, admin, 3)
+
+        call_command('drain_audit_spool')
+
+        assert AuditLog.objects.count() == 3
+        assert f'Loaded 3 audit entries from {spool_path}' in capsys.readouterr().out
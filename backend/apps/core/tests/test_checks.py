@@ -0,0 +1,30 @@
+"""
+Tests for the deployment system checks.
+"""
+
+from apps.core.checks import check_catalog_cache
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+FILE = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/c'}}
+
+
+class TestCatalogCacheCheck:
+    """Per-process catalog caches are refused outside DEBUG."""
+
+    def test_locmem_refused_without_debug(self, settings):
+        settings.DEBUG = False
+        settings.CACHES = LOCMEM
+
+        assert [error.id for error in check_catalog_cache(None)] == ['core.E001']
+
+    def test_locmem_allowed_in_debug(self, settings):
+        settings.DEBUG = True
+        settings.CACHES = LOCMEM
+
+        assert check_catalog_cache(None) == []
+
+    def test_shared_backend_allowed(self, settings):
+        settings.DEBUG = False
+        settings.CACHES = FILE
+
+        assert check_catalog_cache(None) == []
@@ -0,0 +1,87 @@
+"""
+Tests for confirmation code generation and validation.
+"""
+
+import re
+from urllib.parse import quote
+
+import pytest
+
+from apps.core.codes import (
+    ALPHABET, check_symbol, decode, format_code, generate_code, normalize_code,
+    validate_code,
+)
+
+CODE_SHAPE = re.compile(r'^[A-Z]{1,4}-\d{4}-[0-9A-HJKMNP-TV-Z]{11}$')
+
+
+def mistypes(body):
+    """Every single-symbol substitution and adjacent swap of a body with its check symbol."""
+    for i, symbol in enumerate(body):
+        for other in ALPHABET:
+            if other != symbol:
+                yield body[:i] + other + body[i + 1:]
+    for i in range(len(body) - 1):
+        if body[i] != body[i + 1]:
+            yield body[:i] + body[i + 1] + body[i] + body[i + 2:]
+
+
+class TestCheckSymbol:
+    """The GF(32) check symbol."""
+
+    @pytest.mark.parametrize('value', [0, 1, 31, 32, 12345678901, 2 ** 50 - 1])
+    def test_check_symbol_in_alphabet(self, value):
+        assert check_symbol(value) in ALPHABET
+
+    @pytest.mark.parametrize('value', [0, 1, 0x2F4A1B3C5D, 2 ** 50 - 1, 987654321012])
+    def test_detects_substitutions_and_adjacent_swaps(self, value):
+        body = format_code('DON', value, 2026).split('-')[2]
+        for mistyped in mistypes(body):
+            assert check_symbol(decode(mistyped[:10])) != mistyped[10], mistyped
+
+    def test_generated_codes_are_url_safe(self):
+        for _ in range(500):
+            code = generate_code('DON')
+            assert CODE_SHAPE.match(code), code
+            assert quote(code, safe='') == code
+
+
+class TestNormalizeCode:
+    """Validation and normalization of user-typed codes, without the database."""
+
+    def test_generated_code_round_trips(self):
+        code = generate_code('SH')
+        assert normalize_code(code) == code
+        assert normalize_code(code, prefix='SH') == code
+        assert validate_code(code)
+
+    def test_aliases_and_case_are_normalized(self):
+        code = format_code('DON', 0, 2026)
+        assert code == 'DON-2026-00000000000'
+        assert normalize_code(' don-2026-ooooooooooo ') == code
+        value = decode('1111111111')
+        code = format_code('SH', value, 2026)
+        typed = 'sh-2026-' + 'iLiLiLiLiL' + code[-1].lower()
+        assert normalize_code(typed) == code
+
+    def test_wrong_prefix_rejected(self):
+        assert normalize_code(generate_code('SH'), prefix='DON') is None
+
+    @pytest.mark.parametrize('code', [
+        None, 12, '', 'DON', 'DON-2026', 'DON-26-00000000000', 'DON-2026-0000000000',
+        'DON-2026-000000000000', 'DONOR-2026-00000000000', 'DON-2026-0000000000U',
+        'DON-2026-00000/00000',
+    ])
+    def test_malformed_rejected(self, code):
+        assert normalize_code(code) is None
+
+    def test_mistyped_code_rejected(self):
+        code = format_code('DON', 0x2F4A1B3C5D, 2026)
+        body = code.split('-')[2]
+        for mistyped in mistypes(body):
+            assert normalize_code(f'DON-2026-{mistyped}') is None, mistyped
+
+    def test_legacy_hex_format_valid(self):
+        assert normalize_code('SH-2025-A7B9C2') == 'SH-2025-A7B9C2'
+        assert normalize_code('sh-2025-a7b9c2') == 'SH-2025-A7B9C2'
+        assert normalize_code('SH-2025-A7B9C2', prefix='DON') is None
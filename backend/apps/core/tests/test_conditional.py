@@ -0,0 +1,144 @@
+"""
+Tests for conditional GET (ETag / Last-Modified) on catalog endpoints.
+"""
+
+import pytest
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.lessons.models import Lesson
+
+
+@pytest.fixture(autouse=True)
+def no_replica_lag(settings):
+    settings.DATABASE_REPLICA_MAX_LAG = 0
+
+
+def create_lesson(title='Passwords', published=True):
+    return Lesson.objects.create(
+        title=title, description='Strong passwords', category='security',
+        duration_minutes=5, difficulty='beginner', content={'sections': []}, published=published,
+    )
+
+
+def vary(response):
+    return [header.strip() for header in response['Vary'].split(',')]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRetrieve:
+    """GET /api/lessons/{id}/"""
+
+    def test_validators_set(self):
+        lesson = create_lesson()
+
+        response = APIClient().get(f'/api/lessons/{lesson.id}/')
+
+        assert response.status_code == 200
+        assert response['ETag'].startswith('"')
+        assert response['Last-Modified'] == http_date(int(lesson.updated_at.timestamp()))
+        assert 'Authorization' in vary(response)
+
+    def test_matching_etag_not_modified(self):
+        lesson = create_lesson()
+        client = APIClient()
+        etag = client.get(f'/api/lessons/{lesson.id}/')['ETag']
+
+        response = client.get(f'/api/lessons/{lesson.id}/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert 'Authorization' in vary(response)
+        assert response.content == b''
+
+    def test_if_modified_since_not_modified(self):
+        lesson = create_lesson()
+        client = APIClient()
+        last_modified = client.get(f'/api/lessons/{lesson.id}/')['Last-Modified']
+
+        response = client.get(f'/api/lessons/{lesson.id}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    def test_update_changes_etag(self):
+        lesson = create_lesson()
+        client = APIClient()
+        etag = client.get(f'/api/lessons/{lesson.id}/')['ETag']
+
+        lesson.title = 'Strong passwords'
+        lesson.save()
+        response = client.get(f'/api/lessons/{lesson.id}/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.data['title'] == 'Strong passwords'
+        assert response['ETag'] != etag
+
+    def test_missing_row_has_no_validators(self):
+        response = APIClient().get('/api/lessons/999999/')
+
+        assert response.status_code == 404
+        assert not response.has_header('ETag')
+
+
+@pytest.mark.django_db(transaction=True)
+class TestList:
+    """GET /api/lessons/"""
+
+    def test_etag_without_last_modified(self):
+        create_lesson()
+
+        response = APIClient().get('/api/lessons/')
+
+        assert response.status_code == 200
+        assert response.has_header('ETag')
+        assert not response.has_header('Last-Modified')
+        assert 'Authorization' in vary(response)
+
+    def test_matching_etag_not_modified(self):
+        create_lesson()
+        client = APIClient()
+        etag = client.get('/api/lessons/')['ETag']
+
+        response = client.get('/api/lessons/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_delete_changes_etag(self):
+        create_lesson('Passwords')
+        other = create_lesson('Phishing')
+        client = APIClient()
+        etag = client.get('/api/lessons/')['ETag']
+
+        other.delete()
+        response = client.get('/api/lessons/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert [lesson['title'] for lesson in response.data['results']] == ['Passwords']
+        assert response['ETag'] != etag
+
+    def test_if_modified_since_after_delete_not_answered_with_304(self):
+        create_lesson('Passwords')
+        other = create_lesson('Phishing')
+        client = APIClient()
+        client.get('/api/lessons/')
+
+        # The remaining rows are older than the client's copy
+        other.delete()
+        response = client.get('/api/lessons/', HTTP_IF_MODIFIED_SINCE=http_date())
+
+        assert response.status_code == 200
+        assert [lesson['title'] for lesson in response.data['results']] == ['Passwords']
+
+    def test_etag_depends_on_query_and_scope(self):
+        create_lesson('Passwords')
+        create_lesson('Draft', published=False)
+        admin = AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin)
+
+        public = APIClient().get('/api/lessons/')['ETag']
+
+        assert APIClient().get('/api/lessons/?category=security')['ETag'] != public
+        assert admin_client.get('/api/lessons/')['ETag'] != public
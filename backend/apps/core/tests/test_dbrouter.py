@@ -0,0 +1,175 @@
+"""
+Tests for read-replica routing.
+
+The replica is a second SQLite database holding different rows than the
+primary, so each response shows which database it was read from.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.core.cache import bump_cache_version
+from apps.core.dbrouter import route_reads, use_primary
+from apps.donations.models import Donation
+from apps.lessons.models import Lesson
+
+REPLICA = 'replica'
+
+@pytest.fixture(scope='module')
+def replica_database(django_db_setup, django_db_blocker, tmp_path_factory):
+    """Register a migrated SQLite database as the replica alias for this module."""
+    previous = connections.settings.get(REPLICA)
+    connections.settings[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path_factory.mktemp('replica') / 'replica.sqlite3'),
+    }
+    connections.configure_settings(connections.settings)
+    with django_db_blocker.unblock():
+        call_command('migrate', database=REPLICA, verbosity=0)
+    yield
+
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    if previous is None:
+        del connections.settings[REPLICA]
+    else:
+        connections.settings[REPLICA] = previous
+
+
+@pytest.fixture
+def replica(replica_database, settings):
+    settings.DATABASE_REPLICA_ALIAS = REPLICA
+    settings.DATABASE_REPLICA_MAX_LAG = 0
+    return REPLICA
+
+
+def create_lesson(title, using=DEFAULT_DB_ALIAS):
+    return Lesson.objects.using(using).create(
+        title=title, description='Strong passwords', category='security',
+        duration_minutes=5, difficulty='beginner', content={'sections': []}, published=True,
+    )
+
+
+def titles(response):
+    return [lesson['title'] for lesson in response.data['results']]
+
+
+def admin_client():
+    admin = AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', REPLICA])
+class TestRequestRouting:
+    """Which database a request reads from."""
+
+    def test_replica_action_reads_replica(self, replica):
+        create_lesson('Primary')
+        create_lesson('Replica', using=replica)
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary:
+            response = APIClient().get('/api/lessons/')
+
+        assert response.status_code == 200
+        assert titles(response) == ['Replica']
+        assert len(primary) == 0
+
+    def test_other_actions_read_primary(self, replica):
+        donation = Donation.objects.create(amount=Decimal('25.00'), status='completed')
+
+        with CaptureQueriesContext(connections[replica]) as replica_queries:
+            response = APIClient().get(f'/api/donations/{donation.confirmation_code}/')
+
+        assert response.status_code == 200
+        assert len(replica_queries) == 0
+
+    def test_without_replica_alias_reads_primary(self, replica, settings):
+        create_lesson('Primary')
+        create_lesson('Replica', using=replica)
+        settings.DATABASE_REPLICA_ALIAS = 'missing'
+
+        response = APIClient().get('/api/lessons/')
+
+        assert titles(response) == ['Primary']
+
+    def test_recent_cache_bump_reads_primary(self, replica, settings):
+        create_lesson('Primary')
+        create_lesson('Replica', using=replica)
+        settings.DATABASE_REPLICA_MAX_LAG = 60
+        bump_cache_version('lessons')
+
+        response = APIClient().get('/api/lessons/')
+
+        assert titles(response) == ['Primary']
+
+    def test_cache_bump_older_than_max_lag_reads_replica(self, replica, settings):
+        create_lesson('Primary')
+        create_lesson('Replica', using=replica)
+        settings.DATABASE_REPLICA_MAX_LAG = 0.001
+        bump_cache_version('lessons')
+
+        response = APIClient().get('/api/lessons/')
+
+        assert titles(response) == ['Replica']
+
+    def test_streaming_export_reads_replica(self, replica):
+        client = admin_client()
+        Donation.objects.create(amount=Decimal('10.00'), status='completed')
+        donation = Donation.objects.using(replica).create(amount=Decimal('25.00'), status='completed')
+
+        response = client.get('/api/donations/export/?export_format=csv')
+        with CaptureQueriesContext(connections[replica]) as replica_queries:
+            content = b''.join(response.streaming_content).decode()
+
+        assert response.status_code == 200
+        rows = content.splitlines()[1:]
+        assert len(rows) == 1
+        assert donation.confirmation_code in rows[0]
+        # The rows are fetched while the response is streamed
+        assert len(replica_queries) > 0
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', REPLICA])
+class TestRouteReads:
+    """Routing inside a route_reads block."""
+
+    def test_reads_use_replica(self, replica):
+        create_lesson('Replica', using=replica)
+
+        with route_reads():
+            assert list(Lesson.objects.values_list('title', flat=True)) == ['Replica']
+
+    def test_reads_stick_to_primary_after_write(self, replica):
+        with route_reads() as state:
+            assert Lesson.objects.db == replica
+            create_lesson('Primary')
+
+            assert state.wrote
+            assert Lesson.objects.db == DEFAULT_DB_ALIAS
+            assert list(Lesson.objects.values_list('title', flat=True)) == ['Primary']
+
+    def test_use_primary_sticks(self, replica):
+        with route_reads():
+            use_primary()
+            assert Lesson.objects.db == DEFAULT_DB_ALIAS
+
+    def test_reads_in_transaction_use_primary(self, replica):
+        with route_reads(), transaction.atomic():
+            assert Lesson.objects.db == DEFAULT_DB_ALIAS
+        with route_reads():
+            assert Lesson.objects.db == replica
+
+    def test_reads_without_replica_use_primary(self, replica):
+        with route_reads(use_replica=False):
+            assert Lesson.objects.db == DEFAULT_DB_ALIAS
+
+    def test_reads_outside_routing_use_primary(self, replica):
+        assert Lesson.objects.db == DEFAULT_DB_ALIAS
@@ -0,0 +1,79 @@
+"""
+Tests for field encryption keys and key rotation.
+"""
+
+import pytest
+from cryptography.fernet import Fernet
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from apps.core.utils import decrypt_field, encrypt_field, get_cipher
+from apps.reports.models import Report
+
+PLACEHOLDER_KEY = 'change-this-to-a-32-byte-fernet-key'
+
+
+class TestCipher:
+    """Key validation and decryption with retired keys."""
+
+    def test_round_trip(self):
+        token = encrypt_field('sensitive')
+
+        assert token != 'sensitive'
+        assert decrypt_field(token) == 'sensitive'
+
+    @pytest.mark.parametrize('key', [PLACEHOLDER_KEY, 'not-a-key'])
+    def test_invalid_key_refused_without_debug(self, settings, key):
+        settings.DEBUG = False
+        settings.ENCRYPTION_KEY = key
+
+        with pytest.raises(ImproperlyConfigured):
+            get_cipher()
+
+    def test_invalid_key_falls_back_in_debug(self, settings):
+        settings.DEBUG = True
+        settings.ENCRYPTION_KEY = PLACEHOLDER_KEY
+
+        assert decrypt_field(encrypt_field('dev only')) == 'dev only'
+
+    def test_previous_keys_still_decrypt(self, settings):
+        token = encrypt_field('old secret')
+        settings.ENCRYPTION_PREVIOUS_KEYS = [settings.ENCRYPTION_KEY]
+        settings.ENCRYPTION_KEY = Fernet.generate_key().decode()
+
+        assert decrypt_field(token) == 'old secret'
+
+
+@pytest.mark.django_db
+class TestRotateEncryptionKey:
+    """python manage.py rotate_encryption_key"""
+
+    def create_report(self, description):
+        return Report.objects.create(
+            incident_type='other', description=description, timestamp=timezone.now()
+        )
+
+    def test_reencrypts_under_new_key(self, settings):
+        old_key = settings.ENCRYPTION_KEY
+        report = self.create_report('rotate me')
+        settings.ENCRYPTION_PREVIOUS_KEYS = [old_key]
+        settings.ENCRYPTION_KEY = Fernet.generate_key().decode()
+
+        call_command('rotate_encryption_key', batch_size=1)
+
+        report.refresh_from_db()
+        assert Fernet(settings.ENCRYPTION_KEY).decrypt(report.description.encode()) == b'rotate me'
+
+    @pytest.mark.parametrize('debug', [False, True])
+    def test_refuses_invalid_primary_key(self, settings, debug):
+        report = self.create_report('keep me')
+        stored = Report.objects.get(pk=report.pk).description
+        settings.DEBUG = debug
+        settings.ENCRYPTION_PREVIOUS_KEYS = [settings.ENCRYPTION_KEY]
+        settings.ENCRYPTION_KEY = 'mistyped-key'
+
+        with pytest.raises(CommandError):
+            call_command('rotate_encryption_key')
+
+        assert Report.objects.get(pk=report.pk).description == stored
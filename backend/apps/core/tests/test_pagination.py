@@ -0,0 +1,159 @@
+"""
+Tests for keyset (cursor) pagination.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.pagination import KeysetPagination
+from apps.donations.models import Donation
+
+
+def paginate(url='/api/donations/'):
+    """Paginate all donations for a GET of url."""
+    paginator = KeysetPagination()
+    request = Request(APIRequestFactory().get(url))
+    page = paginator.paginate_queryset(Donation.objects.all(), request)
+    return paginator, [donation.pk for donation in page]
+
+
+def follow(link):
+    """Path and query of a next/previous link."""
+    parts = urlsplit(link)
+    return f'{parts.path}?{parts.query}' if parts.query else parts.path
+
+
+def create_donations(timestamps):
+    """Create one donation per created_at value; returns them newest first."""
+    for created_at in timestamps:
+        donation = Donation.objects.create(amount=Decimal('5.00'), is_anonymous=True)
+        Donation.objects.filter(pk=donation.pk).update(created_at=created_at)
+    rows = Donation.objects.order_by('-created_at', '-id').values_list('pk', flat=True)
+    return list(rows)
+
+
+@pytest.fixture
+def now():
+    return timezone.now().replace(microsecond=123456)
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Page walks, cursor edges and counts."""
+
+    def test_empty_queryset(self):
+        paginator, page = paginate()
+
+        assert page == []
+        assert paginator.get_next_link() is None
+        assert paginator.get_previous_link() is None
+        assert paginator.count == 0
+
+    def test_forward_walk_visits_every_row_once_with_ties(self, now):
+        # Groups of rows sharing a timestamp straddle page edges
+        expected = create_donations([now - timedelta(seconds=i // 3) for i in range(11)])
+
+        seen = []
+        url = '/api/donations/?page_size=4'
+        pages = 0
+        while url:
+            paginator, page = paginate(url)
+            seen.extend(page)
+            pages += 1
+            link = paginator.get_next_link()
+            url = follow(link) if link else None
+
+        assert seen == expected
+        assert pages == 3
+
+    def test_backward_walk_returns_same_pages(self, now):
+        create_donations([now - timedelta(seconds=i // 2) for i in range(10)])
+
+        forward = []
+        url = '/api/donations/?page_size=3'
+        while url:
+            paginator, page = paginate(url)
+            forward.append(page)
+            link = paginator.get_next_link()
+            url = follow(link) if link else None
+
+        backward = []
+        link = paginator.get_previous_link()
+        while link:
+            paginator, page = paginate(follow(link))
+            backward.append(page)
+            link = paginator.get_previous_link()
+
+        assert list(reversed(backward)) == forward[:-1]
+        # The first page reached backwards has no previous link but a next one
+        assert paginator.get_next_link() is not None
+
+    def test_last_page_exactly_full_has_no_next(self, now):
+        create_donations([now - timedelta(seconds=i) for i in range(4)])
+
+        paginator, page = paginate('/api/donations/?page_size=2')
+        paginator, page = paginate(follow(paginator.get_next_link()))
+
+        assert len(page) == 2
+        assert paginator.get_next_link() is None
+        assert paginator.get_previous_link() is not None
+
+    def test_new_rows_do_not_shift_pages(self, now):
+        expected = create_donations([now - timedelta(seconds=i) for i in range(6)])
+        paginator, first = paginate('/api/donations/?page_size=3')
+
+        create_donations([now + timedelta(seconds=1)])
+        paginator, second = paginate(follow(paginator.get_next_link()))
+
+        assert first + second == expected
+
+    def test_previous_from_emptied_page_returns_to_first_page(self, now):
+        create_donations([now - timedelta(seconds=i) for i in range(3)])
+        paginator, _ = paginate('/api/donations/?page_size=2')
+        next_url = follow(paginator.get_next_link())
+        Donation.objects.all().delete()
+
+        paginator, page = paginate(next_url)
+
+        assert page == []
+        assert 'cursor' not in parse_qs(urlsplit(paginator.get_previous_link()).query)
+
+    @pytest.mark.parametrize('cursor', ['garbage', 'e30', 'eyJjIjoieCIsImkiOjF9', '!!'])
+    def test_invalid_cursor_not_found(self, cursor):
+        with pytest.raises(NotFound):
+            paginate(f'/api/donations/?cursor={cursor}')
+
+    @pytest.mark.parametrize('page_size,expected', [
+        ('5', 5), ('0', 20), ('-3', 20), ('abc', 20), ('1000', 100),
+    ])
+    def test_page_size_bounds(self, page_size, expected):
+        paginator = KeysetPagination()
+        request = Request(APIRequestFactory().get(f'/api/donations/?page_size={page_size}'))
+
+        assert paginator.get_page_size(request) == expected
+
+    def test_count_estimate_flagged(self, now):
+        create_donations([now - timedelta(seconds=i) for i in range(3)])
+
+        paginator, _ = paginate('/api/donations/?count=estimate')
+        response = paginator.get_paginated_response([])
+
+        assert response.data['count_estimated'] is True
+        # Other databases than PostgreSQL fall back to an exact count
+        assert response.data['count'] >= 0
+
+    def test_exact_count_by_default(self, now):
+        create_donations([now - timedelta(seconds=i) for i in range(3)])
+
+        paginator, _ = paginate('/api/donations/?page_size=1')
+        response = paginator.get_paginated_response([])
+
+        assert response.data['count'] == 3
+        assert 'count_estimated' not in response.data
@@ -0,0 +1,78 @@
+"""
+Tests for precomputed static payloads and the views serving them.
+"""
+
+import json
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework.throttling import AnonRateThrottle
+
+from apps.core.payloads import get_meta_payload, get_payload
+
+CHATBOT_URLS = {
+    'chatbot.suggestions': '/api/chatbot/suggestions/',
+    'chatbot.resources': '/api/chatbot/resources/',
+}
+
+
+class TestRendering:
+    """Payloads are rendered while the apps load, not on first request."""
+
+    @pytest.mark.parametrize('name', [
+        'lessons.categories', 'lessons.difficulties', 'reports.incident_types',
+        'helplines.categories', 'resources.categories', 'resources.types',
+        'chatbot.suggestions', 'chatbot.resources',
+    ])
+    def test_registered_payloads_rendered_at_startup(self, name):
+        assert get_payload(name)._rendered is not None
+
+    def test_meta_rendered_at_startup_and_grouped(self):
+        meta = get_meta_payload()
+
+        assert meta._rendered is not None
+        assert meta.data['chatbot']['suggestions'] == get_payload('chatbot.suggestions').data['suggestions']
+        assert set(meta.data) >= {'lessons', 'reports', 'helplines', 'resources', 'chatbot'}
+
+
+@pytest.mark.django_db
+class TestPayloadViews:
+    """GET /api/chatbot/suggestions/, /api/chatbot/resources/ and /api/meta/"""
+
+    @pytest.mark.parametrize('name, url', [*CHATBOT_URLS.items(), ('meta', '/api/meta/')])
+    def test_payload_served_with_validators(self, name, url):
+        payload = get_meta_payload() if name == 'meta' else get_payload(name)
+
+        response = APIClient().get(url)
+
+        assert response.status_code == 200
+        assert response.content == payload.content
+        assert json.loads(response.content) == payload.data
+        assert response['Content-Type'] == 'application/json'
+        assert response['ETag'] == payload.etag
+        assert 'public' in response['Cache-Control']
+
+    @pytest.mark.parametrize('url', CHATBOT_URLS.values())
+    def test_matching_etag_not_modified(self, url):
+        client = APIClient()
+        etag = client.get(url)['ETag']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b''
+
+    @pytest.mark.parametrize('url', [*CHATBOT_URLS.values(), '/api/meta/'])
+    def test_only_get_allowed(self, url):
+        response = APIClient().post(url, {}, format='json')
+
+        assert response.status_code == 405
+
+    @pytest.mark.parametrize('url', [*CHATBOT_URLS.values(), '/api/meta/'])
+    def test_anonymous_requests_throttled(self, url, monkeypatch):
+        monkeypatch.setattr(AnonRateThrottle, 'THROTTLE_RATES', {'anon': '2/hour'})
+        client = APIClient()
+
+        statuses = [client.get(url).status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
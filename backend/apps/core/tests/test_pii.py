@@ -0,0 +1,154 @@
+"""
+Tests for the PII scanning engine and the scanners built on it.
+"""
+
+import re
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from apps.core.pii import PIIRule, PIIScanBudgetExceeded, PIIScanner, pii_scan_budget
+from apps.core.utils import PII_SCANNER as CORE_SCANNER
+from apps.reports.utils import PII_SCANNER as REPORTS_SCANNER, process_report_text
+
+SCANNERS = [CORE_SCANNER, REPORTS_SCANNER]
+
+# Pieces of PII and near-PII that fuzzed texts are built from
+FRAGMENTS = [
+    'Maria Lopez', '555-123-4567', '(555) 123-4567', '+44 20 7946 0958', '+1-555-1234567',
+    'john.doe@mail.example.com', 'a@b.co', '123-45-6789', '4111 1111 1111 1111',
+    '42 Oak Street', 'my name is Jane Smith', 'called Bob Ray', 'x', '.', ' ', '\n',
+    'Hello World', 'foo@bar', '12345678901234',
+]
+
+texts = st.lists(st.sampled_from(FRAGMENTS), min_size=1, max_size=12).flatmap(
+    lambda parts: st.sampled_from([' '.join(parts), ''.join(parts)])
+)
+
+
+def sequential_redact(scanner, text):
+    """Redact the way the per-pattern passes did: one re.sub per rule, in order."""
+    for rule in scanner.rules:
+        if rule.replacement is not None:
+            text = rule.regex.sub(rule.replacement, text)
+    return text
+
+
+class TestRedaction:
+    """Redaction output, including matches of different rules that overlap."""
+
+    @pytest.mark.parametrize('text,expected', [
+        ('my name is John Smitha@b.com', 'my name is [NAME_REDACTED]'),
+        ('call 4111 1111 1111 1111 now', 'call [CREDIT_CARD_REDACTED] now'),
+        # The longer match decides the replacement for the merged span
+        ('i am Jane Doe.doe@mail.example.com', '[EMAIL_REDACTED]'),
+        ('555-123-4567-89-0123', '[PHONE_REDACTED]-89-0123'),
+    ])
+    def test_reports_overlapping_matches_leave_no_fragment(self, text, expected):
+        assert REPORTS_SCANNER.redact(text) == expected
+
+    @pytest.mark.parametrize('text,expected', [
+        ('42 oak street, 555-123-4567', '[ADDRESS REDACTED], [PHONE REDACTED]'),
+        ('write to jo@mail.example.com or 555.123.4567',
+         'write to [EMAIL REDACTED] or [PHONE REDACTED]'),
+        ('ssn 123-45-6789', 'ssn [SSN REDACTED]'),
+    ])
+    def test_core_redaction(self, text, expected):
+        assert CORE_SCANNER.redact(text) == expected
+
+    @pytest.mark.parametrize('scanner', SCANNERS)
+    @pytest.mark.parametrize('text', [
+        'Contact me at jane@example.org tomorrow.',
+        'My number is (555) 123-4567 and my SSN is 123-45-6789.',
+        'Card 4111-1111-1111-1111, email a.b@c.de',
+        'called Maria Lopez, then my name is Jane Smith.',
+        'Nothing to see here.',
+        '',
+    ])
+    def test_matches_sequential_passes_without_overlaps(self, scanner, text):
+        assert scanner.redact(text) == sequential_redact(scanner, text)
+
+    @pytest.mark.property
+    @pytest.mark.parametrize('scanner', SCANNERS)
+    @settings(max_examples=200, deadline=None)
+    @given(text=texts)
+    def test_nothing_redactable_survives(self, scanner, text):
+        redacted = scanner.redact(text)
+        assert scanner.redact(redacted) == redacted
+
+    @pytest.mark.property
+    @pytest.mark.parametrize('scanner', SCANNERS)
+    @settings(max_examples=200, deadline=None)
+    @given(text=texts)
+    def test_detection_matches_per_rule_search(self, scanner, text):
+        expected = [rule.pii_type for rule in scanner.rules if rule.regex.search(text)]
+        assert scanner.detect(text) == expected
+        assert scanner.scan(text)[1] == expected
+
+    @pytest.mark.property
+    @pytest.mark.parametrize('scanner', SCANNERS)
+    @settings(max_examples=100, deadline=None)
+    @given(text=texts)
+    def test_chunk_boundaries_do_not_change_output(self, scanner, text):
+        small_chunks = PIIScanner(scanner.rules, chunk_size=7)
+        assert small_chunks.scan(text * 3) == scanner.scan(text * 3)
+
+    def test_detect_only_rules_never_redact(self):
+        redacted, detected = CORE_SCANNER.scan('Maria Lopez wrote this')
+        assert redacted == 'Maria Lopez wrote this'
+        assert detected == ['possible_name']
+
+    def test_redact_types_limits_redaction(self):
+        redacted, detected = REPORTS_SCANNER.scan('a@b.co 123-45-6789', redact_types=['ssn'])
+        assert redacted == 'a@b.co [SSN_REDACTED]'
+        assert detected == ['email', 'ssn']
+
+    def test_process_report_text_flags_redaction(self):
+        assert process_report_text('my name is Jane Smith') == ('my name is [NAME_REDACTED]', True)
+        assert process_report_text('Nothing here') == ('Nothing here', False)
+
+
+class TestScanCost:
+    """Bounded rules and the CPU budget."""
+
+    def test_unbounded_rule_rejected(self):
+        with pytest.raises(ValueError):
+            PIIScanner([PIIRule('email', r'\S+@\S+', '[EMAIL]')])
+
+    def test_overlong_rule_rejected(self):
+        with pytest.raises(ValueError):
+            PIIScanner([PIIRule('blob', r'a{2000}', '[BLOB]')])
+
+    def test_compiled_pattern_flags_kept(self):
+        scanner = PIIScanner([PIIRule('word', re.compile(r'secret', re.IGNORECASE), '[X]')])
+        assert scanner.redact('SECRET') == '[X]'
+
+    def test_budget_exceeded_raises(self):
+        text = '1234 ' * 20000
+        with pytest.raises(PIIScanBudgetExceeded):
+            with pii_scan_budget(0):
+                REPORTS_SCANNER.scan(text)
+
+    def test_short_text_within_budget(self):
+        with pii_scan_budget(0):
+            # A single chunk finishes before the budget is checked
+            assert CORE_SCANNER.redact('ssn 123-45-6789') == 'ssn [SSN REDACTED]'
+
+    def test_nested_budget_keeps_earliest_deadline(self):
+        with pytest.raises(PIIScanBudgetExceeded):
+            with pii_scan_budget(0):
+                with pii_scan_budget(60):
+                    CORE_SCANNER.scan('x' * 10000)
+
+    def test_worst_case_scales_linearly(self):
+        import time
+
+        def cost(text):
+            start = time.perf_counter()
+            REPORTS_SCANNER.scan(text)
+            return time.perf_counter() - start
+
+        piece = '+1-555-123-45 a@b.c@d. '
+        small, large = cost(piece * 200), cost(piece * 2000)
+        # Ten times the text, with generous slack for timer noise
+        assert large < small * 30
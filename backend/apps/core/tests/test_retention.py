@@ -0,0 +1,169 @@
+"""
+Tests for audit log retention: per-action cutoffs, chunked purge, archives
+and (on PostgreSQL) monthly partitions.
+"""
+
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.core import retention
+from apps.core.models import AuditLog
+
+
+@pytest.fixture
+def retention_days(settings):
+    settings.AUDIT_RETENTION_DAYS = {'view': 10}
+    settings.AUDIT_RETENTION_DEFAULT_DAYS = 100
+
+
+def create_entry(action, age_days, **details):
+    return AuditLog.objects.create(
+        action=action, resource_type='Report', resource_id='1', details=details,
+        created_at=timezone.now() - timedelta(days=age_days),
+    )
+
+
+def read_archives(archive_dir):
+    """Archive file name -> list of archived rows."""
+    return {
+        path.name: [json.loads(line) for line in gzip.open(path, 'rt').read().splitlines()]
+        for path in sorted(archive_dir.iterdir())
+    }
+
+
+class TestCutoffs:
+    """Each action has its own retention period."""
+
+    def test_per_action_days_with_default(self, retention_days):
+        now = timezone.now()
+
+        cutoffs = retention.get_retention_cutoffs(now)
+
+        assert cutoffs['view'] == now - timedelta(days=10)
+        assert cutoffs['delete'] == now - timedelta(days=100)
+        assert set(cutoffs) == {action for action, _ in AuditLog.ACTION_CHOICES}
+
+
+@pytest.mark.django_db
+class TestPurgeExpired:
+    """Chunked archive-then-delete of one action."""
+
+    def test_removes_only_expired_rows_of_action(self):
+        expired = [create_entry('view', 20, i=i) for i in range(3)]
+        create_entry('view', 5)
+        create_entry('delete', 20)
+
+        removed = retention.purge_expired('view', timezone.now() - timedelta(days=10))
+
+        assert removed == 3
+        assert not AuditLog.objects.filter(pk__in=[entry.pk for entry in expired]).exists()
+        assert AuditLog.objects.count() == 2
+
+    def test_deletes_in_chunks(self):
+        for i in range(7):
+            create_entry('view', 20, i=i)
+
+        with CaptureQueriesContext(connection) as queries:
+            removed = retention.purge_expired('view', timezone.now(), chunk_size=3)
+
+        deletes = [query for query in queries if query['sql'].startswith('DELETE')]
+        assert removed == 7
+        assert len(deletes) == 3
+        assert AuditLog.objects.count() == 0
+
+    def test_dry_run_only_counts(self, tmp_path):
+        create_entry('view', 20)
+
+        assert retention.purge_expired('view', timezone.now(), archive_dir=tmp_path, dry_run=True) == 1
+        assert AuditLog.objects.count() == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_archives_rows_by_month_and_action(self, tmp_path):
+        now = timezone.now()
+        entries = [create_entry('view', 40, i=1), create_entry('view', 70, i=2)]
+
+        retention.purge_expired('view', now, archive_dir=tmp_path, chunk_size=1)
+
+        archives = read_archives(tmp_path)
+        expected_names = sorted(
+            f"audit_logs-{entry.created_at:%Y-%m}-view.jsonl.gz" for entry in entries
+        )
+        assert sorted(archives) == sorted(set(expected_names))
+        rows = [row for rows in archives.values() for row in rows]
+        assert sorted(row['id'] for row in rows) == sorted(entry.pk for entry in entries)
+        assert sorted(row['details']['i'] for row in rows) == [1, 2]
+        assert set(rows[0]) == set(retention.ARCHIVE_FIELDS)
+
+    def test_archive_appends_to_existing_file(self, tmp_path):
+        created_at = timezone.now().replace(day=15) - timedelta(days=60)
+        for i in range(2):
+            AuditLog.objects.create(
+                action='view', resource_type='Report', resource_id='1', details={'i': i},
+                created_at=created_at,
+            )
+            # One purge per row: each appends a gzip member to the same file
+            retention.purge_expired('view', timezone.now(), archive_dir=tmp_path)
+
+        (rows,) = read_archives(tmp_path).values()
+        assert [row['details']['i'] for row in rows] == [0, 1]
+
+
+@pytest.mark.django_db
+class TestAuditRetentionCommand:
+    """python manage.py audit_retention"""
+
+    def test_applies_each_action_cutoff(self, retention_days, tmp_path):
+        old_view = create_entry('view', 20)
+        recent_view = create_entry('view', 5)
+        recent_delete = create_entry('delete', 20)
+        old_delete = create_entry('delete', 200)
+
+        call_command('audit_retention', archive_dir=str(tmp_path))
+
+        remaining = set(AuditLog.objects.values_list('pk', flat=True))
+        assert remaining == {recent_view.pk, recent_delete.pk}
+        archived = {row['id'] for rows in read_archives(tmp_path).values() for row in rows}
+        assert archived == {old_view.pk, old_delete.pk}
+
+    def test_no_archive(self, retention_days, tmp_path, settings):
+        settings.AUDIT_ARCHIVE_DIR = str(tmp_path)
+        create_entry('view', 20)
+
+        call_command('audit_retention', no_archive=True)
+
+        assert AuditLog.objects.count() == 0
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='Partitioning requires PostgreSQL')
+@pytest.mark.django_db(transaction=True)
+class TestPartitions:
+    """Monthly partitions of audit_logs on PostgreSQL."""
+
+    def test_convert_then_drop_expired_months(self, tmp_path):
+        old = create_entry('view', 400, i=1)
+        recent = create_entry('view', 1, i=2)
+
+        retention.convert_to_partitioned(months_ahead=1)
+
+        assert retention.uses_partitions()
+        assert set(AuditLog.objects.values_list('pk', flat=True)) == {old.pk, recent.pk}
+        assert create_entry('view', 0).pk > recent.pk
+
+        dropped = retention.drop_expired_partitions(
+            timezone.now() - timedelta(days=200), archive_dir=tmp_path
+        )
+
+        assert retention.partition_name(retention._month_start(old.created_at)) in dropped
+        assert not AuditLog.objects.filter(pk=old.pk).exists()
+        assert AuditLog.objects.filter(pk=recent.pk).exists()
+        archived = [row for rows in read_archives(tmp_path).values() for row in rows]
+        assert [row['id'] for row in archived] == [old.pk]
+        assert archived[0]['details'] == {'i': 1}
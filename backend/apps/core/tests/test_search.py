@@ -0,0 +1,83 @@
+"""
+Tests for the in-memory search fallback used on databases other than PostgreSQL.
+"""
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.core.search import uses_postgres_search
+from apps.lessons.models import Lesson
+
+
+def create_lesson(title, description='Stay safe online', published=True):
+    return Lesson.objects.create(
+        title=title, description=description, category='security',
+        duration_minutes=5, difficulty='beginner', content={'sections': []}, published=published,
+    )
+
+
+def titles(response):
+    return [lesson['title'] for lesson in response.data['results']]
+
+
+@pytest.fixture(autouse=True)
+def fallback_search(settings):
+    if uses_postgres_search():
+        pytest.skip('PostgreSQL uses full-text search, not the fallback index')
+    settings.SEARCH_FALLBACK_MAX_RESULTS = 2
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFallbackSearch:
+    """GET /api/lessons/?search="""
+
+    def test_ranked_by_weight(self):
+        create_lesson('Passwords', description='Phishing emails ask for passwords')
+        create_lesson('Phishing basics')
+
+        response = APIClient().get('/api/lessons/?search=phishing')
+
+        assert titles(response) == ['Phishing basics', 'Passwords']
+        assert response.data['results'][1]['search_headline'].startswith('<b>Phishing</b>')
+
+    def test_hidden_rows_do_not_take_the_cap(self):
+        # Unpublished lessons rank highest but the public cannot see them
+        for number in range(3):
+            create_lesson(f'Phishing draft {number}', published=False)
+        create_lesson('Passwords', description='Spotting phishing')
+        create_lesson('Messaging', description='Phishing in chats')
+
+        response = APIClient().get('/api/lessons/?search=phishing')
+
+        assert sorted(titles(response)) == ['Messaging', 'Passwords']
+
+    def test_cap_applied_to_visible_rows(self):
+        for number in range(3):
+            create_lesson(f'Phishing draft {number}', published=False)
+        create_lesson('Passwords', description='Spotting phishing')
+        admin = AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        response = client.get('/api/lessons/?search=phishing')
+
+        assert titles(response) == ['Phishing draft 0', 'Phishing draft 1']
+
+    def test_published_row_found(self):
+        draft = create_lesson('Phishing basics', published=False)
+        client = APIClient()
+        assert titles(client.get('/api/lessons/?search=phishing')) == []
+
+        draft.published = True
+        draft.save()
+
+        assert titles(client.get('/api/lessons/?search=phishing')) == ['Phishing basics']
+
+    def test_no_match(self):
+        create_lesson('Passwords')
+
+        response = APIClient().get('/api/lessons/?search=phishing')
+
+        assert response.status_code == 200
+        assert titles(response) == []
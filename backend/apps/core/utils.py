@@ -4,33 +4,104 @@ Provides encryption, validation, and helper functions.
 """
 
 import os
-from cryptography.fernet import Fernet
+import re
+import threading
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 import base64
 import logging
 
+from .codes import generate_code
+from .pii import PIIRule, PIIScanner
+
 logger = logging.getLogger(__name__)
 
 
-def get_encryption_key():
+_cipher = None
+_cipher_lock = threading.Lock()
+
+
+def _load_key(key, name):
     """
-    Get the encryption key from settings.
-    Ensures the key is properly formatted for Fernet.
+    Build a Fernet instance from a configured key.
+    Returns None if the key is not a valid Fernet key.
+    """
+    try:
+        return Fernet(key.encode() if isinstance(key, str) else key)
+    except Exception:
+        logger.warning(f"Invalid encryption key format in {name}")
+        return None
+
+
+def _build_cipher():
+    """
+    Build the MultiFernet used for all field encryption.
+    The primary ENCRYPTION_KEY encrypts; ENCRYPTION_PREVIOUS_KEYS only decrypt.
+    
+    Raises:
+        ImproperlyConfigured: If ENCRYPTION_KEY is not a valid Fernet key and
+            DEBUG is off. Development falls back to a process-local key, so
+            anything encrypted there is unreadable after a restart.
     """
     key = settings.ENCRYPTION_KEY
     
-    # If key is not already base64 encoded, encode it
     if not key:
         raise ValueError("ENCRYPTION_KEY not set in settings")
     
-    try:
-        # Try to use it as-is first
-        Fernet(key.encode() if isinstance(key, str) else key)
-        return key.encode() if isinstance(key, str) else key
-    except Exception:
-        # If that fails, generate a proper key
+    primary = _load_key(key, 'ENCRYPTION_KEY')
+    if primary is None:
+        if not settings.DEBUG:
+            raise ImproperlyConfigured(
+                "ENCRYPTION_KEY is not a valid Fernet key "
+                "(generate one with cryptography.fernet.Fernet.generate_key())"
+            )
+        # Fall back to a process-local key so development keeps working
         logger.warning("Invalid encryption key format, generating new key")
-        return Fernet.generate_key()
+        primary = Fernet(Fernet.generate_key())
+    
+    fernets = [primary]
+    for index, old_key in enumerate(getattr(settings, 'ENCRYPTION_PREVIOUS_KEYS', [])):
+        fernet = _load_key(old_key, f'ENCRYPTION_PREVIOUS_KEYS[{index}]')
+        if fernet is not None:
+            fernets.append(fernet)
+    
+    return MultiFernet(fernets)
+
+
+def get_cipher():
+    """
+    Get the process-wide cipher, validating the configured keys on first use.
+    
+    Returns:
+        MultiFernet: Encrypts with the primary key, decrypts with any configured key
+    """
+    global _cipher
+    cipher = _cipher
+    if cipher is None:
+        with _cipher_lock:
+            if _cipher is None:
+                _cipher = _build_cipher()
+            cipher = _cipher
+    return cipher
+
+
+def reset_cipher():
+    """
+    Drop the cached cipher so the next call rebuilds it from settings.
+    """
+    global _cipher
+    with _cipher_lock:
+        _cipher = None
+
+
+@receiver(setting_changed)
+def _reset_cipher_on_setting_change(setting, **kwargs):
+    """Rebuild the cipher when encryption settings are overridden (e.g. in tests)."""
+    if setting in ('ENCRYPTION_KEY', 'ENCRYPTION_PREVIOUS_KEYS'):
+        reset_cipher()
 
 
 def encrypt_field(value):
@@ -47,15 +118,12 @@ def encrypt_field(value):
         return value
     
     try:
-        key = get_encryption_key()
-        f = Fernet(key)
-        
         # Convert to bytes if string
         if isinstance(value, str):
             value = value.encode('utf-8')
         
         # Encrypt and return as string
-        encrypted = f.encrypt(value)
+        encrypted = get_cipher().encrypt(value)
         return encrypted.decode('utf-8')
     except Exception as e:
         logger.error(f"Encryption error: {e}")
@@ -65,6 +133,7 @@ def encrypt_field(value):
 def decrypt_field(encrypted_value):
     """
     Decrypt a field value using Fernet symmetric encryption.
+    Accepts values encrypted under the primary or any previous key.
     
     Args:
         encrypted_value (str): The encrypted value
@@ -76,90 +145,158 @@ def decrypt_field(encrypted_value):
         return encrypted_value
     
     try:
-        key = get_encryption_key()
-        f = Fernet(key)
-        
         # Convert to bytes if string
         if isinstance(encrypted_value, str):
             encrypted_value = encrypted_value.encode('utf-8')
         
         # Decrypt and return as string
-        decrypted = f.decrypt(encrypted_value)
+        decrypted = get_cipher().decrypt(encrypted_value)
         return decrypted.decode('utf-8')
     except Exception as e:
         logger.error(f"Decryption error: {e}")
         raise
 
 
-def generate_confirmation_code(prefix="SH"):
+def rotate_field(encrypted_value):
     """
-    Generate a unique, non-identifying confirmation code.
+    Re-encrypt a field value under the primary key.
     
     Args:
-        prefix (str): Prefix for the code (default: "SH")
+        encrypted_value (str): Value encrypted under any configured key
         
     Returns:
-        str: A confirmation code like "SH-2025-A7B9C2"
+        str: The value encrypted under the primary key
     """
-    import uuid
-    from django.utils import timezone
+    if not encrypted_value:
+        return encrypted_value
     
-    year = timezone.now().year
-    random_part = uuid.uuid4().hex[:6].upper()
+    if isinstance(encrypted_value, str):
+        encrypted_value = encrypted_value.encode('utf-8')
     
-    return f"{prefix}-{year}-{random_part}"
+    return get_cipher().rotate(encrypted_value).decode('utf-8')
 
 
-def detect_pii(text):
+def encrypt_fields(values):
     """
-    Detect potential PII (Personally Identifiable Information) in text.
+    Encrypt many field values with a single cipher instance.
+
+    Args:
+        values (iterable): Values to encrypt
+
+    Returns:
+        list: Encrypted values in input order; empty values are returned as-is
+    """
+    cipher = get_cipher()
+    return [
+        cipher.encrypt(value.encode('utf-8')).decode('utf-8') if value else value
+        for value in values
+    ]
+
+
+def decrypt_fields(encrypted_values, executor=None, slice_size=256):
+    """
+    Decrypt many field values with a single cipher instance.
     
     Args:
-        text (str): Text to check for PII
+        encrypted_values (iterable): Encrypted values
+        executor (Executor): Optional thread pool to spread slices across
+            (cryptography releases the GIL while decrypting)
+        slice_size (int): Values per task when an executor is used
         
     Returns:
-        list: List of detected PII types (e.g., ['email', 'phone'])
+        list: Decrypted values in input order; None where decryption failed
     """
-    import re
-    
-    if not text:
-        return []
+    values = list(encrypted_values)
+    cipher = get_cipher()
     
-    detected = []
+    def decrypt_slice(chunk):
+        results = []
+        for value in chunk:
+            if not value:
+                results.append(value)
+                continue
+            try:
+                token = value.encode('utf-8') if isinstance(value, str) else value
+                results.append(cipher.decrypt(token).decode('utf-8'))
+            except (InvalidToken, UnicodeDecodeError):
+                results.append(None)
+        return results
     
-    # Email detection
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    if re.search(email_pattern, text):
-        detected.append('email')
+    if executor is None or len(values) <= slice_size:
+        results = decrypt_slice(values)
+    else:
+        slices = [values[i:i + slice_size] for i in range(0, len(values), slice_size)]
+        results = [value for chunk in executor.map(decrypt_slice, slices) for value in chunk]
     
-    # Phone number detection (various formats)
-    phone_patterns = [
-        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # 123-456-7890 or 1234567890
-        r'\b\(\d{3}\)\s*\d{3}[-.]?\d{4}\b',  # (123) 456-7890
-        r'\b\+\d{1,3}[-.]?\d{1,14}\b',  # International format
-    ]
-    for pattern in phone_patterns:
-        if re.search(pattern, text):
-            detected.append('phone')
-            break
+    failed = sum(1 for value, result in zip(values, results) if value and result is None)
+    if failed:
+        logger.error(f"Decryption error: {failed} of {len(values)} values could not be decrypted")
     
-    # Name detection (simple heuristic: capitalized words that might be names)
-    # This is a basic check and may have false positives
-    name_pattern = r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'
-    if re.search(name_pattern, text):
-        detected.append('possible_name')
+    return results
+
+
+def generate_confirmation_code(prefix="SH"):
+    """
+    Generate a non-identifying confirmation code (see apps.core.codes).
     
-    # Address detection (street numbers)
-    address_pattern = r'\b\d+\s+[A-Z][a-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b'
-    if re.search(address_pattern, text, re.IGNORECASE):
-        detected.append('address')
+    Args:
+        prefix (str): Prefix for the code (default: "SH")
+        
+    Returns:
+        str: A confirmation code like "SH-2026-04JDWN3RT1G"
+    """
+    return generate_code(prefix)
+
+
+# PII rules for free-text fields (donation messages, etc.)
+# Quantifiers are bounded (see apps.core.pii) so scanning stays linear-time
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]{1,64}@(?:[A-Za-z0-9-]{1,63}\.){1,8}[A-Za-z]{2,24}\b'
+PHONE_PATTERN = (
+    r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'  # 123-456-7890 or 1234567890
+    r'|\b\(\d{3}\)\s{0,3}\d{3}[-.]?\d{4}\b'  # (123) 456-7890
+    r'|\b\+\d{1,3}[-.]?\d{1,14}\b'  # International format
+)
+SSN_PATTERN = r'\b\d{3}-\d{2}-\d{4}\b'
+ADDRESS_PATTERN = (
+    r'\b\d{1,10}\s{1,3}[A-Z][a-z]{1,40}\s{1,3}'
+    r'(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b'
+)
+# Simple heuristic for names: capitalized word pairs (detected, never redacted)
+NAME_PATTERN = r'\b[A-Z][a-z]{1,40} [A-Z][a-z]{1,40}\b'
+
+PII_SCANNER = PIIScanner([
+    PIIRule('email', EMAIL_PATTERN, '[EMAIL REDACTED]'),
+    PIIRule('phone', PHONE_PATTERN, '[PHONE REDACTED]'),
+    PIIRule('possible_name', NAME_PATTERN),
+    PIIRule('address', ADDRESS_PATTERN, '[ADDRESS REDACTED]', re.IGNORECASE),
+    PIIRule('ssn', SSN_PATTERN, '[SSN REDACTED]'),
+])
+
+
+def scan_pii(text):
+    """
+    Detect and redact PII in one scan.
     
-    # Social security number (US format)
-    ssn_pattern = r'\b\d{3}-\d{2}-\d{4}\b'
-    if re.search(ssn_pattern, text):
-        detected.append('ssn')
+    Args:
+        text (str): Text to scan
+        
+    Returns:
+        tuple: (redacted_text, detected_pii)
+    """
+    return PII_SCANNER.scan(text)
+
+
+def detect_pii(text):
+    """
+    Detect potential PII (Personally Identifiable Information) in text.
     
-    return detected
+    Args:
+        text (str): Text to check for PII
+        
+    Returns:
+        list: List of detected PII types (e.g., ['email', 'phone'])
+    """
+    return PII_SCANNER.detect(text)
 
 
 def redact_pii(text, detected_pii=None):
@@ -168,45 +305,9 @@ def redact_pii(text, detected_pii=None):
     
     Args:
         text (str): Text to redact PII from
-        detected_pii (list): Optional list of already detected PII types
+        detected_pii (list): Optional list of PII types to redact (default: all)
         
     Returns:
         str: Text with PII redacted
     """
-    import re
-    
-    if not text:
-        return text
-    
-    # If PII types not provided, detect them first
-    if detected_pii is None:
-        detected_pii = detect_pii(text)
-    
-    redacted_text = text
-    
-    # Redact emails
-    if 'email' in detected_pii:
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        redacted_text = re.sub(email_pattern, '[EMAIL REDACTED]', redacted_text)
-    
-    # Redact phone numbers
-    if 'phone' in detected_pii:
-        phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-            r'\b\(\d{3}\)\s*\d{3}[-.]?\d{4}\b',
-            r'\b\+\d{1,3}[-.]?\d{1,14}\b',
-        ]
-        for pattern in phone_patterns:
-            redacted_text = re.sub(pattern, '[PHONE REDACTED]', redacted_text)
-    
-    # Redact SSN
-    if 'ssn' in detected_pii:
-        ssn_pattern = r'\b\d{3}-\d{2}-\d{4}\b'
-        redacted_text = re.sub(ssn_pattern, '[SSN REDACTED]', redacted_text)
-    
-    # Redact addresses
-    if 'address' in detected_pii:
-        address_pattern = r'\b\d+\s+[A-Z][a-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b'
-        redacted_text = re.sub(address_pattern, '[ADDRESS REDACTED]', redacted_text, flags=re.IGNORECASE)
-    
-    return redacted_text
+    return PII_SCANNER.redact(text, detected_pii)
@@ -2,12 +2,18 @@
 Core views for ShieldHer platform.
 """
 
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.db import connection
+from django.http import HttpResponse
 from django.utils import timezone
+from .metrics import registry
+from .payloads import get_meta_payload
+from .permissions import IsAdminUser
+from .querybudget import query_budget
 
 
+@query_budget(1)
 @api_view(['GET'])
 def health_check(request):
     """
@@ -27,3 +33,33 @@ def health_check(request):
         'database': db_status,
         'version': '1.0.0'
     })
+
+
+@query_budget(1)
+@api_view(['GET'])
+def meta(request):
+    """
+    Bootstrap payload with every enum and quick resource the frontend needs.
+    GET /api/meta/
+    
+    Precomputed once per process and served with a strong ETag and
+    long-lived Cache-Control.
+    """
+    return get_meta_payload().as_response(request)
+
+
+@query_budget(1)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """
+    Request metrics of this worker process in Prometheus text format (admin only).
+    GET /api/metrics/
+    
+    Latency, query count/time, serializer time and response size per view.
+    No IPs, paths or identifiers are recorded.
+    """
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
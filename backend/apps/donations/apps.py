@@ -5,3 +5,6 @@ class DonationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.donations'
     verbose_name = 'Donations'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,200 @@
+"""
+Streaming export of donations for finance reconciliation (admin only).
+Rows are read with .values().iterator(), without building model instances,
+and written out chunk by chunk as CSV, Parquet or Arrow IPC, so memory use
+does not grow with the number of donations exported.
+
+Parquet and Arrow need pyarrow; CSV works without it.
+"""
+
+import csv
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+
+from .serializers import mask_donor_email
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # Optional: only the columnar formats need it
+    pyarrow = None
+
+# Columns read from the database
+QUERY_FIELDS = [
+    'id',
+    'confirmation_code',
+    'amount',
+    'currency',
+    'status',
+    'payment_intent_id',
+    'failure_reason',
+    'is_anonymous',
+    'donor_email',
+    'created_at',
+    'updated_at',
+]
+
+# Columns written to the export; the donor email is only exported masked
+EXPORT_FIELDS = [
+    'id',
+    'confirmation_code',
+    'amount',
+    'currency',
+    'status',
+    'payment_intent_id',
+    'failure_reason',
+    'is_anonymous',
+    'donor_email_masked',
+    'created_at',
+    'updated_at',
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+
+def available_formats():
+    """Export formats usable with the installed libraries."""
+    if pyarrow is None:
+        return [name for name in EXPORT_FORMATS if name not in COLUMNAR_FORMATS]
+    return list(EXPORT_FORMATS)
+
+
+class _Echo:
+    """File-like object that returns what is written, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+class _ChunkSink:
+    """
+    Write-only file collecting bytes until drained, so pyarrow writers can
+    stream their output. Tracks the position pyarrow asks for with tell().
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self):
+        return True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_donation_chunks(queryset, chunk_size=None):
+    """
+    Yield lists of export rows (dicts), chunk_size rows at a time.
+
+    Args:
+        queryset: Donation queryset (filters and ordering already applied)
+        chunk_size: Rows fetched per database round trip and written per chunk
+    """
+    chunk_size = chunk_size or settings.DONATION_EXPORT_CHUNK_SIZE
+    chunk = []
+    for row in queryset.values(*QUERY_FIELDS).iterator(chunk_size=chunk_size):
+        row['donor_email_masked'] = mask_donor_email(row.pop('donor_email'), row['is_anonymous'])
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(chunks):
+    """Yield CSV text, header first, one string per chunk."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for chunk in chunks:
+        yield ''.join(
+            writer.writerow([
+                row[field].isoformat() if field in ('created_at', 'updated_at') else row[field]
+                for field in EXPORT_FIELDS
+            ])
+            for row in chunk
+        )
+
+
+def arrow_schema():
+    """Column types of the columnar exports."""
+    timestamp = pyarrow.timestamp('us', tz='UTC')
+    return pyarrow.schema([
+        ('id', pyarrow.int64()),
+        ('confirmation_code', pyarrow.string()),
+        ('amount', pyarrow.decimal128(10, 2)),
+        ('currency', pyarrow.string()),
+        ('status', pyarrow.string()),
+        ('payment_intent_id', pyarrow.string()),
+        ('failure_reason', pyarrow.string()),
+        ('is_anonymous', pyarrow.bool_()),
+        ('donor_email_masked', pyarrow.string()),
+        ('created_at', timestamp),
+        ('updated_at', timestamp),
+    ])
+
+
+def _record_batch(chunk, schema):
+    columns = {field: [row[field] for row in chunk] for field in EXPORT_FIELDS}
+    for field in ('created_at', 'updated_at'):
+        columns[field] = [value.astimezone(dt_timezone.utc) for value in columns[field]]
+    return pyarrow.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def stream_columnar(chunks, export_format):
+    """
+    Yield a Parquet file (one row group per chunk) or an Arrow IPC stream
+    (one record batch per chunk) as bytes, a chunk at a time.
+    """
+    schema = arrow_schema()
+    sink = _ChunkSink()
+    if export_format == 'parquet':
+        writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='snappy')
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+
+    try:
+        for chunk in chunks:
+            writer.write_batch(_record_batch(chunk, schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(queryset, export_format):
+    """
+    Stream donations in the given format ('csv', 'parquet' or 'arrow').
+    """
+    chunks = iter_donation_chunks(queryset)
+    if export_format in COLUMNAR_FORMATS:
+        return stream_columnar(chunks, export_format)
+    return stream_csv(chunks)
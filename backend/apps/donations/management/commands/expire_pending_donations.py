@@ -0,0 +1,71 @@
+"""
+Management command to settle donations stuck in pending: charges whose
+outcome the gateway could not report, and donations whose background
+settlement never ran (for example when a worker process was killed mid-flight).
+Usage: python manage.py expire_pending_donations [--older-than 30] [--dry-run]
+
+Each donation is looked up at the gateway first, so a charge that went
+through is recorded as completed; only donations the gateway never charged
+are failed. Donations the gateway cannot be asked about stay pending.
+Donations stuck in processing (settlement killed mid-charge) are included.
+
+The gateway is asked outside any transaction; the result is then recorded
+under a row lock, and only if the donation is unchanged since it was read,
+so a settlement committing meanwhile is never overwritten.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.donations.models import Donation
+from apps.donations.settlement import apply_payment_result, check_payment
+
+
+class Command(BaseCommand):
+    help = "Reconcile donations stuck in pending or processing with the payment gateway."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=30,
+                            help='Minutes a donation may stay pending or processing (default: 30)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many are stale')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        stale = Donation.objects.filter(status__in=['pending', 'processing'], updated_at__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"{stale.count()} pending donations would be reconciled")
+            return
+
+        outcomes = {'completed': 0, 'failed': 0, 'refunded': 0, None: 0}
+        skipped = 0
+        for snapshot in stale.only('id', 'status', 'updated_at', 'payment_intent_id', 'confirmation_code'):
+            payment_result = check_payment(snapshot)
+
+            # Saved one by one so the rollup signals move each donation's contribution
+            with transaction.atomic():
+                donation = Donation.objects.select_for_update(skip_locked=True).filter(
+                    pk=snapshot.pk, status=snapshot.status, updated_at=snapshot.updated_at
+                ).first()
+                if donation is None:
+                    # Settled (or locked by a settlement) since it was read
+                    skipped += 1
+                    continue
+                outcome = apply_payment_result(
+                    donation, payment_result, failure_reason='Payment was not settled in time'
+                )
+            outcomes[outcome] += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Completed {outcomes['completed']}, failed {outcomes['failed']}, "
+            f"refunded {outcomes['refunded']} pending donations"
+        ))
+        if skipped:
+            self.stdout.write(f"Skipped {skipped} donations settled while reconciling")
+        if outcomes[None]:
+            self.stdout.write(self.style.WARNING(
+                f"{outcomes[None]} donations left pending: the gateway could not report their payment"
+            ))
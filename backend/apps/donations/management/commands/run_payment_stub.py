@@ -0,0 +1,44 @@
+"""
+Management command to run the local stub payment gateway.
+Usage: python manage.py run_payment_stub [--port 8765] [--latency-ms 100] [--failure-rate 0.05]
+
+Point the API at it with PAYMENT_GATEWAY=http PAYMENT_GATEWAY_URL=http://127.0.0.1:8765
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.donations.stub_gateway import StubGatewayServer
+
+
+class Command(BaseCommand):
+    help = "Run an in-memory payment gateway for local testing and load tests."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+        parser.add_argument('--latency-ms', type=float, default=100,
+                            help='Simulated processing time per charge/refund (default: 100)')
+        parser.add_argument('--failure-rate', type=float, default=0.05,
+                            help='Fraction of charges declined (default: 0.05)')
+        parser.add_argument('--api-key', default='', help='Require this bearer token')
+        parser.add_argument('--quiet', action='store_true', help='Do not log requests')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['failure_rate'] <= 1:
+            raise CommandError("--failure-rate must be between 0 and 1")
+
+        server = StubGatewayServer(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency_ms'] / 1000,
+            failure_rate=options['failure_rate'],
+            api_key=options['api_key'],
+            verbose=not options['quiet']
+        )
+        self.stdout.write(self.style.SUCCESS(f"Stub payment gateway listening on {server.url}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DonationDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="Timestamp when record was created"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when record was last updated",
+                    ),
+                ),
+                ("date", models.DateField(help_text="Day the donations were created")),
+                ("currency", models.CharField(help_text="Currency code", max_length=3)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                            ("refunded", "Refunded"),
+                        ],
+                        help_text="Donation status",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "donation_count",
+                    models.IntegerField(default=0, help_text="Number of donations"),
+                ),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Sum of donation amounts",
+                        max_digits=16,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Donation Daily Rollup",
+                "verbose_name_plural": "Donation Daily Rollups",
+                "db_table": "donation_daily_rollups",
+                "ordering": ["-date", "currency", "status"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="donationdailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("date", "currency", "status"),
+                name="unique_donation_rollup_day_currency_status",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donations", "0002_donationdailyrollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="donation",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="donations_created_617964_idx"
+            ),
+        ),
+    ]
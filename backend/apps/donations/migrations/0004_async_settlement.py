@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donations", "0003_created_at_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="donation",
+            name="failure_reason",
+            field=models.CharField(
+                blank=True,
+                help_text="Processor error for failed payments",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="donation",
+            name="idempotency_key",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Client Idempotency-Key of the creating request",
+                max_length=255,
+                null=True,
+                unique=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="donation",
+            name="payment_intent_id",
+            field=models.CharField(
+                blank=True,
+                help_text="Payment processor reference (set once the payment is settled)",
+                max_length=255,
+                null=True,
+                unique=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0004_async_settlement'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='donation',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed'), ('refunded', 'Refunded')], default='pending', help_text='Donation status', max_length=20),
+        ),
+        migrations.RemoveIndex(
+            model_name='donation',
+            name='donations_payment_43c750_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='donation',
+            name='donations_confirm_53974b_idx',
+        ),
+        migrations.AlterField(
+            model_name='donation',
+            name='confirmation_code',
+            field=models.CharField(help_text='Non-identifying confirmation code', max_length=20, unique=True),
+        ),
+    ]
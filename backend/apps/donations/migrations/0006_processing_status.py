@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donations", "0005_drop_redundant_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="donation",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                    ("refunded", "Refunded"),
+                ],
+                default="pending",
+                help_text="Donation status",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="donationdailyrollup",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                    ("refunded", "Refunded"),
+                ],
+                help_text="Donation status",
+                max_length=20,
+            ),
+        ),
+    ]
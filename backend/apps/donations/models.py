@@ -4,8 +4,10 @@ PRIVACY-FIRST: Minimal donor information, optional anonymity.
 """
 
 from django.db import models
+from apps.core.codes import save_with_unique_code
 from apps.core.models import TimeStampedModel
-from apps.core.utils import generate_confirmation_code, detect_pii
+from apps.core.pii import PIIScanBudgetExceeded
+from apps.core.utils import detect_pii
 
 
 class Donation(TimeStampedModel):
@@ -24,13 +26,17 @@ class Donation(TimeStampedModel):
         currency: Currency code (USD, EUR, etc.)
         donor_email: Optional email for receipt (blank if anonymous)
         is_anonymous: Whether donation is anonymous
-        status: Donation status (pending, completed, failed, refunded)
-        payment_intent_id: Payment processor reference (unique)
+        status: Donation status (pending, processing, completed, failed, refunded);
+            processing while a settlement has the charge in flight
+        payment_intent_id: Payment processor reference (unique, empty while pending)
+        idempotency_key: Client Idempotency-Key, so retried requests reuse the donation
+        failure_reason: Processor error for failed payments
         message: Optional message from donor
         confirmation_code: Non-identifying code for donor reference
     """
     STATUS_CHOICES = [
         ('pending', 'Pending'),
+        ('processing', 'Processing'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
         ('refunded', 'Refunded'),
@@ -58,13 +64,27 @@ class Donation(TimeStampedModel):
         max_length=20,
         choices=STATUS_CHOICES,
         default='pending',
-        db_index=True,
         help_text="Donation status"
     )
     payment_intent_id = models.CharField(
         max_length=255,
         unique=True,
-        help_text="Payment processor reference"
+        null=True,
+        blank=True,
+        help_text="Payment processor reference (set once the payment is settled)"
+    )
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Client Idempotency-Key of the creating request"
+    )
+    failure_reason = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Processor error for failed payments"
     )
     message = models.TextField(
         blank=True,
@@ -73,7 +93,6 @@ class Donation(TimeStampedModel):
     confirmation_code = models.CharField(
         max_length=20,
         unique=True,
-        db_index=True,
         help_text="Non-identifying confirmation code"
     )
     
@@ -83,30 +102,106 @@ class Donation(TimeStampedModel):
         db_table = "donations"
         ordering = ['-created_at']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['status', '-created_at']),
-            models.Index(fields=['confirmation_code']),
-            models.Index(fields=['payment_intent_id']),
         ]
     
     def save(self, *args, **kwargs):
         """
-        Override save to generate confirmation code and check for PII in message.
+        Override save to generate a unique confirmation code and check for PII in message.
+        The message is scanned when the donation is created or saved with
+        update_fields including it, not on every status update.
         """
-        if not self.confirmation_code:
-            self.confirmation_code = generate_confirmation_code(prefix="DON")
+        update_fields = kwargs.get('update_fields') or ()
+        scan_message = self._state.adding or 'message' in update_fields
+        save_with_unique_code(self, "DON", lambda: super(Donation, self).save(*args, **kwargs))
         
         # Detect PII in message if present
-        if self.message:
-            pii_detected = detect_pii(self.message)
+        if self.message and scan_message:
+            import logging
+            logger = logging.getLogger(__name__)
+            try:
+                pii_detected = detect_pii(self.message)
+            except PIIScanBudgetExceeded:
+                # Detection only logs, so flag the message for review instead
+                pii_detected = ['unscanned']
             if pii_detected:
                 # Log warning but don't block - admin can review
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.warning(
                     f"PII detected in donation message for {self.confirmation_code}: {pii_detected}"
                 )
-        
-        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"Donation {self.confirmation_code} - {self.amount} {self.currency}"
+
+
+class DonationDailyRollup(TimeStampedModel):
+    """
+    Pre-aggregated daily donation counts and sums per currency and status.
+    Maintained incrementally from Donation saves and deletes (see signals.py);
+    rebuild with `python manage.py backfill_rollups`.
+    
+    Fields:
+        date: Day the donations were created (current timezone)
+        currency: Currency code
+        status: Donation status
+        donation_count: Number of donations
+        total_amount: Sum of donation amounts
+    """
+    date = models.DateField(
+        help_text="Day the donations were created"
+    )
+    currency = models.CharField(
+        max_length=3,
+        help_text="Currency code"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Donation.STATUS_CHOICES,
+        help_text="Donation status"
+    )
+    donation_count = models.IntegerField(
+        default=0,
+        help_text="Number of donations"
+    )
+    total_amount = models.DecimalField(
+        max_digits=16,
+        decimal_places=2,
+        default=0,
+        help_text="Sum of donation amounts"
+    )
+    
+    class Meta:
+        verbose_name = "Donation Daily Rollup"
+        verbose_name_plural = "Donation Daily Rollups"
+        db_table = "donation_daily_rollups"
+        ordering = ['-date', 'currency', 'status']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'currency', 'status'],
+                name='unique_donation_rollup_day_currency_status'
+            ),
+        ]
+    
+    @staticmethod
+    def contribution(donation):
+        """
+        Get the rollup row keys and counter deltas a single donation contributes.
+        
+        Returns:
+            tuple: (keys, deltas)
+        """
+        from apps.core.rollups import rollup_date
+        keys = {
+            'date': rollup_date(donation.created_at),
+            'currency': donation.currency,
+            'status': donation.status,
+        }
+        deltas = {
+            'donation_count': 1,
+            'total_amount': donation.amount,
+        }
+        return keys, deltas
+    
+    def __str__(self):
+        return f"{self.date} {self.currency} {self.status}: {self.donation_count}"
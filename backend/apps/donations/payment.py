@@ -1,24 +1,140 @@
 """
-Mock payment processing utility.
-Simulates payment gateway for development and testing.
-In production, this would integrate with Stripe, PayPal, etc.
+Payment gateway adapters.
+
+Every gateway implements the PaymentGateway interface and returns plain
+result dicts, so donation code never depends on a particular processor:
+
+- MockPaymentProcessor: in-process simulation for development
+- HTTPPaymentGateway: JSON/HTTP gateway client with a pooled keep-alive
+  session, timeouts and bounded retries (see stub_gateway.py for a local
+  server speaking the same protocol)
+
+The active gateway is selected with the PAYMENT_GATEWAY setting.
+
+A charge result with status PAYMENT_UNKNOWN means the gateway could not say
+whether the charge was taken (timeout, connection error, 5xx): the donation
+must stay pending and be reconciled with find_payment()/get_payment_status(),
+never recorded as failed.
 """
 
+import threading
 import time
 import random
+import uuid
 from decimal import Decimal
 
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Result status of a charge whose outcome the gateway could not report
+PAYMENT_UNKNOWN = 'unknown'
+
+
+def is_outcome_unknown(result):
+    """True if a gateway result does not tell whether the charge was taken."""
+    return result.get('status') == PAYMENT_UNKNOWN
+
 
-class MockPaymentProcessor:
+class PaymentGateway:
+    """
+    Interface for payment gateway adapters.
+    
+    All methods return a dict with a 'success' flag; failures carry an
+    'error' message instead of raising, and status PAYMENT_UNKNOWN when the
+    gateway could not be asked or did not answer.
+    """
+    
+    def process_payment(self, amount, currency='USD', payment_method=None, idempotency_key=None):
+        """
+        Charge a payment.
+        
+        Args:
+            amount (Decimal): Payment amount
+            currency (str): Currency code (default: USD)
+            payment_method (dict): Payment method details
+            idempotency_key (str): Key making retried charges safe
+        
+        Returns:
+            dict: success, payment_intent_id, status ('completed', 'failed'
+            or PAYMENT_UNKNOWN) and error on failure
+        """
+        raise NotImplementedError
+    
+    def refund_payment(self, payment_intent_id, amount=None):
+        """
+        Refund a payment.
+        
+        Args:
+            payment_intent_id (str): Original payment intent ID
+            amount (Decimal, optional): Refund amount (None for full refund)
+        
+        Returns:
+            dict: success, refund_id, status and error on failure
+        """
+        raise NotImplementedError
+    
+    def get_payment_status(self, payment_intent_id):
+        """
+        Get the processor's status of a payment.
+        
+        Args:
+            payment_intent_id (str): Payment intent ID
+        
+        Returns:
+            dict: success, payment_intent_id, status and error on failure
+        """
+        raise NotImplementedError
+    
+    def find_payment(self, idempotency_key):
+        """
+        Find the charge made with an idempotency key, e.g. after a charge
+        whose outcome was unknown.
+        
+        Args:
+            idempotency_key (str): Idempotency key the charge was sent with
+        
+        Returns:
+            dict: success, payment_intent_id and status; success False
+            without status PAYMENT_UNKNOWN means no charge was made
+        """
+        raise NotImplementedError
+
+
+def validate_amount(amount):
+    """
+    Check a payment amount against the processor limits.
+    
+    Returns:
+        str: Error message, or None if the amount is valid
+    """
+    if not isinstance(amount, (Decimal, float, int)):
+        return 'Invalid amount type'
+    
+    amount = Decimal(str(amount))
+    if amount <= 0:
+        return 'Amount must be greater than zero'
+    if amount > 100000:
+        return 'Amount exceeds maximum limit'
+    return None
+
+
+class MockPaymentProcessor(PaymentGateway):
     """
     Mock payment processor that simulates payment gateway behavior.
     
-    This is a simple mock for development. In production, replace with:
-    - Stripe API integration
-    - PayPal API integration
-    - Or other payment gateway
+    This is a simple mock for development. In production, use
+    HTTPPaymentGateway against the real processor's API.
     """
     
+    def __init__(self):
+        self._charges = {}
+        self._lock = threading.Lock()
+    
     @staticmethod
     def generate_payment_intent_id():
         """
@@ -29,8 +145,7 @@ class MockPaymentProcessor:
         random_suffix = random.randint(1000, 9999)
         return f"pi_mock_{timestamp}_{random_suffix}"
     
-    @staticmethod
-    def process_payment(amount, currency='USD', payment_method=None):
+    def process_payment(self, amount, currency='USD', payment_method=None, idempotency_key=None):
         """
         Process a mock payment.
         
@@ -38,31 +153,28 @@ class MockPaymentProcessor:
             amount (Decimal): Payment amount
             currency (str): Currency code (default: USD)
             payment_method (dict): Payment method details (not used in mock)
+            idempotency_key (str): Repeated keys return the first result
         
         Returns:
             dict: Payment result with success status and payment_intent_id
         """
-        # Validate amount
-        if not isinstance(amount, (Decimal, float, int)):
-            return {
-                'success': False,
-                'error': 'Invalid amount type',
-                'payment_intent_id': None
-            }
-        
-        amount = Decimal(str(amount))
+        if idempotency_key:
+            with self._lock:
+                if idempotency_key in self._charges:
+                    return dict(self._charges[idempotency_key])
         
-        if amount <= 0:
-            return {
-                'success': False,
-                'error': 'Amount must be greater than zero',
-                'payment_intent_id': None
-            }
-        
-        if amount > 100000:
+        result = self._charge(amount, currency)
+        if idempotency_key and result['payment_intent_id']:
+            with self._lock:
+                result = dict(self._charges.setdefault(idempotency_key, result))
+        return result
+    
+    def _charge(self, amount, currency):
+        error = validate_amount(amount)
+        if error:
             return {
                 'success': False,
-                'error': 'Amount exceeds maximum limit',
+                'error': error,
                 'payment_intent_id': None
             }
         
@@ -70,7 +182,7 @@ class MockPaymentProcessor:
         time.sleep(0.1)
         
         # Generate payment intent ID
-        payment_intent_id = MockPaymentProcessor.generate_payment_intent_id()
+        payment_intent_id = self.generate_payment_intent_id()
         
         # Simulate 95% success rate (5% random failures for testing)
         success = random.random() > 0.05
@@ -91,8 +203,7 @@ class MockPaymentProcessor:
                 'status': 'failed'
             }
     
-    @staticmethod
-    def refund_payment(payment_intent_id, amount=None):
+    def refund_payment(self, payment_intent_id, amount=None):
         """
         Process a mock refund.
         
@@ -120,8 +231,7 @@ class MockPaymentProcessor:
             'payment_intent_id': payment_intent_id
         }
     
-    @staticmethod
-    def get_payment_status(payment_intent_id):
+    def get_payment_status(self, payment_intent_id):
         """
         Get mock payment status.
         
@@ -143,19 +253,218 @@ class MockPaymentProcessor:
             'payment_intent_id': payment_intent_id,
             'status': 'completed'
         }
+    
+    def find_payment(self, idempotency_key):
+        """
+        Find a mock charge by the idempotency key it was made with.
+        
+        Args:
+            idempotency_key (str): Idempotency key
+        
+        Returns:
+            dict: Payment status
+        """
+        with self._lock:
+            result = self._charges.get(idempotency_key)
+        if result is None:
+            return {'success': False, 'error': 'Payment not found'}
+        return {
+            'success': True,
+            'payment_intent_id': result['payment_intent_id'],
+            'status': result['status']
+        }
+
+
+class HTTPPaymentGateway(PaymentGateway):
+    """
+    Client for a JSON/HTTP payment gateway.
+    
+    One requests.Session per gateway instance keeps a pool of keep-alive
+    connections, so settlement threads do not pay a TCP/TLS handshake per
+    charge. Requests have connect/read timeouts, and connection errors and
+    502/503/504 responses are retried a bounded number of times with
+    backoff. Charges are only retried because they carry an Idempotency-Key.
+    
+    Once the retries are spent, a timeout, connection error or 5xx leaves
+    the charge's outcome unknown (status PAYMENT_UNKNOWN): the gateway may
+    have taken it. Only 4xx answers and declines are definitive failures.
+    
+    Endpoints:
+        POST {base_url}/v1/payments                  charge
+        POST {base_url}/v1/payments/{id}/refunds     refund
+        GET  {base_url}/v1/payments/{id}             status
+        GET  {base_url}/v1/payments?idempotency_key= find a charge by its key
+    """
+    RETRY_STATUSES = (502, 503, 504)
+    
+    def __init__(self, base_url, api_key='', connect_timeout=3.05, read_timeout=10,
+                 max_retries=2, backoff_factor=0.2, pool_size=10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'POST']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+    
+    def _request(self, method, path, **kwargs):
+        """
+        Send a request to the gateway.
+        
+        Returns:
+            tuple: (HTTP status, JSON body), or (None, error message) when
+            the gateway could not be reached
+        """
+        try:
+            response = self.session.request(
+                method, f'{self.base_url}{path}', timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException as e:
+            return None, f'Payment gateway unavailable: {e.__class__.__name__}'
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return response.status_code, body
+    
+    @staticmethod
+    def _failure(status_code, body):
+        if status_code is None:
+            return {'success': False, 'status': PAYMENT_UNKNOWN, 'error': body}
+        failure = {
+            'success': False,
+            'error': body.get('error') or f'Payment gateway error (HTTP {status_code})'
+        }
+        if status_code >= 500:
+            # The gateway failed while handling the request, possibly after charging
+            failure['status'] = PAYMENT_UNKNOWN
+        return failure
+    
+    def process_payment(self, amount, currency='USD', payment_method=None, idempotency_key=None):
+        error = validate_amount(amount)
+        if error:
+            return {'success': False, 'error': error, 'payment_intent_id': None}
+        
+        status_code, body = self._request(
+            'POST', '/v1/payments',
+            json={
+                'amount': str(amount),
+                'currency': currency,
+                'payment_method': payment_method or {}
+            },
+            headers={'Idempotency-Key': idempotency_key or uuid.uuid4().hex}
+        )
+        if status_code != 200:
+            return {'status': 'failed', **self._failure(status_code, body), 'payment_intent_id': None}
+        
+        payment_status = body.get('status')
+        result = {
+            'success': payment_status == 'completed',
+            'payment_intent_id': body.get('id'),
+            'status': payment_status,
+            'amount': float(amount),
+            'currency': currency
+        }
+        if payment_status == 'failed':
+            result['error'] = body.get('error') or 'Payment declined by processor'
+        elif payment_status != 'completed':
+            # Still in progress at the gateway: settle it from get_payment_status
+            result['status'] = PAYMENT_UNKNOWN
+            result['error'] = f'Payment {payment_status or "status missing"} at gateway'
+        return result
+    
+    def refund_payment(self, payment_intent_id, amount=None):
+        payload = {} if amount is None else {'amount': str(amount)}
+        status_code, body = self._request(
+            'POST', f'/v1/payments/{payment_intent_id}/refunds', json=payload
+        )
+        if status_code != 200:
+            return self._failure(status_code, body)
+        return {
+            'success': True,
+            'refund_id': body.get('id'),
+            'status': body.get('status'),
+            'payment_intent_id': payment_intent_id
+        }
+    
+    def get_payment_status(self, payment_intent_id):
+        status_code, body = self._request('GET', f'/v1/payments/{payment_intent_id}')
+        if status_code != 200:
+            return self._failure(status_code, body)
+        return {
+            'success': True,
+            'payment_intent_id': payment_intent_id,
+            'status': body.get('status')
+        }
+    
+    def find_payment(self, idempotency_key):
+        status_code, body = self._request(
+            'GET', '/v1/payments', params={'idempotency_key': idempotency_key}
+        )
+        if status_code != 200:
+            return self._failure(status_code, body)
+        return {
+            'success': True,
+            'payment_intent_id': body.get('id'),
+            'status': body.get('status')
+        }
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """
+    Get the configured payment gateway, created once per process so its
+    connection pool is shared by all settlement threads.
+    """
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                gateway_class = import_string(settings.PAYMENT_GATEWAYS[settings.PAYMENT_GATEWAY])
+                options = settings.PAYMENT_GATEWAY_OPTIONS if settings.PAYMENT_GATEWAY != 'mock' else {}
+                _gateway = gateway_class(**options)
+    return _gateway
+
+
+def reset_gateway():
+    """Drop the cached gateway (after settings changes)."""
+    global _gateway
+    with _gateway_lock:
+        _gateway = None
+
+
+@receiver(setting_changed)
+def _reset_gateway_on_setting_change(setting, **kwargs):
+    """Rebuild the gateway when its settings are overridden (e.g. in tests)."""
+    if setting.startswith('PAYMENT_GATEWAY'):
+        reset_gateway()
 
 
 # Convenience function for easy import
-def process_payment(amount, currency='USD', payment_method=None):
+def process_payment(amount, currency='USD', payment_method=None, idempotency_key=None):
     """
-    Process a payment using the mock payment processor.
+    Process a payment using the configured payment gateway.
     
     Args:
         amount: Payment amount
         currency: Currency code
         payment_method: Payment method details
+        idempotency_key: Key making retried charges safe
     
     Returns:
         dict: Payment result
     """
-    return MockPaymentProcessor.process_payment(amount, currency, payment_method)
+    return get_gateway().process_payment(amount, currency, payment_method, idempotency_key)
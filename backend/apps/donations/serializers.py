@@ -4,7 +4,26 @@ Serializers for donations API.
 
 from rest_framework import serializers
 from .models import Donation
-from apps.core.utils import detect_pii, redact_pii
+
+
+def mask_donor_email(email, is_anonymous):
+    """
+    Mask a donor email for privacy: first 2 characters and the domain.
+    
+    Returns:
+        str: e.g. "ja**@example.org", or "Anonymous"
+    """
+    if is_anonymous or not email:
+        return "Anonymous"
+    
+    if '@' in email:
+        local, domain = email.split('@')
+        if len(local) > 2:
+            masked_local = local[:2] + '*' * (len(local) - 2)
+        else:
+            masked_local = local[0] + '*'
+        return f"{masked_local}@{domain}"
+    return "***"
 
 
 class DonationSerializer(serializers.ModelSerializer):
@@ -20,6 +39,7 @@ class DonationSerializer(serializers.ModelSerializer):
             'amount',
             'currency',
             'status',
+            'failure_reason',
             'message',
             'created_at'
         ]
@@ -29,7 +49,7 @@ class DonationSerializer(serializers.ModelSerializer):
 class DonationCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating donations.
-    Validates donation data and processes payment.
+    Validates donation data; the payment is settled in the background.
     """
     class Meta:
         model = Donation
@@ -38,8 +58,7 @@ class DonationCreateSerializer(serializers.ModelSerializer):
             'currency',
             'donor_email',
             'is_anonymous',
-            'message',
-            'payment_intent_id'
+            'message'
         ]
     
     def validate_amount(self, value):
@@ -51,13 +70,10 @@ class DonationCreateSerializer(serializers.ModelSerializer):
         return value
     
     def validate_message(self, value):
-        """Validate and warn about PII in message"""
-        if value:
-            pii_detected = detect_pii(value)
-            if pii_detected:
-                # Return warning but don't block
-                # The model's save method will log this
-                pass
+        """
+        Validate message.
+        PII is not blocked here; the model's save method scans and logs it on creation.
+        """
         return value
     
     def validate(self, data):
@@ -101,16 +117,43 @@ class DonationAdminSerializer(serializers.ModelSerializer):
     
     def get_donor_email_masked(self, obj):
         """Mask donor email for privacy"""
-        if obj.is_anonymous or not obj.donor_email:
-            return "Anonymous"
-        
-        # Mask email: show first 2 chars and domain
-        email = obj.donor_email
-        if '@' in email:
-            local, domain = email.split('@')
-            if len(local) > 2:
-                masked_local = local[:2] + '*' * (len(local) - 2)
-            else:
-                masked_local = local[0] + '*'
-            return f"{masked_local}@{domain}"
-        return "***"
+        return mask_donor_email(obj.donor_email, obj.is_anonymous)
+
+
+class DonationExportQuerySerializer(serializers.Serializer):
+    """
+    Query parameters for the donation export.
+    Range is [from, to) on created_at; status takes a comma-separated list.
+    """
+    export_format = serializers.CharField(default='csv')
+    status = serializers.CharField(required=False)
+    
+    def get_fields(self):
+        # 'from' is a Python keyword, so these are added here rather than declared
+        fields = super().get_fields()
+        fields['from'] = serializers.DateTimeField(required=False)
+        fields['to'] = serializers.DateTimeField(required=False)
+        return fields
+    
+    def validate_export_format(self, value):
+        from .export import available_formats
+        formats = available_formats()
+        if value not in formats:
+            raise serializers.ValidationError(f"Must be one of: {', '.join(formats)}")
+        return value
+    
+    def validate_status(self, value):
+        statuses = [status.strip() for status in value.split(',') if status.strip()]
+        valid = [choice[0] for choice in Donation.STATUS_CHOICES]
+        invalid = [status for status in statuses if status not in valid]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Unknown status {', '.join(invalid)}; expected any of: {', '.join(valid)}"
+            )
+        return statuses
+    
+    def validate(self, data):
+        """Ensure the range is ordered."""
+        if data.get('from') and data.get('to') and data['from'] >= data['to']:
+            raise serializers.ValidationError({'from': "'from' must be before 'to'"})
+        return data
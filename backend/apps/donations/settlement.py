@@ -0,0 +1,213 @@
+"""
+Background settlement of donation payments.
+
+Donations are created as `pending` and answered immediately; the payment is
+then settled on a process-wide thread pool, so request workers never wait on
+the payment gateway. Clients poll GET /api/donations/{confirmation_code}/.
+
+Payment method details are only handed to the worker in memory and are never
+stored, in line with the donation privacy rules.
+
+Settling takes three steps so no row lock or transaction is held while the
+gateway is called: the donation is claimed (pending -> processing) and
+committed, the charge is made outside any transaction, and the result is
+recorded in a second short transaction.
+
+A charge whose outcome the gateway could not report (timeout, 5xx) puts the
+donation back to pending: the donor may have been charged, so it is not
+failed until `python manage.py expire_pending_donations` has asked the gateway.
+"""
+
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from apps.core.querybudget import unbudgeted
+from .models import Donation
+from .payment import get_gateway, is_outcome_unknown, process_payment
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Get the settlement thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PAYMENT_SETTLEMENT_WORKERS,
+                    thread_name_prefix='donation-settlement'
+                )
+                atexit.register(shutdown_executor)
+    return _executor
+
+
+def shutdown_executor():
+    """Wait for in-flight settlements to finish (called at interpreter exit)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def payment_outcome(payment_result):
+    """
+    Donation status a gateway result settles on.
+
+    Returns:
+        str: 'completed', 'failed' or 'refunded', or None while the outcome
+        of the charge is unknown
+    """
+    if is_outcome_unknown(payment_result):
+        return None
+    if not payment_result['success']:
+        return 'failed'
+    status = payment_result.get('status')
+    return status if status in ('completed', 'failed', 'refunded') else None
+
+
+def apply_payment_result(donation, payment_result, failure_reason=None):
+    """
+    Record a gateway result on a donation and save it. Donations whose
+    outcome is unknown are (put back) pending.
+
+    Args:
+        donation (Donation): Donation to update
+        payment_result (dict): Result of a PaymentGateway call
+        failure_reason (str): Reason stored if the gateway call failed
+            (default: the gateway's error)
+
+    Returns:
+        str: The outcome (see payment_outcome)
+    """
+    outcome = payment_outcome(payment_result)
+    donation.payment_intent_id = payment_result.get('payment_intent_id') or donation.payment_intent_id
+    donation.status = outcome or 'pending'
+    if outcome == 'failed':
+        if payment_result['success']:
+            reason = payment_result.get('error') or 'Payment declined by processor'
+        else:
+            reason = failure_reason or payment_result.get('error') or 'Unknown error'
+        donation.failure_reason = reason[:255]
+    donation.save()
+    return outcome
+
+
+def check_payment(donation):
+    """
+    Ask the gateway what became of a donation's charge: by payment intent
+    when one is known, else by the idempotency key it was charged with.
+
+    Returns:
+        dict: Gateway result (see PaymentGateway.find_payment)
+    """
+    gateway = get_gateway()
+    if donation.payment_intent_id:
+        return gateway.get_payment_status(donation.payment_intent_id)
+    return gateway.find_payment(donation.confirmation_code)
+
+
+def claim_donation(donation_id):
+    """
+    Move a pending donation to processing, so only one settlement charges it.
+
+    Returns:
+        Donation: The claimed donation, or None if it was not pending
+    """
+    with transaction.atomic():
+        donation = Donation.objects.select_for_update().filter(
+            pk=donation_id, status='pending'
+        ).first()
+        if donation is None:
+            return None
+        donation.status = 'processing'
+        donation.save(update_fields=['status', 'updated_at'])
+    return donation
+
+
+def settle_donation(donation_id, payment_method=None):
+    """
+    Charge a pending donation and record the outcome.
+
+    Args:
+        donation_id (int): Donation primary key
+        payment_method (dict): Payment method details for the processor
+
+    Returns:
+        Donation: The donation (pending again if the outcome is unknown),
+        or None if it was not pending or was reconciled meanwhile
+    """
+    donation = claim_donation(donation_id)
+    if donation is None:
+        return None
+
+    # Outside any transaction: the gateway call may take timeout x retries
+    payment_result = process_payment(
+        amount=donation.amount,
+        currency=donation.currency,
+        payment_method=payment_method,
+        idempotency_key=donation.confirmation_code
+    )
+
+    with transaction.atomic():
+        donation = Donation.objects.select_for_update().filter(
+            pk=donation_id, status='processing'
+        ).first()
+        if donation is None:
+            logger.warning(f"Donation {donation_id} was reconciled while its charge was in flight")
+            return None
+        outcome = apply_payment_result(donation, payment_result)
+
+    if outcome is None:
+        logger.warning(
+            f"Donation {donation.confirmation_code} left pending, payment outcome unknown: "
+            f"{payment_result.get('error')}"
+        )
+    else:
+        logger.info(f"Donation {donation.confirmation_code} settled: {donation.status}")
+    return donation
+
+
+def _run_settlement(donation_id, payment_method):
+    """Worker entry point; owns its database connection."""
+    close_old_connections()
+    try:
+        settle_donation(donation_id, payment_method)
+    except Exception:
+        logger.exception(f"Settlement of donation {donation_id} failed")
+    finally:
+        close_old_connections()
+
+
+def _settle_inline(donation_id, payment_method):
+    """Settle in the request thread; a worker's queries, so not the request's budget."""
+    with unbudgeted():
+        settle_donation(donation_id, payment_method)
+
+
+def schedule_settlement(donation, payment_method=None):
+    """
+    Settle a pending donation in the background once the current
+    transaction commits. With PAYMENT_SETTLEMENT_WORKERS = 0 the donation is
+    settled inline instead (development and tests).
+
+    Args:
+        donation (Donation): Saved pending donation
+        payment_method (dict): Payment method details for the processor
+    """
+    if settings.PAYMENT_SETTLEMENT_WORKERS <= 0:
+        transaction.on_commit(lambda: _settle_inline(donation.pk, payment_method))
+        return
+
+    transaction.on_commit(
+        lambda: get_executor().submit(_run_settlement, donation.pk, payment_method)
+    )
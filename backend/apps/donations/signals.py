@@ -0,0 +1,41 @@
+"""
+Signal handlers keeping DonationDailyRollup in sync with Donation writes.
+Bulk operations (queryset.update, bulk_create) bypass these; run
+`python manage.py backfill_rollups` after them.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.rollups import apply_rollup_change
+from .models import Donation, DonationDailyRollup
+
+
+@receiver(pre_save, sender=Donation)
+def capture_previous_donation(sender, instance, **kwargs):
+    """Remember the stored version of an updated donation so its old contribution can be moved."""
+    instance._rollup_previous = None
+    if not instance._state.adding and instance.pk:
+        instance._rollup_previous = Donation.objects.filter(pk=instance.pk).only(
+            'created_at', 'currency', 'status', 'amount'
+        ).first()
+
+
+@receiver(post_save, sender=Donation)
+def update_donation_rollup(sender, instance, created, **kwargs):
+    """Add a new donation to its daily rollup, or move an updated one."""
+    previous = getattr(instance, '_rollup_previous', None)
+    if created:
+        apply_rollup_change(DonationDailyRollup, None, DonationDailyRollup.contribution(instance))
+    elif previous is not None:
+        apply_rollup_change(
+            DonationDailyRollup,
+            DonationDailyRollup.contribution(previous),
+            DonationDailyRollup.contribution(instance)
+        )
+
+
+@receiver(post_delete, sender=Donation)
+def remove_donation_from_rollup(sender, instance, **kwargs):
+    """Remove a deleted donation from its daily rollup."""
+    apply_rollup_change(DonationDailyRollup, DonationDailyRollup.contribution(instance), None)
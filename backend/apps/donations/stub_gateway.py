@@ -0,0 +1,184 @@
+"""
+Local stub payment gateway for tests, load tests and benchmarks.
+
+Speaks the protocol HTTPPaymentGateway expects, keeps payments in memory and
+can simulate gateway latency and declines, so the donation path can be
+exercised with real HTTP I/O and no outside services.
+
+Run standalone with `python manage.py run_payment_stub`, or in-process:
+
+    with StubGatewayServer(latency=0.05) as stub:
+        gateway = HTTPPaymentGateway(stub.url)
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PAYMENT_PATH = re.compile(r'^/v1/payments/(?P<payment_id>[\w-]+)$')
+REFUND_PATH = re.compile(r'^/v1/payments/(?P<payment_id>[\w-]+)/refunds$')
+
+
+class StubGatewayHandler(BaseHTTPRequestHandler):
+    """Request handler; state lives on the server instance."""
+    protocol_version = 'HTTP/1.1'  # keep-alive, like a real gateway
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def _authorized(self):
+        if not self.server.api_key:
+            return True
+        return self.headers.get('Authorization') == f'Bearer {self.server.api_key}'
+
+    def do_GET(self):
+        if not self._authorized():
+            return self._send(401, {'error': 'Unauthorized'})
+        url = urlsplit(self.path)
+        if url.path == '/v1/payments':
+            # Find a charge by the Idempotency-Key it was made with
+            key = parse_qs(url.query).get('idempotency_key', [''])[0]
+            with self.server.lock:
+                payment_id = self.server.idempotency_keys.get(key)
+            payment = payment_id and self.server.payments.get(payment_id)
+        else:
+            match = PAYMENT_PATH.match(url.path)
+            payment = match and self.server.payments.get(match['payment_id'])
+        if not payment:
+            return self._send(404, {'error': 'Payment not found'})
+        self._send(200, payment)
+
+    def do_POST(self):
+        if not self._authorized():
+            return self._send(401, {'error': 'Unauthorized'})
+        body = self._read_json()
+        if body is None:
+            return self._send(400, {'error': 'Invalid JSON'})
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if self.path == '/v1/payments':
+            return self._charge(body)
+        match = REFUND_PATH.match(self.path)
+        if match:
+            return self._refund(match['payment_id'], body)
+        self._send(404, {'error': 'Not found'})
+
+    def _charge(self, body):
+        try:
+            amount = Decimal(str(body.get('amount')))
+        except InvalidOperation:
+            return self._send(400, {'error': 'Invalid amount'})
+        if amount <= 0:
+            return self._send(400, {'error': 'Amount must be greater than zero'})
+
+        key = self.headers.get('Idempotency-Key')
+        server = self.server
+        with server.lock:
+            if key and key in server.idempotency_keys:
+                return self._send(200, server.payments[server.idempotency_keys[key]])
+
+            declined = random.random() < server.failure_rate
+            payment = {
+                'id': f'pi_stub_{uuid.uuid4().hex[:16]}',
+                'status': 'failed' if declined else 'completed',
+                'amount': str(amount),
+                'currency': body.get('currency', 'USD'),
+            }
+            if declined:
+                payment['error'] = 'Payment declined by processor'
+            server.payments[payment['id']] = payment
+            if key:
+                server.idempotency_keys[key] = payment['id']
+        self._send(200, payment)
+
+    def _refund(self, payment_id, body):
+        server = self.server
+        with server.lock:
+            payment = server.payments.get(payment_id)
+            if not payment:
+                return self._send(404, {'error': 'Payment not found'})
+            if payment['status'] != 'completed':
+                return self._send(409, {'error': f"Cannot refund a {payment['status']} payment"})
+            payment['status'] = 'refunded'
+        self._send(200, {
+            'id': f're_stub_{uuid.uuid4().hex[:16]}',
+            'status': 'refunded',
+            'payment_intent_id': payment_id,
+            'amount': body.get('amount', payment['amount']),
+        })
+
+
+class StubGatewayServer(ThreadingHTTPServer):
+    """
+    In-memory payment gateway server.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free port)
+        latency (float): Seconds to wait before answering each POST
+        failure_rate (float): Fraction of charges to decline (0-1)
+        api_key (str): Required bearer token, or empty for none
+        verbose (bool): Log each request to stderr
+    """
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, failure_rate=0.0,
+                 api_key='', verbose=False):
+        super().__init__((host, port), StubGatewayHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.api_key = api_key
+        self.verbose = verbose
+        self.payments = {}
+        self.idempotency_keys = {}
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
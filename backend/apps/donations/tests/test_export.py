@@ -0,0 +1,146 @@
+"""
+Tests for the streaming donation export.
+"""
+
+import csv
+import io
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.donations import export
+from apps.donations.models import Donation
+
+
+def create_donation(created_at=None, **fields):
+    fields.setdefault('status', 'completed')
+    donation = Donation.objects.create(amount=Decimal('25.00'), **fields)
+    if created_at:
+        Donation.objects.filter(pk=donation.pk).update(created_at=created_at)
+    return donation
+
+
+def rows(content):
+    return list(csv.DictReader(io.StringIO(content.decode())))
+
+
+@pytest.fixture
+def admin_client():
+    admin = AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.mark.django_db
+class TestExport:
+    """GET /api/donations/export/"""
+
+    def test_csv_columns_with_masked_email(self, admin_client):
+        create_donation(donor_email='jane.doe@example.org')
+        create_donation(donor_email='hidden@example.org', is_anonymous=True)
+
+        response = admin_client.get('/api/donations/export/')
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/csv'
+        content = b''.join(response.streaming_content)
+        exported = rows(content)
+        assert list(exported[0]) == export.EXPORT_FIELDS
+        assert sorted(row['donor_email_masked'] for row in exported) == ['Anonymous', 'ja******@example.org']
+        assert b'jane.doe' not in content
+        assert b'hidden' not in content
+
+    def test_date_range_is_half_open(self, admin_client):
+        create_donation(created_at=datetime(2025, 12, 31, 23, 59, tzinfo=dt_timezone.utc))
+        january = create_donation(created_at=datetime(2026, 1, 1, tzinfo=dt_timezone.utc))
+        create_donation(created_at=datetime(2026, 2, 1, tzinfo=dt_timezone.utc))
+
+        response = admin_client.get('/api/donations/export/?from=2026-01-01T00:00:00Z&to=2026-02-01T00:00:00Z')
+
+        exported = rows(b''.join(response.streaming_content))
+        assert [row['id'] for row in exported] == [str(january.id)]
+
+    def test_status_filter(self, admin_client):
+        completed = create_donation(status='completed')
+        refunded = create_donation(status='refunded')
+        create_donation(status='failed')
+
+        response = admin_client.get('/api/donations/export/?status=completed, refunded')
+
+        exported = rows(b''.join(response.streaming_content))
+        assert {row['id'] for row in exported} == {str(completed.id), str(refunded.id)}
+
+    @pytest.mark.parametrize('query, field', [
+        ('export_format=xlsx', 'export_format'),
+        ('status=completed,lost', 'status'),
+        ('from=2026-02-01T00:00:00Z&to=2026-01-01T00:00:00Z', 'from'),
+    ])
+    def test_bad_query_rejected(self, admin_client, query, field):
+        response = admin_client.get(f'/api/donations/export/?{query}')
+
+        assert response.status_code == 400
+        assert field in response.data['error']['fields']
+
+    def test_columnar_formats_rejected_without_pyarrow(self, admin_client, monkeypatch):
+        monkeypatch.setattr(export, 'pyarrow', None)
+
+        response = admin_client.get('/api/donations/export/?export_format=parquet')
+
+        assert response.status_code == 400
+        assert 'export_format' in response.data['error']['fields']
+
+    def test_admin_only(self):
+        response = APIClient().get('/api/donations/export/')
+
+        assert response.status_code in (401, 403)
+
+
+@pytest.mark.django_db
+class TestColumnarExport:
+    """Parquet and Arrow exports write one row group or batch per chunk."""
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, settings):
+        pytest.importorskip('pyarrow')
+        settings.DONATION_EXPORT_CHUNK_SIZE = 2
+
+    def test_parquet_row_group_per_chunk(self, admin_client):
+        import pyarrow.parquet
+
+        for number in range(5):
+            create_donation(donor_email=f'donor{number}@example.org')
+
+        response = admin_client.get('/api/donations/export/?export_format=parquet')
+
+        assert response.status_code == 200
+        parquet = pyarrow.parquet.ParquetFile(io.BytesIO(b''.join(response.streaming_content)))
+        assert parquet.num_row_groups == 3
+        assert [parquet.metadata.row_group(index).num_rows for index in range(3)] == [2, 2, 1]
+        table = parquet.read()
+        assert table.schema.names == export.EXPORT_FIELDS
+        assert table.column('amount').to_pylist() == [Decimal('25.00')] * 5
+        assert all(email.startswith('do***') for email in table.column('donor_email_masked').to_pylist())
+
+    def test_arrow_batch_per_chunk(self, admin_client):
+        import pyarrow.ipc
+
+        for _ in range(3):
+            create_donation()
+
+        response = admin_client.get('/api/donations/export/?export_format=arrow')
+
+        reader = pyarrow.ipc.open_stream(b''.join(response.streaming_content))
+        assert [batch.num_rows for batch in reader] == [2, 1]
+
+    def test_empty_export_is_valid_parquet(self, admin_client):
+        import pyarrow.parquet
+
+        response = admin_client.get('/api/donations/export/?export_format=parquet')
+
+        table = pyarrow.parquet.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        assert table.num_rows == 0
+        assert table.schema.names == export.EXPORT_FIELDS
@@ -0,0 +1,54 @@
+"""
+Tests for the Donation model.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from apps.donations import models
+from apps.donations.models import Donation
+from apps.donations.settlement import apply_payment_result
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Messages passed to the PII scan."""
+    scanned = []
+
+    def detect_pii(text):
+        scanned.append(text)
+        return ['email'] if '@' in text else []
+
+    monkeypatch.setattr(models, 'detect_pii', detect_pii)
+    return scanned
+
+
+@pytest.mark.django_db
+class TestMessagePIIScan:
+    """The message is scanned when it is saved, not on every save."""
+
+    def test_scanned_on_create(self, scans):
+        Donation.objects.create(
+            amount=Decimal('10.00'), message='Write to me at donor@example.com'
+        )
+
+        assert scans == ['Write to me at donor@example.com']
+
+    def test_not_scanned_on_later_saves(self, scans):
+        donation = Donation.objects.create(amount=Decimal('10.00'), message='Thank you')
+
+        donation.status = 'completed'
+        donation.save()
+        donation.save(update_fields=['status', 'updated_at'])
+        apply_payment_result(donation, {'success': True, 'status': 'completed', 'payment_intent_id': 'pi_1'})
+
+        assert scans == ['Thank you']
+
+    def test_scanned_when_message_updated(self, scans):
+        donation = Donation.objects.create(amount=Decimal('10.00'))
+
+        donation.message = 'Keep going'
+        donation.save(update_fields=['message'])
+
+        assert scans == ['Keep going']
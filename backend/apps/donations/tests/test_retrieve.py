@@ -0,0 +1,65 @@
+"""
+Tests for looking up donations by confirmation code.
+"""
+
+from decimal import Decimal
+from urllib.parse import quote
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.core.codes import format_code
+from apps.donations.models import Donation
+
+
+def create_donation(**fields):
+    return Donation.objects.create(amount=Decimal('25.00'), status='completed', **fields)
+
+
+@pytest.mark.django_db
+class TestRetrieveByCode:
+    """GET /api/donations/{confirmation_code}/"""
+
+    def test_generated_code_found(self):
+        donation = create_donation()
+
+        response = APIClient().get(f'/api/donations/{donation.confirmation_code}/')
+
+        assert response.status_code == 200
+        assert response.data['confirmation_code'] == donation.confirmation_code
+
+    def test_code_normalized_before_lookup(self):
+        donation = create_donation()
+        prefix, year, body = donation.confirmation_code.split('-')
+        typed = f"{prefix}-{year}-{body.replace('0', 'O').replace('1', 'l')}".lower()
+
+        response = APIClient().get(f'/api/donations/{typed}/')
+
+        assert response.status_code == 200
+        assert response.data['confirmation_code'] == donation.confirmation_code
+
+    def test_legacy_hex_code_found(self):
+        code = 'DON-2025-A7B9C2'
+        create_donation(confirmation_code=code)
+
+        for path in (code, code.lower(), quote(code, safe='')):
+            response = APIClient().get(f'/api/donations/{path}/')
+            assert response.status_code == 200, path
+            assert response.data['confirmation_code'] == code
+
+    def test_malformed_code_rejected_without_query(self):
+        code = format_code('DON', 12345, 2026)
+        mistyped = code[:-2] + code[-1] + code[-2]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get(f'/api/donations/{mistyped}/')
+
+        assert response.status_code == 400
+        assert len(queries) == 0
+
+    def test_unknown_code_not_found(self):
+        response = APIClient().get(f"/api/donations/{format_code('DON', 12345, 2026)}/")
+
+        assert response.status_code == 404
@@ -0,0 +1,226 @@
+"""
+Tests for background donation settlement, idempotent retries and
+reconciliation of charges whose outcome was unknown.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from apps.donations.models import Donation
+from apps.donations.payment import PAYMENT_UNKNOWN, MockPaymentProcessor, get_gateway
+from apps.donations.settlement import settle_donation
+
+
+class ScriptedGateway(MockPaymentProcessor):
+    """
+    Mock processor with scripted outcomes and no delay.
+
+    outcomes: Queued results of real charges ('completed' or 'declined');
+        completed once the queue is empty
+    lose_responses: Number of upcoming calls whose response is lost after
+        the gateway handled them (a timeout to the caller)
+    before_response: Optional callable run while a charge is in flight
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.outcomes = []
+        self.lose_responses = 0
+        self.before_response = None
+        self.charged = 0
+
+    def process_payment(self, amount, currency='USD', payment_method=None, idempotency_key=None):
+        result = super().process_payment(amount, currency, payment_method, idempotency_key)
+        if self.before_response is not None:
+            self.before_response()
+        if self.lose_responses:
+            self.lose_responses -= 1
+            return {
+                'success': False,
+                'error': 'Gateway timed out',
+                'payment_intent_id': None,
+                'status': PAYMENT_UNKNOWN
+            }
+        return result
+
+    def _charge(self, amount, currency):
+        self.charged += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else 'completed'
+        payment_intent_id = f"{self.generate_payment_intent_id()}_{self.charged}"
+        if outcome == 'declined':
+            return {
+                'success': False,
+                'error': 'Card declined',
+                'payment_intent_id': payment_intent_id,
+                'status': 'failed'
+            }
+        return {
+            'success': True,
+            'payment_intent_id': payment_intent_id,
+            'status': 'completed',
+            'amount': float(amount),
+            'currency': currency
+        }
+
+
+@pytest.fixture
+def gateway(settings):
+    settings.PAYMENT_SETTLEMENT_WORKERS = 0
+    settings.PAYMENT_GATEWAY = 'mock'
+    settings.PAYMENT_GATEWAYS = {
+        **settings.PAYMENT_GATEWAYS,
+        'mock': 'apps.donations.tests.test_settlement.ScriptedGateway',
+    }
+    return get_gateway()
+
+
+@pytest.fixture
+def donate(django_capture_on_commit_callbacks):
+    """POST a donation, running the settlement scheduled on commit."""
+    client = APIClient()
+
+    def donate(amount='25.00', idempotency_key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': idempotency_key} if idempotency_key else {}
+        with django_capture_on_commit_callbacks(execute=True):
+            return client.post(
+                '/api/donations/', {'amount': amount, 'is_anonymous': True}, format='json', **headers
+            )
+    return donate
+
+
+@pytest.mark.django_db
+class TestCreateAndSettle:
+    """POST /api/donations/ returns 202 and settles the payment once."""
+
+    def test_donation_accepted_then_settled(self, gateway, donate):
+        response = donate()
+
+        assert response.status_code == 202
+        code = response.data['donation']['confirmation_code']
+        assert response['Location'].endswith(f'/api/donations/{code}/')
+        donation = Donation.objects.get(confirmation_code=code)
+        assert donation.status == 'completed'
+        assert donation.payment_intent_id
+        assert gateway.charged == 1
+        # The charge is keyed by the confirmation code
+        assert gateway.find_payment(code)['payment_intent_id'] == donation.payment_intent_id
+
+    def test_declined_payment_fails_donation(self, gateway, donate):
+        gateway.outcomes = ['declined']
+
+        response = donate()
+
+        donation = Donation.objects.get(confirmation_code=response.data['donation']['confirmation_code'])
+        assert donation.status == 'failed'
+        assert donation.failure_reason == 'Card declined'
+
+    def test_retry_with_same_key_replays_donation(self, gateway, donate):
+        first = donate(idempotency_key='key-1')
+        retry = donate(idempotency_key='key-1')
+
+        assert retry.status_code == 202
+        assert retry['Idempotent-Replayed'] == 'true'
+        assert retry.data['donation']['confirmation_code'] == first.data['donation']['confirmation_code']
+        assert retry.data['donation']['status'] == 'completed'
+        assert Donation.objects.count() == 1
+        assert gateway.charged == 1
+
+    def test_key_reused_for_other_donation_conflicts(self, gateway, donate):
+        donate(idempotency_key='key-1')
+
+        response = donate(amount='50.00', idempotency_key='key-1')
+
+        assert response.status_code == 409
+        assert Donation.objects.count() == 1
+
+    def test_requests_without_key_are_separate_donations(self, gateway, donate):
+        donate()
+        donate()
+
+        assert Donation.objects.count() == 2
+        assert gateway.charged == 2
+
+    def test_overlong_key_rejected(self, gateway, donate):
+        response = donate(idempotency_key='k' * 256)
+
+        assert response.status_code == 400
+        assert Donation.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestSettleDonation:
+    """settle_donation charges each donation at most once."""
+
+    def test_settling_twice_charges_once(self, gateway):
+        donation = Donation.objects.create(amount=Decimal('10.00'), is_anonymous=True)
+
+        assert settle_donation(donation.pk).status == 'completed'
+        assert settle_donation(donation.pk) is None
+        assert gateway.charged == 1
+
+    def test_unknown_outcome_leaves_donation_pending(self, gateway):
+        donation = Donation.objects.create(amount=Decimal('10.00'), is_anonymous=True)
+        gateway.lose_responses = 1
+
+        settled = settle_donation(donation.pk)
+
+        assert settled.status == 'pending'
+        assert settled.payment_intent_id is None
+
+    def test_replayed_charge_returns_original_payment(self, gateway):
+        donation = Donation.objects.create(amount=Decimal('10.00'), is_anonymous=True)
+        gateway.lose_responses = 1
+        settle_donation(donation.pk)
+
+        settled = settle_donation(donation.pk)
+
+        assert settled.status == 'completed'
+        assert gateway.charged == 1
+        assert settled.payment_intent_id == gateway.find_payment(donation.confirmation_code)['payment_intent_id']
+
+    def test_result_not_recorded_if_reconciled_meanwhile(self, gateway):
+        donation = Donation.objects.create(amount=Decimal('10.00'), is_anonymous=True)
+        gateway.outcomes = ['declined']
+        gateway.before_response = lambda: Donation.objects.filter(pk=donation.pk).update(status='completed')
+
+        assert settle_donation(donation.pk) is None
+        donation.refresh_from_db()
+        assert donation.status == 'completed'
+
+
+@pytest.mark.django_db
+class TestExpirePendingDonations:
+    """expire_pending_donations asks the gateway before failing a donation."""
+
+    def test_charged_donation_completed(self, gateway):
+        donation = Donation.objects.create(amount=Decimal('10.00'), is_anonymous=True)
+        gateway.lose_responses = 1
+        settle_donation(donation.pk)
+
+        call_command('expire_pending_donations', older_than=0)
+
+        donation.refresh_from_db()
+        assert donation.status == 'completed'
+        assert donation.payment_intent_id
+        assert gateway.charged == 1
+
+    def test_uncharged_donation_failed(self, gateway):
+        donation = Donation.objects.create(amount=Decimal('10.00'), is_anonymous=True)
+
+        call_command('expire_pending_donations', older_than=0)
+
+        donation.refresh_from_db()
+        assert donation.status == 'failed'
+        assert donation.failure_reason == 'Payment was not settled in time'
+        assert gateway.charged == 0
+
+    def test_recent_donations_untouched(self, gateway):
+        donation = Donation.objects.create(amount=Decimal('10.00'), is_anonymous=True)
+
+        call_command('expire_pending_donations', older_than=30)
+
+        donation.refresh_from_db()
+        assert donation.status == 'pending'
@@ -2,18 +2,30 @@
 Views for donations API.
 """
 
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from apps.core.codes import normalize_code
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsAdminUser
-from .models import Donation
+from apps.core.pii import pii_scan_budget
+from .export import EXPORT_FORMATS, stream_export
+from .models import Donation, DonationDailyRollup
 from .serializers import (
     DonationSerializer,
     DonationCreateSerializer,
-    DonationAdminSerializer
+    DonationAdminSerializer,
+    DonationExportQuerySerializer
 )
-from .payment import process_payment
+from .settlement import schedule_settlement
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
 
 
 class DonationViewSet(viewsets.ModelViewSet):
@@ -21,14 +33,18 @@ class DonationViewSet(viewsets.ModelViewSet):
     ViewSet for donations.
     
     Public endpoints (no auth required):
-    - create: POST /api/donations/
+    - create: POST /api/donations/ (202, settled in the background)
     - retrieve: GET /api/donations/{confirmation_code}/
     
     Admin endpoints (JWT required):
-    - list: GET /api/donations/
+    - list: GET /api/donations/ (cursor paginated, ?count=estimate)
+    - export: GET /api/donations/export/?export_format=csv|parquet|arrow
     """
     queryset = Donation.objects.all()
     lookup_field = 'confirmation_code'
+    pagination_class = KeysetPagination
+    query_budgets = {'list': 3, 'retrieve': 2, 'create': 10, 'stats': 2, 'export': 2}
+    replica_actions = {'stats', 'export'}
     
     def get_permissions(self):
         """
@@ -51,55 +67,93 @@ class DonationViewSet(viewsets.ModelViewSet):
     
     def create(self, request, *args, **kwargs):
         """
-        Create a new donation and process payment.
+        Create a pending donation and settle the payment in the background.
         POST /api/donations/
-        """
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
         
-        # Extract payment data
-        amount = serializer.validated_data['amount']
-        currency = serializer.validated_data.get('currency', 'USD')
+        Returns 202 with the confirmation code; poll
+        GET /api/donations/{confirmation_code}/ for the final status.
         
-        # Process payment using mock processor
-        payment_result = process_payment(
-            amount=amount,
-            currency=currency,
-            payment_method=request.data.get('payment_method')
-        )
-        
-        if not payment_result['success']:
+        An Idempotency-Key header makes retries safe: a repeated request with
+        the same key returns the original donation instead of charging again.
+        """
+        idempotency_key = request.headers.get('Idempotency-Key', '').strip() or None
+        if idempotency_key and len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
             return Response(
-                {
-                    'error': 'Payment processing failed',
-                    'detail': payment_result.get('error', 'Unknown error')
-                },
+                {'error': f'Idempotency-Key must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update payment intent ID from processor
-        serializer.validated_data['payment_intent_id'] = payment_result['payment_intent_id']
-        serializer.validated_data['status'] = 'completed'
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        if idempotency_key:
+            existing = Donation.objects.filter(idempotency_key=idempotency_key).first()
+            if existing is not None:
+                return self._replay_donation(request, existing, serializer.validated_data)
         
-        # Save donation
-        donation = serializer.save()
+        try:
+            with transaction.atomic(), pii_scan_budget(settings.PII_SCAN_CPU_BUDGET):
+                donation = serializer.save(status='pending', idempotency_key=idempotency_key)
+                schedule_settlement(donation, request.data.get('payment_method'))
+        except IntegrityError:
+            # A concurrent request with the same key won the race
+            existing = idempotency_key and Donation.objects.filter(
+                idempotency_key=idempotency_key
+            ).first()
+            if not existing:
+                raise
+            return self._replay_donation(request, existing, serializer.validated_data)
         
-        # Return success response
-        response_serializer = DonationSerializer(donation)
-        return Response(
+        return self._accepted_response(request, donation)
+    
+    def _accepted_response(self, request, donation, replayed=False):
+        """202 response pointing the client at the donation status URL."""
+        status_url = request.build_absolute_uri(
+            reverse('donations:donation-detail', kwargs={'confirmation_code': donation.confirmation_code})
+        )
+        response = Response(
             {
                 'success': True,
-                'message': 'Thank you for your donation!',
-                'donation': response_serializer.data
+                'message': 'Thank you! Your donation is being processed.',
+                'donation': DonationSerializer(donation).data,
+                'status_url': status_url
             },
-            status=status.HTTP_201_CREATED
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': status_url}
         )
+        if replayed:
+            response['Idempotent-Replayed'] = 'true'
+        return response
+    
+    def _replay_donation(self, request, donation, validated_data):
+        """
+        Answer a retried request with the donation its Idempotency-Key created,
+        unless the key is being reused for a different donation.
+        """
+        if (donation.amount != validated_data['amount']
+                or donation.currency != validated_data.get('currency', 'USD')):
+            return Response(
+                {'error': 'Idempotency-Key was already used for a different donation'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return self._accepted_response(request, donation, replayed=True)
     
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve donation by confirmation code.
         GET /api/donations/{confirmation_code}/
+        
+        Malformed codes (bad shape or check symbol) are rejected without
+        a database lookup.
         """
+        code = normalize_code(kwargs.get(self.lookup_field), prefix="DON")
+        if code is None:
+            return Response(
+                {'error': 'Invalid confirmation code'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        self.kwargs[self.lookup_field] = code
+        
         try:
             donation = self.get_object()
             serializer = self.get_serializer(donation)
@@ -130,19 +184,83 @@ class DonationViewSet(viewsets.ModelViewSet):
     def stats(self, request):
         """
         Get donation statistics (admin only).
+        Reads the daily rollup table instead of scanning all donations.
         GET /api/donations/stats/
         """
-        from django.db.models import Sum, Count, Avg
+        from django.db.models import Sum
         
-        total_donations = Donation.objects.filter(status='completed').aggregate(
-            total_amount=Sum('amount'),
-            count=Count('id'),
-            average=Avg('amount')
-        )
+        by_currency = {
+            row['currency']: {
+                'total_amount': float(row['total_amount'] or 0),
+                'total_count': row['count'] or 0,
+                'average_amount': float(row['total_amount'] / row['count']) if row['count'] else 0,
+            }
+            for row in DonationDailyRollup.objects.filter(status='completed')
+            .values('currency')
+            .annotate(total_amount=Sum('total_amount'), count=Sum('donation_count'))
+            .order_by('currency')
+        }
+        
+        total_amount = sum(row['total_amount'] for row in by_currency.values())
+        total_count = sum(row['total_count'] for row in by_currency.values())
         
         return Response({
-            'total_amount': float(total_donations['total_amount'] or 0),
-            'total_count': total_donations['count'],
-            'average_amount': float(total_donations['average'] or 0),
-            'currency': 'USD'
+            'total_amount': total_amount,
+            'total_count': total_count,
+            'average_amount': total_amount / total_count if total_count else 0,
+            'currency': 'USD',
+            'by_currency': by_currency
         })
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        Stream donations for reconciliation (admin only).
+        Rows are read without model instances, so memory use stays flat
+        however many donations match.
+        
+        GET /api/donations/export/?export_format=csv|parquet|arrow
+            &from=2026-01-01&to=2026-02-01&status=completed,refunded
+        
+        Query params:
+        - export_format: csv (default), parquet or arrow (the latter two need pyarrow)
+        - from / to: ISO dates or datetimes on created_at, range is [from, to)
+        - status: comma-separated statuses
+        """
+        query = DonationExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        export_format = params['export_format']
+        
+        queryset = Donation.objects.order_by('-created_at', '-id')
+        if params.get('from'):
+            queryset = queryset.filter(created_at__gte=params['from'])
+        if params.get('to'):
+            queryset = queryset.filter(created_at__lt=params['to'])
+        if params.get('status'):
+            queryset = queryset.filter(status__in=params['status'])
+        
+        # Log admin export (for audit)
+        from apps.core.models import log_admin_action
+        log_admin_action(
+            admin_user=request.user,
+            action='view',
+            resource_type='Donation',
+            resource_id='export',
+            details={
+                'format': export_format,
+                'filters': {
+                    field: request.query_params[field]
+                    for field in ('from', 'to', 'status')
+                    if field in request.query_params
+                }
+            }
+        )
+        
+        response = StreamingHttpResponse(
+            stream_export(queryset, export_format),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        filename = f"donations-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -5,3 +5,6 @@ class LessonsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.lessons'
     verbose_name = 'Lessons'
+    
+    def ready(self):
+        from . import payloads, signals  # noqa: F401
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lessons', '0002_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lesson',
+            name='difficulty',
+            field=models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], help_text='Difficulty level', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='lesson',
+            name='category',
+            field=models.CharField(choices=[('privacy', 'Privacy'), ('safety', 'Safety'), ('security', 'Security'), ('awareness', 'Awareness')], help_text='Lesson category', max_length=20),
+        ),
+    ]
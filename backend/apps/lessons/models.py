@@ -2,6 +2,8 @@
 Models for digital literacy lessons.
 """
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from apps.core.models import TimeStampedModel
 
@@ -21,6 +23,7 @@ class Lesson(TimeStampedModel):
         quiz: Quiz questions and answers (JSON)
         thumbnail_url: URL to lesson thumbnail image
         published: Whether lesson is visible to public
+        search_vector: Weighted full-text search vector, refreshed on save
     """
     CATEGORY_CHOICES = [
         ('privacy', 'Privacy'),
@@ -45,7 +48,6 @@ class Lesson(TimeStampedModel):
     category = models.CharField(
         max_length=20,
         choices=CATEGORY_CHOICES,
-        db_index=True,
         help_text="Lesson category"
     )
     duration_minutes = models.PositiveIntegerField(
@@ -54,7 +56,6 @@ class Lesson(TimeStampedModel):
     difficulty = models.CharField(
         max_length=20,
         choices=DIFFICULTY_CHOICES,
-        db_index=True,
         help_text="Difficulty level"
     )
     content = models.JSONField(
@@ -74,6 +75,15 @@ class Lesson(TimeStampedModel):
         db_index=True,
         help_text="Whether lesson is published"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Weighted full-text search vector (PostgreSQL only)"
+    )
+    
+    # Full-text search weights (A highest) and the field snippets are taken from
+    SEARCH_WEIGHTS = {'title': 'A', 'description': 'C', 'content': 'D'}
+    SEARCH_HEADLINE_FIELD = 'description'
     
     class Meta:
         verbose_name = "Lesson"
@@ -83,6 +93,7 @@ class Lesson(TimeStampedModel):
         indexes = [
             models.Index(fields=['category', 'published']),
             models.Index(fields=['difficulty', 'published']),
+            GinIndex(fields=['search_vector'], name='lessons_search_vector_gin'),
         ]
     
     def __str__(self):
@@ -0,0 +1,26 @@
+"""
+Static payloads for lessons (see apps.core.payloads).
+"""
+
+from apps.core.payloads import register_payload
+from .models import Lesson
+
+
+@register_payload('lessons.categories')
+def lesson_categories():
+    return {
+        'categories': [
+            {'value': choice[0], 'label': choice[1]}
+            for choice in Lesson.CATEGORY_CHOICES
+        ]
+    }
+
+
+@register_payload('lessons.difficulties')
+def lesson_difficulties():
+    return {
+        'difficulties': [
+            {'value': choice[0], 'label': choice[1]}
+            for choice in Lesson.DIFFICULTY_CHOICES
+        ]
+    }
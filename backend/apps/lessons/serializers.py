@@ -3,10 +3,11 @@ Serializers for lessons API.
 """
 
 from rest_framework import serializers
+from apps.core.search import SearchResultSerializerMixin
 from .models import Lesson
 
 
-class LessonListSerializer(serializers.ModelSerializer):
+class LessonListSerializer(SearchResultSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for lesson list view.
     Returns summary information for browsing.
@@ -0,0 +1,27 @@
+"""
+Signal handlers invalidating cached lesson responses and keeping the
+lesson search vectors current.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.cache import bump_cache_version
+from apps.core.search import update_search_vector
+from .models import Lesson
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_lesson_cache(sender, using, **kwargs):
+    """
+    Drop cached lesson responses when any lesson changes, once the change is
+    committed: a request served before that would re-cache the old row.
+    """
+    transaction.on_commit(lambda: bump_cache_version('lessons'), using=using)
+
+
+@receiver(post_save, sender=Lesson)
+def update_lesson_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Recompute the lesson's full-text search vector."""
+    update_search_vector(instance, update_fields)
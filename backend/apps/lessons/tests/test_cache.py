@@ -0,0 +1,115 @@
+"""
+Tests for the cached lesson catalog and its invalidation.
+"""
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.core.cache import get_cache_version, get_catalog_cache
+from apps.lessons.models import Lesson
+
+
+@pytest.fixture(autouse=True)
+def catalog_cache(settings):
+    # Changes are read from the primary right after a bump; not under test here
+    settings.DATABASE_REPLICA_MAX_LAG = 0
+    yield get_catalog_cache()
+
+
+def create_lesson(title='Passwords', published=True):
+    return Lesson.objects.create(
+        title=title, description='Strong passwords', category='security',
+        duration_minutes=5, difficulty='beginner', content={'sections': []}, published=published,
+    )
+
+
+def titles(response):
+    return [lesson['title'] for lesson in response.data['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLessonCache:
+    """Responses are cached until a lesson change is committed."""
+
+    def test_repeated_list_served_from_cache(self):
+        create_lesson()
+        client = APIClient()
+        client.get('/api/lessons/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/lessons/')
+
+        assert response.status_code == 200
+        assert titles(response) == ['Passwords']
+        assert len(queries) == 0
+
+    def test_save_invalidates_list(self):
+        lesson = create_lesson()
+        client = APIClient()
+        client.get('/api/lessons/')
+
+        lesson.title = 'Two-factor authentication'
+        lesson.save()
+
+        assert titles(client.get('/api/lessons/')) == ['Two-factor authentication']
+
+    def test_unpublish_and_delete_invalidate(self):
+        lesson = create_lesson()
+        other = create_lesson('Phishing')
+        client = APIClient()
+        assert sorted(titles(client.get('/api/lessons/'))) == ['Passwords', 'Phishing']
+
+        lesson.published = False
+        lesson.save()
+        assert titles(client.get('/api/lessons/')) == ['Phishing']
+
+        other.delete()
+        assert titles(client.get('/api/lessons/')) == []
+        assert client.get(f'/api/lessons/{other.pk}/').status_code == 404
+
+    def test_version_bumped_only_on_commit(self):
+        lesson = create_lesson()
+        version = get_cache_version('lessons')
+
+        with transaction.atomic():
+            lesson.title = 'Changed'
+            lesson.save()
+            # A request now would still read the old row, so keep the old entries
+            assert get_cache_version('lessons') == version
+
+        assert get_cache_version('lessons') != version
+
+    def test_rolled_back_change_keeps_cache(self):
+        lesson = create_lesson()
+        version = get_cache_version('lessons')
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                lesson.save()
+                raise RuntimeError
+
+        assert get_cache_version('lessons') == version
+
+    def test_admin_and_public_cached_separately(self):
+        create_lesson('Draft', published=False)
+        admin = AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+        client = APIClient()
+        assert titles(client.get('/api/lessons/')) == []
+
+        client.force_authenticate(admin)
+
+        assert titles(client.get('/api/lessons/')) == ['Draft']
+
+    def test_cached_etag_answers_conditional_request(self):
+        create_lesson()
+        client = APIClient()
+        etag = client.get('/api/lessons/')['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/lessons/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert len(queries) == 0
@@ -5,9 +5,11 @@ Views for lessons API.
 from rest_framework import viewsets, filters
 from rest_framework.permissions import AllowAny
 from rest_framework.decorators import action
-from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.cache import CachedCatalogMixin
+from apps.core.payloads import payload_response
 from apps.core.permissions import IsAdminUser
+from apps.core.search import FullTextSearchFilter
 from .models import Lesson
 from .serializers import (
     LessonListSerializer,
@@ -16,7 +18,7 @@ from .serializers import (
 )
 
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     """
     ViewSet for lessons.
     
@@ -28,13 +30,21 @@ class LessonViewSet(viewsets.ModelViewSet):
     - create: POST /api/lessons/
     - update: PUT/PATCH /api/lessons/{id}/
     - destroy: DELETE /api/lessons/{id}/
+    
+    ?search= runs a ranked full-text search over title, description and
+    content; hits include search_rank and a highlighted search_headline.
+    
+    list/retrieve responses are cached until a lesson changes.
     """
     queryset = Lesson.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    cache_namespace = 'lessons'
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['category', 'difficulty', 'published']
-    search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'title', 'duration_minutes']
     ordering = ['-created_at']
+    # Cold cache; cached responses run no queries (see QueryBudgetMiddleware)
+    query_budgets = {'list': 6, 'retrieve': 3, 'categories': 1, 'difficulties': 1}
+    replica_actions = {'list', 'retrieve', 'categories', 'difficulties'}
     
     def get_permissions(self):
         """
@@ -74,11 +84,7 @@ class LessonViewSet(viewsets.ModelViewSet):
         Get list of available categories.
         GET /api/lessons/categories/
         """
-        categories = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in Lesson.CATEGORY_CHOICES
-        ]
-        return Response({'categories': categories})
+        return payload_response(request, 'lessons.categories')
     
     @action(detail=False, methods=['get'])
     def difficulties(self, request):
@@ -86,8 +92,4 @@ class LessonViewSet(viewsets.ModelViewSet):
         Get list of available difficulty levels.
         GET /api/lessons/difficulties/
         """
-        difficulties = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in Lesson.DIFFICULTY_CHOICES
-        ]
-        return Response({'difficulties': difficulties})
+        return payload_response(request, 'lessons.difficulties')
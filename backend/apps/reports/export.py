@@ -0,0 +1,112 @@
+"""
+Streaming export of decrypted reports (admin only).
+Reports are read in chunks, decrypted in batches with a shared cipher,
+and written out as NDJSON or CSV without building the whole export in memory.
+"""
+
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .models import Report
+
+EXPORT_FIELDS = [
+    'id',
+    'confirmation_code',
+    'incident_type',
+    'description',
+    'timestamp',
+    'location_free_text',
+    'evidence_links',
+    'consent_for_followup',
+    'redaction_applied',
+    'created_at',
+    'updated_at',
+]
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class _Echo:
+    """File-like object that returns what is written, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def _export_row(report):
+    """Flatten a report (with its description already decrypted) into export fields."""
+    return {
+        'id': report.id,
+        'confirmation_code': report.confirmation_code,
+        'incident_type': report.incident_type,
+        'description': report.get_decrypted_description(),
+        'timestamp': report.timestamp.isoformat() if report.timestamp else None,
+        'location_free_text': report.location_free_text,
+        'evidence_links': report.evidence_links,
+        'consent_for_followup': report.consent_for_followup,
+        'redaction_applied': report.redaction_applied,
+        'created_at': report.created_at.isoformat(),
+        'updated_at': report.updated_at.isoformat(),
+    }
+
+
+def iter_decrypted_reports(queryset, chunk_size=None, max_workers=None):
+    """
+    Yield export rows for every report in queryset.
+
+    Args:
+        queryset: Report queryset (filters and ordering already applied)
+        chunk_size: Rows fetched and decrypted per batch
+        max_workers: Decryption threads; 0 or 1 decrypts inline
+
+    Yields:
+        dict: One export row per report
+    """
+    chunk_size = chunk_size or settings.REPORT_EXPORT_CHUNK_SIZE
+    max_workers = settings.REPORT_EXPORT_MAX_WORKERS if max_workers is None else max_workers
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+
+    try:
+        chunk = []
+        for report in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(report)
+            if len(chunk) >= chunk_size:
+                for report in Report.decrypt_descriptions(chunk, executor=executor):
+                    yield _export_row(report)
+                chunk = []
+        for report in Report.decrypt_descriptions(chunk, executor=executor):
+            yield _export_row(report)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def stream_ndjson(rows):
+    """Yield one JSON document per line."""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def stream_csv(rows):
+    """Yield CSV lines, header first. List fields are JSON-encoded."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row['evidence_links'] = json.dumps(row['evidence_links'])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def stream_export(queryset, export_format):
+    """
+    Stream decrypted reports in the given format ('ndjson' or 'csv').
+    """
+    rows = iter_decrypted_reports(queryset)
+    if export_format == 'csv':
+        return stream_csv(rows)
+    return stream_ndjson(rows)
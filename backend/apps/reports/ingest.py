@@ -0,0 +1,152 @@
+"""
+Bulk ingestion of anonymous reports (e.g. paper intake forms collected
+offline by partner organizations).
+Items are validated and redacted with one shared serializer, encrypted with a
+single cipher and written with bulk_create in chunks, so a backlog of
+thousands of reports is one upload instead of thousands of round trips.
+"""
+
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from rest_framework.parsers import BaseParser
+
+from apps.core.codes import CODE_ATTEMPTS, unused_codes
+from apps.core.pii import pii_scan_budget
+from apps.core.rollups import apply_rollup_delta
+from apps.core.utils import encrypt_fields
+from .models import Report, ReportDailyRollup
+from .serializers import ReportCreateSerializer
+
+
+class InvalidLine:
+    """Placeholder for an NDJSON line that could not be decoded."""
+
+    def __init__(self, message):
+        self.message = message
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON into a list with one item per non-blank line.
+    Undecodable lines become InvalidLine items, so they are reported per item
+    instead of failing the whole upload.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return []
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        for line in iter(stream.readline, b''):
+            try:
+                line = line.decode(encoding).strip()
+                if line:
+                    items.append(json.loads(line))
+            except (UnicodeDecodeError, ValueError) as exc:
+                items.append(InvalidLine(f'Invalid JSON: {exc}'))
+        return items
+
+
+def validate_items(items):
+    """
+    Validate and redact report payloads one by one.
+    Each item gets its own PII scan budget (PII_SCAN_CPU_BUDGET).
+
+    Args:
+        items (list): Report payloads, as accepted by POST /api/reports/
+
+    Returns:
+        tuple: (valid, errors)
+            - valid: (index, validated_data, redaction_applied) per valid item
+            - errors: index -> serializer errors for invalid items
+    """
+    serializer = ReportCreateSerializer()
+    valid = []
+    errors = {}
+
+    for index, item in enumerate(items):
+        if isinstance(item, InvalidLine):
+            errors[index] = {'non_field_errors': [item.message]}
+            continue
+        try:
+            with pii_scan_budget(settings.PII_SCAN_CPU_BUDGET):
+                data = serializer.run_validation(item)
+        except serializers.ValidationError as exc:
+            errors[index] = serializers.as_serializer_error(exc)
+            continue
+        valid.append((index, data, item.get('description') != data['description']))
+
+    return valid, errors
+
+
+def _apply_rollups(reports):
+    """Add a batch of new reports to their daily rollups, one update per row."""
+    totals = {}
+    for report in reports:
+        keys, deltas = ReportDailyRollup.contribution(report)
+        totals.setdefault(tuple(sorted(keys.items())), Counter()).update(deltas)
+
+    for keys, deltas in totals.items():
+        apply_rollup_delta(ReportDailyRollup, dict(keys), dict(deltas))
+
+
+def _store_chunk(reports):
+    """
+    Insert a chunk of reports and their rollup contribution in one transaction.
+    bulk_create bypasses the rollup signals, so the deltas are applied here.
+    """
+    for attempt in range(CODE_ATTEMPTS):
+        for report, code in zip(reports, unused_codes(Report, "SH", len(reports))):
+            report.confirmation_code = code
+        try:
+            with transaction.atomic():
+                Report.objects.bulk_create(reports)
+                _apply_rollups(reports)
+            return
+        except IntegrityError:
+            # A confirmation code was taken since it was checked
+            if attempt == CODE_ATTEMPTS - 1:
+                raise
+
+
+def ingest_reports(items, chunk_size=None):
+    """
+    Validate, redact, encrypt and store many reports.
+
+    Args:
+        items (list): Report payloads, as accepted by POST /api/reports/
+        chunk_size (int): Reports per INSERT transaction
+            (default: REPORT_INGEST_CHUNK_SIZE)
+
+    Returns:
+        list: One result per item, in input order: either
+            {'index', 'confirmation_code', 'redaction_applied'} or {'index', 'errors'}
+    """
+    chunk_size = chunk_size or settings.REPORT_INGEST_CHUNK_SIZE
+    valid, errors = validate_items(items)
+    results = {index: {'index': index, 'errors': error} for index, error in errors.items()}
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        descriptions = encrypt_fields(data['description'] for _, data, _ in chunk)
+        reports = [
+            Report(**{**data, 'description': description, 'redaction_applied': redaction_applied})
+            for (_, data, redaction_applied), description in zip(chunk, descriptions)
+        ]
+        _store_chunk(reports)
+
+        for (index, _, _), report in zip(chunk, reports):
+            results[index] = {
+                'index': index,
+                'confirmation_code': report.confirmation_code,
+                'redaction_applied': report.redaction_applied,
+            }
+
+    return [results[index] for index in range(len(items))]
@@ -0,0 +1,84 @@
+"""
+Management command to re-encrypt report descriptions under the primary key.
+Usage: python manage.py rotate_encryption_key [--batch-size 500] [--start-id 0] [--dry-run]
+
+Run after moving the old ENCRYPTION_KEY into ENCRYPTION_PREVIOUS_KEYS and
+setting a new ENCRYPTION_KEY. Once it completes, the previous key can be removed.
+Refuses to run unless ENCRYPTION_KEY is a valid Fernet key, so a mistyped key
+never re-encrypts every report under a throwaway one.
+"""
+
+from cryptography.fernet import InvalidToken
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core.utils import _load_key, get_cipher
+from apps.reports.models import Report
+
+
+class Command(BaseCommand):
+    help = 'Re-encrypts Report.description rows in batches under the current primary key'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Rows re-encrypted per transaction'
+        )
+        parser.add_argument(
+            '--start-id', type=int, default=0,
+            help='Resume after this report id'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Decrypt and re-encrypt without saving'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = options['start_id']
+        dry_run = options['dry_run']
+        if _load_key(settings.ENCRYPTION_KEY, 'ENCRYPTION_KEY') is None:
+            raise CommandError("ENCRYPTION_KEY is not a valid Fernet key; nothing was rotated")
+        cipher = get_cipher()
+
+        rotated = 0
+        failed = 0
+
+        while True:
+            batch = list(
+                Report.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'description')[:batch_size]
+            )
+            if not batch:
+                break
+
+            to_update = []
+            for report in batch:
+                if not report.description:
+                    continue
+                try:
+                    token = cipher.rotate(report.description.encode('utf-8'))
+                except InvalidToken:
+                    # Never log content; the id is enough to investigate
+                    failed += 1
+                    self.stderr.write(f"Report {report.id}: cannot decrypt with any configured key")
+                    continue
+                report.description = token.decode('utf-8')
+                to_update.append(report)
+
+            if to_update and not dry_run:
+                # bulk_update skips save(), so descriptions are not re-encrypted
+                # twice and updated_at is left untouched
+                with transaction.atomic():
+                    Report.objects.bulk_update(to_update, ['description'])
+
+            rotated += len(to_update)
+            last_id = batch[-1].id
+            self.stdout.write(f"Processed up to id {last_id} ({rotated} rotated)")
+
+        verb = 'Would rotate' if dry_run else 'Rotated'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {rotated} report descriptions"))
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} descriptions could not be decrypted"))
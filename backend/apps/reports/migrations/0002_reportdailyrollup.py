@@ -0,0 +1,77 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="Timestamp when record was created"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when record was last updated",
+                    ),
+                ),
+                ("date", models.DateField(help_text="Day the reports were created")),
+                (
+                    "incident_type",
+                    models.CharField(
+                        choices=[
+                            ("harassment", "Harassment"),
+                            ("stalking", "Stalking"),
+                            ("impersonation", "Impersonation"),
+                            ("threats", "Threats"),
+                            ("other", "Other"),
+                        ],
+                        help_text="Type of incident",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "report_count",
+                    models.IntegerField(default=0, help_text="Number of reports"),
+                ),
+                (
+                    "redacted_count",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Number of reports with PII redaction applied",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Report Daily Rollup",
+                "verbose_name_plural": "Report Daily Rollups",
+                "db_table": "report_daily_rollups",
+                "ordering": ["-date", "incident_type"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="reportdailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("date", "incident_type"), name="unique_report_rollup_day_type"
+            ),
+        ),
+    ]
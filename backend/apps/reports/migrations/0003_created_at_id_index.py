@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0002_reportdailyrollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="reports_created_0a0945_idx"
+            ),
+        ),
+    ]
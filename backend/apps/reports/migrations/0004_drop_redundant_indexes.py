@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_created_at_id_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='report',
+            name='incident_type',
+            field=models.CharField(choices=[('harassment', 'Harassment'), ('stalking', 'Stalking'), ('impersonation', 'Impersonation'), ('threats', 'Threats'), ('other', 'Other')], help_text='Type of incident', max_length=20),
+        ),
+        migrations.RemoveIndex(
+            model_name='report',
+            name='reports_confirm_f3e6ad_idx',
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='confirmation_code',
+            field=models.CharField(help_text='Non-identifying confirmation code', max_length=20, unique=True),
+        ),
+    ]
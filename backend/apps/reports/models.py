@@ -5,8 +5,9 @@ PRIVACY-FIRST: NO PII collected or stored.
 
 from django.db import models
 from django.utils import timezone
+from apps.core.codes import save_with_unique_code
 from apps.core.models import TimeStampedModel
-from apps.core.utils import encrypt_field, generate_confirmation_code
+from apps.core.utils import encrypt_field
 import uuid
 
 
@@ -43,13 +44,11 @@ class Report(TimeStampedModel):
     confirmation_code = models.CharField(
         max_length=20,
         unique=True,
-        db_index=True,
         help_text="Non-identifying confirmation code"
     )
     incident_type = models.CharField(
         max_length=20,
         choices=INCIDENT_TYPE_CHOICES,
-        db_index=True,
         help_text="Type of incident"
     )
     description = models.TextField(
@@ -79,42 +78,133 @@ class Report(TimeStampedModel):
     
     # NO fields for: name, email, phone, IP, user_id
     
+    DECRYPTION_FAILED = "[Unable to decrypt]"
+    
     class Meta:
         verbose_name = "Report"
         verbose_name_plural = "Reports"
         db_table = "reports"
         ordering = ['-created_at']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['incident_type', '-created_at']),
-            models.Index(fields=['confirmation_code']),
         ]
     
     def save(self, *args, **kwargs):
         """
         Override save to:
-        1. Generate confirmation code if not set
+        1. Generate a unique confirmation code if not set
         2. Encrypt description before saving
         """
-        if not self.confirmation_code:
-            self.confirmation_code = generate_confirmation_code(prefix="SH")
-        
         # Encrypt description if not already encrypted
         # (Check if it looks like encrypted data)
         if self.description and not self.description.startswith('gAAAAA'):
             self.description = encrypt_field(self.description)
         
-        super().save(*args, **kwargs)
+        save_with_unique_code(self, "SH", lambda: super(Report, self).save(*args, **kwargs))
     
     def get_decrypted_description(self):
         """
         Get decrypted description.
         Only for admin viewing - never expose in public API.
+        Uses the value cached by decrypt_descriptions() when available.
         """
+        cached = getattr(self, '_decrypted_description', None)
+        if cached is not None:
+            return cached
+        
         from apps.core.utils import decrypt_field
         try:
             return decrypt_field(self.description)
         except Exception:
-            return "[Unable to decrypt]"
+            return self.DECRYPTION_FAILED
+    
+    @classmethod
+    def decrypt_descriptions(cls, reports, executor=None):
+        """
+        Decrypt the descriptions of many reports with a single cipher.
+        Results are cached on each instance for get_decrypted_description().
+        
+        Args:
+            reports: Queryset or iterable of reports
+            executor: Optional thread pool for large batches
+        
+        Returns:
+            list: The reports, in input order
+        """
+        from apps.core.utils import decrypt_fields
+        reports = list(reports)
+        decrypted = decrypt_fields(
+            [report.description for report in reports],
+            executor=executor
+        )
+        for report, value in zip(reports, decrypted):
+            report._decrypted_description = cls.DECRYPTION_FAILED if value is None else value
+        return reports
     
     def __str__(self):
         return f"Report {self.confirmation_code} ({self.get_incident_type_display()})"
+
+
+class ReportDailyRollup(TimeStampedModel):
+    """
+    Pre-aggregated daily report counts per incident type.
+    Maintained incrementally from Report saves and deletes (see signals.py);
+    rebuild with `python manage.py backfill_rollups`.
+    
+    Fields:
+        date: Day the reports were created (current timezone)
+        incident_type: Type of incident
+        report_count: Number of reports
+        redacted_count: Number of reports with PII redaction applied
+    """
+    date = models.DateField(
+        help_text="Day the reports were created"
+    )
+    incident_type = models.CharField(
+        max_length=20,
+        choices=Report.INCIDENT_TYPE_CHOICES,
+        help_text="Type of incident"
+    )
+    report_count = models.IntegerField(
+        default=0,
+        help_text="Number of reports"
+    )
+    redacted_count = models.IntegerField(
+        default=0,
+        help_text="Number of reports with PII redaction applied"
+    )
+    
+    class Meta:
+        verbose_name = "Report Daily Rollup"
+        verbose_name_plural = "Report Daily Rollups"
+        db_table = "report_daily_rollups"
+        ordering = ['-date', 'incident_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'incident_type'],
+                name='unique_report_rollup_day_type'
+            ),
+        ]
+    
+    @staticmethod
+    def contribution(report):
+        """
+        Get the rollup row keys and counter deltas a single report contributes.
+        
+        Returns:
+            tuple: (keys, deltas)
+        """
+        from apps.core.rollups import rollup_date
+        keys = {
+            'date': rollup_date(report.created_at),
+            'incident_type': report.incident_type,
+        }
+        deltas = {
+            'report_count': 1,
+            'redacted_count': 1 if report.redaction_applied else 0,
+        }
+        return keys, deltas
+    
+    def __str__(self):
+        return f"{self.date} {self.incident_type}: {self.report_count}"
@@ -0,0 +1,16 @@
+"""
+Static payloads for reports (see apps.core.payloads).
+"""
+
+from apps.core.payloads import register_payload
+from .models import Report
+
+
+@register_payload('reports.incident_types')
+def incident_types():
+    return {
+        'incident_types': [
+            {'value': choice[0], 'label': choice[1]}
+            for choice in Report.INCIDENT_TYPE_CHOICES
+        ]
+    }
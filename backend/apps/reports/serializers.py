@@ -3,10 +3,16 @@ Serializers for anonymous reports.
 PRIVACY-FIRST: NO PII collected or stored.
 """
 
+import logging
+
+from django.db import models
 from rest_framework import serializers
+from apps.core.pii import PIIScanBudgetExceeded
 from .models import Report
 from .utils import process_report_text, validate_no_pii
 
+logger = logging.getLogger(__name__)
+
 
 class ReportCreateSerializer(serializers.ModelSerializer):
     """
@@ -45,7 +51,14 @@ class ReportCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Description is too long (max 5000 characters)")
         
         # Process for PII - will redact if found
-        redacted_text, redaction_applied = process_report_text(value)
+        try:
+            redacted_text, redaction_applied = process_report_text(value)
+        except PIIScanBudgetExceeded:
+            # Never store text that could not be fully scanned
+            logger.warning("Report description rejected: PII scan exceeded its CPU budget")
+            raise serializers.ValidationError(
+                "Description could not be processed. Please shorten it and try again."
+            )
         
         # Store the redacted version
         return redacted_text
@@ -127,6 +140,17 @@ class ReportListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class ReportDetailListSerializer(serializers.ListSerializer):
+    """
+    List serializer that decrypts all descriptions in one batch
+    instead of one cipher call per row.
+    """
+    
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        return super().to_representation(Report.decrypt_descriptions(iterable))
+
+
 class ReportDetailSerializer(serializers.ModelSerializer):
     """
     Serializer for report details (admin only).
@@ -150,6 +174,7 @@ class ReportDetailSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = fields
+        list_serializer_class = ReportDetailListSerializer
     
     def get_decrypted_description(self, obj):
         """
@@ -159,12 +184,46 @@ class ReportDetailSerializer(serializers.ModelSerializer):
         return obj.get_decrypted_description()
 
 
+class ReportStatsQuerySerializer(serializers.Serializer):
+    """
+    Query parameters for report statistics.
+    Range is [from, to); both default to a window ending now.
+    """
+    GRANULARITY_CHOICES = ['day', 'week', 'month']
+    MAX_BUCKETS = 1000
+    
+    granularity = serializers.ChoiceField(choices=GRANULARITY_CHOICES, default='month')
+    
+    def get_fields(self):
+        # 'from' is a Python keyword, so these are added here rather than declared
+        fields = super().get_fields()
+        fields['from'] = serializers.DateTimeField(required=False)
+        fields['to'] = serializers.DateTimeField(required=False)
+        return fields
+    
+    def validate(self, data):
+        """Ensure the range is ordered."""
+        if data.get('from') and data.get('to') and data['from'] >= data['to']:
+            raise serializers.ValidationError({'from': "'from' must be before 'to'"})
+        return data
+
+
 class ReportStatsSerializer(serializers.Serializer):
     """
     Serializer for aggregated report statistics (admin only).
     NO individual report data - only counts and trends.
     """
+    granularity = serializers.CharField()
     total_reports = serializers.IntegerField()
     reports_by_type = serializers.DictField()
-    reports_by_month = serializers.DictField()
+    reports_by_period = serializers.DictField()
+    reports_by_period_and_type = serializers.DictField()
+    # Same as reports_by_period, for monthly granularity only
+    reports_by_month = serializers.DictField(required=False)
     redaction_rate = serializers.FloatField()
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateTimeField()
+        fields['to'] = serializers.DateTimeField()
+        return fields
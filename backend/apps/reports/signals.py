@@ -0,0 +1,42 @@
+"""
+Signal handlers keeping ReportDailyRollup in sync with Report writes.
+Bulk operations (queryset.update, bulk_create) bypass these; run
+`python manage.py backfill_rollups` after them. Bulk ingestion
+(ingest.py) applies its rollup deltas itself.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.rollups import apply_rollup_change
+from .models import Report, ReportDailyRollup
+
+
+@receiver(pre_save, sender=Report)
+def capture_previous_report(sender, instance, **kwargs):
+    """Remember the stored version of an updated report so its old contribution can be moved."""
+    instance._rollup_previous = None
+    if not instance._state.adding and instance.pk:
+        instance._rollup_previous = Report.objects.filter(pk=instance.pk).only(
+            'created_at', 'incident_type', 'redaction_applied'
+        ).first()
+
+
+@receiver(post_save, sender=Report)
+def update_report_rollup(sender, instance, created, **kwargs):
+    """Add a new report to its daily rollup, or move an updated one."""
+    previous = getattr(instance, '_rollup_previous', None)
+    if created:
+        apply_rollup_change(ReportDailyRollup, None, ReportDailyRollup.contribution(instance))
+    elif previous is not None:
+        apply_rollup_change(
+            ReportDailyRollup,
+            ReportDailyRollup.contribution(previous),
+            ReportDailyRollup.contribution(instance)
+        )
+
+
+@receiver(post_delete, sender=Report)
+def remove_report_from_rollup(sender, instance, **kwargs):
+    """Remove a deleted report from its daily rollup."""
+    apply_rollup_change(ReportDailyRollup, ReportDailyRollup.contribution(instance), None)
@@ -0,0 +1,225 @@
+"""
+Tests for bulk report ingestion (POST /api/reports/bulk/).
+"""
+
+import json
+
+import pytest
+from django.db import IntegrityError
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.core import codes
+from apps.core.rollups import rollup_date
+from apps.reports import ingest
+from apps.reports.ingest import InvalidLine, NDJSONParser, ingest_reports
+from apps.reports.models import Report, ReportDailyRollup
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+def report(description='Harassing messages every night', incident_type='harassment'):
+    return {
+        'incident_type': incident_type,
+        'description': description,
+        'timestamp': '2026-04-01T21:30:00Z',
+    }
+
+
+def post_ndjson(client, lines):
+    return client.generic(
+        'POST', '/api/reports/bulk/', '\n'.join(lines).encode(), content_type='application/x-ndjson'
+    )
+
+
+def rollup(incident_type):
+    return ReportDailyRollup.objects.get(date=rollup_date(timezone.now()), incident_type=incident_type)
+
+
+class _Stream:
+    """Request-stream stand-in with readline()."""
+
+    def __init__(self, data):
+        self.lines = data.splitlines(keepends=True)
+
+    def readline(self):
+        return self.lines.pop(0) if self.lines else b''
+
+
+class TestNDJSONParser:
+    """One item per non-blank line."""
+
+    def test_lines_parsed_and_blank_lines_skipped(self):
+        stream = _Stream(b'{"a": 1}\n\n  \n[2]\n"x"\n')
+
+        assert NDJSONParser().parse(stream) == [{'a': 1}, [2], 'x']
+
+    def test_undecodable_lines_become_invalid_items(self):
+        stream = _Stream(b'{"a": 1}\n{"a": \n\xff\xfe\n')
+
+        items = NDJSONParser().parse(stream)
+
+        assert items[0] == {'a': 1}
+        assert [type(item) for item in items[1:]] == [InvalidLine, InvalidLine]
+        assert items[1].message.startswith('Invalid JSON:')
+
+
+@pytest.mark.django_db
+class TestBulkEndpoint:
+    """Statuses and per-item results."""
+
+    def test_all_created(self, admin_client):
+        response = admin_client.post(
+            '/api/reports/bulk/', [report(), report(incident_type='stalking')], format='json'
+        )
+
+        assert response.status_code == 201
+        assert response.data['created'] == 2
+        assert response.data['failed'] == 0
+        results = response.data['results']
+        assert [result['index'] for result in results] == [0, 1]
+        stored = Report.objects.get(confirmation_code=results[0]['confirmation_code'])
+        assert stored.get_decrypted_description() == 'Harassing messages every night'
+        assert stored.description != 'Harassing messages every night'
+
+    def test_pii_redacted_like_single_reports(self, admin_client):
+        response = admin_client.post(
+            '/api/reports/bulk/', [report('He emails me at stalker@example.com daily')], format='json'
+        )
+
+        result = response.data['results'][0]
+        assert result['redaction_applied'] is True
+        stored = Report.objects.get(confirmation_code=result['confirmation_code'])
+        assert 'stalker@example.com' not in stored.get_decrypted_description()
+
+    def test_some_invalid_is_multi_status(self, admin_client):
+        items = [report(), report(description=''), 'not a report', report(incident_type='unknown')]
+
+        response = admin_client.post('/api/reports/bulk/', items, format='json')
+
+        assert response.status_code == 207
+        assert response.data['created'] == 1
+        assert response.data['failed'] == 3
+        results = response.data['results']
+        assert 'confirmation_code' in results[0]
+        assert 'description' in results[1]['errors']
+        assert 'non_field_errors' in results[2]['errors']
+        assert 'incident_type' in results[3]['errors']
+        assert Report.objects.count() == 1
+
+    def test_none_valid_is_bad_request(self, admin_client):
+        response = admin_client.post('/api/reports/bulk/', [42, report(description='')], format='json')
+
+        assert response.status_code == 400
+        assert response.data['created'] == 0
+        assert response.data['failed'] == 2
+        assert not Report.objects.exists()
+
+    @pytest.mark.parametrize('body', [[], {'incident_type': 'harassment'}, 'reports'])
+    def test_not_a_non_empty_array_rejected(self, admin_client, body):
+        response = admin_client.post('/api/reports/bulk/', body, format='json')
+
+        assert response.status_code == 400
+        assert 'error' in response.data
+
+    def test_max_items_enforced(self, admin_client, settings):
+        settings.REPORT_INGEST_MAX_ITEMS = 2
+
+        response = admin_client.post('/api/reports/bulk/', [report()] * 3, format='json')
+
+        assert response.status_code == 400
+        assert response.data == {'error': 'At most 2 reports per upload'}
+        assert not Report.objects.exists()
+
+    def test_ndjson_upload(self, admin_client):
+        response = post_ndjson(admin_client, [
+            json.dumps(report()),
+            '',
+            '{"incident_type": "stalking", ',
+            json.dumps(report(incident_type='stalking')),
+        ])
+
+        assert response.status_code == 207
+        results = response.data['results']
+        assert len(results) == 3
+        assert 'confirmation_code' in results[0]
+        assert results[1]['errors']['non_field_errors'][0].startswith('Invalid JSON:')
+        assert 'confirmation_code' in results[2]
+
+    def test_admin_only(self, db):
+        response = APIClient().post('/api/reports/bulk/', [report()], format='json')
+
+        assert response.status_code in (401, 403)
+        assert not Report.objects.exists()
+
+
+@pytest.mark.django_db
+class TestIngestReports:
+    """Chunked storage, rollups and code collisions."""
+
+    def test_rollup_deltas_applied_per_day_and_type(self):
+        ReportDailyRollup.objects.create(
+            date=rollup_date(timezone.now()), incident_type='harassment', report_count=3, redacted_count=1
+        )
+        items = [
+            report(),
+            report('Call me on 555-123-4567 he said'),
+            report(incident_type='stalking'),
+        ]
+
+        results = ingest_reports(items, chunk_size=2)
+
+        assert all('confirmation_code' in result for result in results)
+        harassment = rollup('harassment')
+        assert harassment.report_count == 5
+        assert harassment.redacted_count == 2
+        stalking = rollup('stalking')
+        assert (stalking.report_count, stalking.redacted_count) == (1, 0)
+
+    def test_results_keep_input_order_across_chunks(self):
+        items = [report(), 'bad', report(), report(), 'bad', report()]
+
+        results = ingest_reports(items, chunk_size=2)
+
+        assert [result['index'] for result in results] == list(range(6))
+        assert ['confirmation_code' in result for result in results] == [
+            True, False, True, True, False, True
+        ]
+        assert Report.objects.count() == 4
+
+    def test_code_collision_retried(self, monkeypatch):
+        taken = ingest_reports([report()])[0]['confirmation_code']
+        calls = []
+
+        def colliding_codes(model, prefix, count):
+            calls.append(count)
+            if len(calls) == 1:
+                return [taken] * count
+            return codes.unused_codes(model, prefix, count)
+
+        monkeypatch.setattr(ingest, 'unused_codes', colliding_codes)
+
+        result = ingest_reports([report(incident_type='stalking')])[0]
+
+        assert calls == [1, 1]
+        assert result['confirmation_code'] != taken
+        assert Report.objects.count() == 2
+        # The failed attempt's rollup update was rolled back with its insert
+        assert rollup('stalking').report_count == 1
+
+    def test_code_collision_raised_after_attempts(self, monkeypatch):
+        taken = ingest_reports([report()])[0]['confirmation_code']
+        monkeypatch.setattr(ingest, 'unused_codes', lambda model, prefix, count: [taken] * count)
+
+        with pytest.raises(IntegrityError):
+            ingest_reports([report(incident_type='stalking')])
+
+        assert Report.objects.count() == 1
+        assert not ReportDailyRollup.objects.filter(incident_type='stalking').exists()
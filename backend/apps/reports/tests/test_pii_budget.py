@@ -0,0 +1,44 @@
+"""
+Tests for the PII scan CPU budget on public report submission.
+"""
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.reports.models import Report
+
+
+def report_payload(description):
+    return {
+        'incident_type': 'harassment',
+        'description': description,
+        'timestamp': timezone.now().isoformat(),
+    }
+
+
+# Committed like real requests, so the view's query budget sees no test savepoints
+@pytest.mark.django_db(transaction=True)
+class TestReportPIIBudget:
+    """Descriptions that cannot be scanned within PII_SCAN_CPU_BUDGET are rejected."""
+
+    def test_description_redacted_within_budget(self):
+        response = APIClient().post(
+            '/api/reports/', report_payload('my name is Jane Smitha@b.com'), format='json'
+        )
+
+        assert response.status_code == 201
+        assert response.data['redaction_applied'] is True
+        report = Report.objects.get(confirmation_code=response.data['confirmation_code'])
+        assert report.get_decrypted_description() == 'my name is [NAME_REDACTED]'
+
+    def test_description_rejected_over_budget(self, settings):
+        settings.PII_SCAN_CPU_BUDGET = 0
+
+        response = APIClient().post(
+            '/api/reports/', report_payload('+1-555-123-45 ' * 350), format='json'
+        )
+
+        assert response.status_code == 400
+        assert 'description' in response.data['error']['fields']
+        assert Report.objects.count() == 0
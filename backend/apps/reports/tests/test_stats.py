@@ -0,0 +1,82 @@
+"""
+Tests for GET /api/reports/stats/.
+"""
+
+from datetime import date
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.reports.models import ReportDailyRollup
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = AdminUser.objects.create_user(username='admin', password='secret-pass-1', role='admin')
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.fixture
+def rollups(db):
+    """Daily rollup rows: two this year, one long before the default window."""
+    for day, incident_type, reports, redacted in [
+        (date(2026, 3, 5), 'harassment', 3, 1),
+        (date(2026, 4, 20), 'stalking', 2, 0),
+        (date(2020, 1, 10), 'threats', 5, 5),
+    ]:
+        ReportDailyRollup.objects.create(
+            date=day, incident_type=incident_type, report_count=reports, redacted_count=redacted
+        )
+
+
+@pytest.mark.django_db
+class TestReportStats:
+    """Buckets, range scoping and the monthly field kept for older clients."""
+
+    def test_default_keeps_reports_by_month_and_all_time_totals(self, admin_client, rollups):
+        response = admin_client.get('/api/reports/stats/?to=2026-05-01')
+
+        assert response.status_code == 200
+        data = response.data
+        assert data['granularity'] == 'month'
+        assert list(data['reports_by_month']) == [
+            '2025-05', '2025-06', '2025-07', '2025-08', '2025-09', '2025-10',
+            '2025-11', '2025-12', '2026-01', '2026-02', '2026-03', '2026-04',
+        ]
+        assert data['reports_by_month'] == data['reports_by_period']
+        assert data['reports_by_month']['2026-03'] == 3
+        assert data['reports_by_month']['2026-04'] == 2
+        # Without 'from', totals include reports before the buckets
+        assert data['total_reports'] == 10
+        assert data['reports_by_type']['threats'] == 5
+        assert data['redaction_rate'] == 60.0
+
+    def test_totals_scoped_to_given_range(self, admin_client, rollups):
+        response = admin_client.get('/api/reports/stats/?from=2026-01-01&to=2026-05-01')
+
+        data = response.data
+        assert list(data['reports_by_period']) == ['2026-01', '2026-02', '2026-03', '2026-04']
+        assert data['total_reports'] == 5
+        assert data['reports_by_type'] == {
+            'harassment': 3, 'stalking': 2, 'impersonation': 0, 'threats': 0, 'other': 0,
+        }
+        assert data['redaction_rate'] == 20.0
+
+    def test_day_granularity_has_no_monthly_field(self, admin_client, rollups):
+        response = admin_client.get('/api/reports/stats/?granularity=day&from=2026-03-04&to=2026-03-07')
+
+        data = response.data
+        assert 'reports_by_month' not in data
+        assert data['reports_by_period'] == {'2026-03-04': 0, '2026-03-05': 3, '2026-03-06': 0}
+        assert data['reports_by_period_and_type']['2026-03-05']['harassment'] == 3
+
+    def test_unordered_range_rejected(self, admin_client):
+        response = admin_client.get('/api/reports/stats/?from=2026-05-01&to=2026-01-01')
+
+        assert response.status_code == 400
+
+    def test_requires_admin(self, rollups):
+        assert APIClient().get('/api/reports/stats/').status_code == 401
@@ -6,12 +6,15 @@ Protects user privacy by detecting and removing personally identifiable informat
 import re
 import logging
 
+from apps.core.pii import PIIRule, PIIScanner
+
 logger = logging.getLogger(__name__)
 
 # PII detection patterns
+# Quantifiers are bounded (see apps.core.pii) so scanning stays linear-time
 PII_PATTERNS = {
     'email': re.compile(
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+        r'\b[A-Za-z0-9._%+-]{1,64}@(?:[A-Za-z0-9-]{1,63}\.){1,8}[A-Za-z]{2,24}\b',
         re.IGNORECASE
     ),
     'phone': re.compile(
@@ -25,12 +28,28 @@ PII_PATTERNS = {
     ),
     # Common name patterns (basic detection)
     'full_name': re.compile(
-        r'\b(my name is|i am|i\'m|called)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)\b',
+        r'\b(my name is|i am|i\'m|called)\s{1,3}([A-Z][a-z]{1,40}\s{1,3}[A-Z][a-z]{1,40})\b',
         re.IGNORECASE
     ),
 }
 
 
+# Redaction for each PII type; full names keep the introducing phrase
+PII_REPLACEMENTS = {
+    'email': '[EMAIL_REDACTED]',
+    'phone': '[PHONE_REDACTED]',
+    'ssn': '[SSN_REDACTED]',
+    'credit_card': '[CREDIT_CARD_REDACTED]',
+    'full_name': r'\1 [NAME_REDACTED]',
+}
+
+# One scanner for all patterns; overlapping matches are redacted together
+PII_SCANNER = PIIScanner([
+    PIIRule(pii_type, pattern, PII_REPLACEMENTS[pii_type])
+    for pii_type, pattern in PII_PATTERNS.items()
+])
+
+
 def detect_pii(text):
     """
     Detect PII patterns in text.
@@ -41,17 +60,7 @@ def detect_pii(text):
     Returns:
         list: List of PII types detected (e.g., ['email', 'phone'])
     """
-    if not text:
-        return []
-    
-    detected = []
-    
-    for pii_type, pattern in PII_PATTERNS.items():
-        if pattern.search(text):
-            detected.append(pii_type)
-            logger.warning(f"PII detected in report: {pii_type}")
-    
-    return detected
+    return PII_SCANNER.detect(text)
 
 
 def redact_pii(text):
@@ -64,26 +73,13 @@ def redact_pii(text):
     Returns:
         str: Text with PII redacted
     """
-    if not text:
-        return text
-    
-    redacted = text
-    
-    # Redact each PII type
-    for pii_type, pattern in PII_PATTERNS.items():
-        if pii_type == 'full_name':
-            # Special handling for name patterns - redact the captured name
-            redacted = pattern.sub(r'\1 [NAME_REDACTED]', redacted)
-        else:
-            redacted = pattern.sub(f'[{pii_type.upper()}_REDACTED]', redacted)
-    
-    return redacted
+    return PII_SCANNER.redact(text)
 
 
 def process_report_text(text):
     """
     Process report text for PII.
-    Detects PII and returns redacted text with flag.
+    Detects and redacts PII in one scan and returns redacted text with flag.
     
     Args:
         text (str): Report text to process
@@ -96,18 +92,13 @@ def process_report_text(text):
     if not text:
         return text, False
     
-    # Detect PII
-    pii_detected = detect_pii(text)
+    redacted_text, pii_detected = PII_SCANNER.scan(text)
     
     if pii_detected:
         # Log detection (without revealing content)
         logger.warning(
             f"PII detected in report submission. Types: {', '.join(pii_detected)}"
         )
-        
-        # Redact PII
-        redacted_text = redact_pii(text)
-        
         return redacted_text, True
     
     return text, False
@@ -5,24 +5,56 @@ PRIVACY-FIRST: NO IP logging, NO user tracking.
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from apps.core.payloads import payload_response
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsAdminUser
-from .models import Report
+from apps.core.pii import pii_scan_budget
+from .models import Report, ReportDailyRollup
+from .export import EXPORT_FORMATS, stream_export
+from .ingest import NDJSONParser, ingest_reports
 from .serializers import (
     ReportCreateSerializer,
     ReportListSerializer,
     ReportDetailSerializer,
+    ReportStatsQuerySerializer,
     ReportStatsSerializer
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
+# granularity -> (trunc function, bucket step, period key format, default bucket count)
+STATS_GRANULARITIES = {
+    'day': (TruncDay, relativedelta(days=1), '%Y-%m-%d', 30),
+    'week': (TruncWeek, relativedelta(weeks=1), '%Y-%m-%d', 12),
+    'month': (TruncMonth, relativedelta(months=1), '%Y-%m', 12),
+}
+
+
+def _bucket_start(value, granularity):
+    """
+    Truncate a datetime to the start of its day, ISO week or month
+    in the current timezone, matching the database Trunc functions.
+    """
+    value = timezone.localtime(value).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == 'week':
+        value -= relativedelta(days=value.weekday())
+    elif granularity == 'month':
+        value = value.replace(day=1)
+    return value
+
 
 class ReportViewSet(viewsets.ModelViewSet):
     """
@@ -32,9 +64,11 @@ class ReportViewSet(viewsets.ModelViewSet):
     - create: POST /api/reports/
     
     ADMIN endpoints (JWT required):
-    - list: GET /api/reports/
+    - list: GET /api/reports/ (cursor paginated, ?count=estimate)
     - retrieve: GET /api/reports/{id}/
     - stats: GET /api/reports/stats/
+    - export: GET /api/reports/export/?export_format=ndjson|csv
+    - bulk: POST /api/reports/bulk/ (JSON array or NDJSON)
     
     PRIVACY PROTECTION:
     - NO IP logging
@@ -43,8 +77,16 @@ class ReportViewSet(viewsets.ModelViewSet):
     - Rate limited to prevent abuse
     """
     queryset = Report.objects.all()
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['incident_type', 'redaction_applied']
+    query_budgets = {
+        'list': 3, 'retrieve': 2, 'create': 5, 'stats': 2,
+        'export': 2, 'incident_types': 1,
+        # Exempt: chunked inserts repeat once per chunk of the upload
+        'bulk': None,
+    }
+    replica_actions = {'stats', 'export'}
     
     def get_permissions(self):
         """
@@ -77,9 +119,11 @@ class ReportViewSet(viewsets.ModelViewSet):
         - NO session cookies set
         - Automatic PII detection and redaction
         - Rate limited (configured in middleware)
+        - PII scanning limited to PII_SCAN_CPU_BUDGET seconds of CPU
         """
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with pii_scan_budget(settings.PII_SCAN_CPU_BUDGET):
+            serializer.is_valid(raise_exception=True)
         
         # Create report
         report = serializer.save()
@@ -145,57 +189,206 @@ class ReportViewSet(viewsets.ModelViewSet):
         """
         Get aggregated report statistics (admin only).
         Returns ONLY aggregated data, NO individual reports.
+        Computed with a single aggregate query over the daily rollup table.
+        
+        GET /api/reports/stats/?from=2025-01-01&to=2026-01-01&granularity=month
         
-        GET /api/reports/stats/
+        Query params:
+        - granularity: day, week or month (default: month)
+        - from / to: ISO dates or datetimes, range is [from, to)
+          (default: the last 30 days, 12 weeks or 12 months)
+        
+        reports_by_period (and reports_by_month for the default monthly
+        granularity) covers the range. total_reports, reports_by_type and
+        redaction_rate cover the range when 'from' is given, and otherwise
+        every report before 'to', as they did before the range parameters.
         """
-        # Total reports
-        total_reports = Report.objects.count()
+        query = ReportStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        granularity = query.validated_data['granularity']
+        trunc, step, key_format, default_buckets = STATS_GRANULARITIES[granularity]
+        
+        end = query.validated_data.get('to') or timezone.now()
+        range_given = 'from' in query.validated_data
+        # The default window ends with the bucket holding the last instant before 'to'
+        start = query.validated_data.get('from') or (
+            _bucket_start(end - timedelta(microseconds=1), granularity) - step * (default_buckets - 1)
+        )
+        
+        # Bucket keys for the whole range, so empty periods report zero
+        period_keys = []
+        bucket = _bucket_start(start, granularity)
+        while bucket < end:
+            period_keys.append(bucket.strftime(key_format))
+            if len(period_keys) > ReportStatsQuerySerializer.MAX_BUCKETS:
+                raise ValidationError({'from': f'Range is too large for {granularity} granularity'})
+            bucket += step
+        
+        incident_types = [choice[0] for choice in Report.INCIDENT_TYPE_CHOICES]
+        type_counts = {
+            f'type_{incident_type}': Sum('report_count', filter=Q(incident_type=incident_type))
+            for incident_type in incident_types
+        }
         
-        # Reports by type
-        reports_by_type = dict(
-            Report.objects.values('incident_type')
-            .annotate(count=Count('id'))
-            .values_list('incident_type', 'count')
+        # Read the daily rollup, so cost depends on the range, not the table size.
+        # The range is resolved to whole days in the current timezone; without
+        # 'from' the totals need all earlier periods too.
+        days = Q(date__lte=timezone.localdate(end - timedelta(microseconds=1)))
+        if range_given:
+            days &= Q(date__gte=timezone.localdate(start))
+        rows = (
+            ReportDailyRollup.objects
+            .filter(days)
+            .annotate(period=trunc('date'))
+            .values('period')
+            .annotate(
+                total=Sum('report_count'),
+                redacted=Sum('redacted_count'),
+                **type_counts
+            )
+            .order_by('period')
         )
         
-        # Reports by month (last 12 months)
-        twelve_months_ago = timezone.now() - timedelta(days=365)
-        reports_by_month = {}
-        
-        for i in range(12):
-            month_start = timezone.now() - timedelta(days=30 * i)
-            month_end = timezone.now() - timedelta(days=30 * (i - 1))
-            month_key = month_start.strftime('%Y-%m')
-            
-            count = Report.objects.filter(
-                created_at__gte=month_start,
-                created_at__lt=month_end
-            ).count()
-            
-            reports_by_month[month_key] = count
+        reports_by_period = dict.fromkeys(period_keys, 0)
+        reports_by_period_and_type = {
+            key: dict.fromkeys(incident_types, 0) for key in period_keys
+        }
+        reports_by_type = dict.fromkeys(incident_types, 0)
+        total_reports = 0
+        redacted_count = 0
+        
+        for row in rows:
+            key = row['period'].strftime(key_format)
+            if key in reports_by_period:
+                reports_by_period[key] = row['total']
+                reports_by_period_and_type[key] = {
+                    incident_type: row[f'type_{incident_type}'] or 0
+                    for incident_type in incident_types
+                }
+            for incident_type in incident_types:
+                reports_by_type[incident_type] += row[f'type_{incident_type}'] or 0
+            total_reports += row['total']
+            redacted_count += row['redacted']
         
         # Redaction rate
-        redacted_count = Report.objects.filter(redaction_applied=True).count()
         redaction_rate = (redacted_count / total_reports * 100) if total_reports > 0 else 0
         
         stats_data = {
+            'granularity': granularity,
+            'from': start,
+            'to': end,
             'total_reports': total_reports,
             'reports_by_type': reports_by_type,
-            'reports_by_month': reports_by_month,
+            'reports_by_period': reports_by_period,
+            'reports_by_period_and_type': reports_by_period_and_type,
             'redaction_rate': round(redaction_rate, 2)
         }
+        if granularity == 'month':
+            # Name used before granularities were added
+            stats_data['reports_by_month'] = reports_by_period
         
         serializer = self.get_serializer(stats_data)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream decrypted reports (admin only).
+        Honours the list filters (incident_type, redaction_applied).
+        
+        GET /api/reports/export/?export_format=ndjson|csv
+        """
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset()).order_by('-created_at', '-id')
+        
+        # Log admin export (for audit)
+        from apps.core.models import log_admin_action
+        log_admin_action(
+            admin_user=request.user,
+            action='view',
+            resource_type='Report',
+            resource_id='export',
+            details={
+                'format': export_format,
+                'filters': {
+                    field: request.query_params[field]
+                    for field in self.filterset_fields
+                    if field in request.query_params
+                }
+            }
+        )
+        
+        response = StreamingHttpResponse(
+            stream_export(queryset, export_format),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        filename = f"reports-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Ingest many reports at once (admin only), e.g. paper intake forms
+        collected offline by partner organizations.
+        
+        POST /api/reports/bulk/
+        Body: a JSON array of reports, or NDJSON (Content-Type: application/x-ndjson)
+        with one report per line; blank lines are skipped. Each report takes the
+        same fields as POST /api/reports/ and gets the same PII redaction.
+        
+        Returns one result per report, in upload order, with its confirmation
+        code or its errors: 201 if all were created, 207 if some were,
+        400 if none were.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'Expected a non-empty JSON array or NDJSON stream of reports'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.REPORT_INGEST_MAX_ITEMS:
+            return Response(
+                {'error': f'At most {settings.REPORT_INGEST_MAX_ITEMS} reports per upload'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = ingest_reports(items)
+        created = sum(1 for result in results if 'confirmation_code' in result)
+        failed = len(results) - created
+        
+        # Log bulk ingestion (counts only, for audit)
+        from apps.core.models import log_admin_action
+        log_admin_action(
+            admin_user=request.user,
+            action='create',
+            resource_type='Report',
+            resource_id='bulk',
+            details={'created': created, 'failed': failed}
+        )
+        logger.info(f"Bulk report ingestion: {created} created, {failed} rejected")
+        
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {'created': created, 'failed': failed, 'results': results},
+            status=response_status
+        )
+    
     @action(detail=False, methods=['get'])
     def incident_types(self, request):
         """
         Get list of available incident types.
         GET /api/reports/incident_types/
         """
-        incident_types = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in Report.INCIDENT_TYPE_CHOICES
-        ]
-        return Response({'incident_types': incident_types})
+        return payload_response(request, 'reports.incident_types')
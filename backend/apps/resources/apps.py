@@ -5,3 +5,6 @@ class ResourcesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.resources'
     verbose_name = 'Resources'
+    
+    def ready(self):
+        from . import payloads, signals  # noqa: F401
@@ -3,9 +3,10 @@ Enhanced chatbot with improved pattern matching and contextual responses.
 Provides automated responses to common questions with better empathy and resource connection.
 """
 
-import re
 from typing import Dict, List, Optional
 
+from .keyword_matcher import KeywordAutomaton
+
 
 class EnhancedChatbot:
     """
@@ -102,6 +103,18 @@ class EnhancedChatbot:
         },
     }
     
+    # Categories checked in this order (immediate danger first)
+    PRIORITY_ORDER = [
+        'immediate_danger', 'crisis', 'leaving', 'shelter',
+        'technology_abuse', 'children', 'safety_planning',
+        'legal', 'police', 'digital_evidence',
+        'counseling', 'emotional_support', 'financial',
+        'work_school', 'greeting', 'thanks'
+    ]
+    
+    # Compiled keyword matcher, built from RESPONSES by compile_matcher()
+    _matcher = None
+    
     DEFAULT_RESPONSE = (
         "I'm here to help with information about:\n\n"
         "🆘 **Emergency Support**\n"
@@ -145,30 +158,16 @@ class EnhancedChatbot:
         # Normalize message
         message_lower = message.lower().strip()
         
-        # Check each pattern (ordered by priority - immediate danger first)
-        priority_order = [
-            'immediate_danger', 'crisis', 'leaving', 'shelter',
-            'technology_abuse', 'children', 'safety_planning',
-            'legal', 'police', 'digital_evidence',
-            'counseling', 'emotional_support', 'financial',
-            'work_school', 'greeting', 'thanks'
-        ]
-        
-        for category in priority_order:
-            if category not in cls.RESPONSES:
-                continue
-                
+        # Single pass over the message finds every matching category;
+        # the automaton returns the one highest in PRIORITY_ORDER
+        category = cls._matcher.first_match(message_lower)
+        if category is not None:
             pattern_data = cls.RESPONSES[category]
-            keywords = pattern_data['keywords']
-            
-            # Check if any keyword matches
-            for keyword in keywords:
-                if keyword in message_lower:
-                    return {
-                        'response': pattern_data['response'],
-                        'category': category,
-                        'follow_up': pattern_data.get('follow_up')
-                    }
+            return {
+                'response': pattern_data['response'],
+                'category': category,
+                'follow_up': pattern_data.get('follow_up')
+            }
         
         # No match found, return default
         return {
@@ -177,6 +176,22 @@ class EnhancedChatbot:
             'follow_up': None
         }
     
+    @classmethod
+    def compile_matcher(cls) -> KeywordAutomaton:
+        """
+        Compile the RESPONSES keywords into a single multi-pattern matcher.
+        Called once at import; call again after changing RESPONSES or PRIORITY_ORDER.
+        
+        Returns:
+            KeywordAutomaton: The compiled matcher
+        """
+        cls._matcher = KeywordAutomaton([
+            (category, cls.RESPONSES[category]['keywords'])
+            for category in cls.PRIORITY_ORDER
+            if category in cls.RESPONSES
+        ])
+        return cls._matcher
+    
     @classmethod
     def get_suggested_questions(cls) -> List[str]:
         """
@@ -234,6 +249,9 @@ class EnhancedChatbot:
         ]
 
 
+EnhancedChatbot.compile_matcher()
+
+
 # Convenience function for easy import
 def get_chatbot_response(message: str, conversation_history: Optional[List[Dict]] = None) -> Dict[str, str]:
     """
@@ -0,0 +1,117 @@
+"""
+Multi-pattern keyword matching for the chatbot.
+Compiles every keyword of every category into a single Aho-Corasick automaton
+so a message is scanned once, regardless of how many keywords are configured.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over groups of keywords.
+
+    Groups are given in priority order (highest priority first). Matching is
+    plain substring matching, exactly like ``keyword in text``, so results are
+    identical to checking each keyword one by one.
+
+    Each node stores a bitmask of the groups whose keywords end at that node
+    (including those inherited through failure links), so a single left-to-right
+    pass collects every matching group.
+    """
+
+    def __init__(self, groups: Sequence[Tuple[str, Iterable[str]]]):
+        """
+        Build the automaton.
+
+        Args:
+            groups: Sequence of (name, keywords) pairs in priority order
+        """
+        self.names: List[str] = [name for name, _ in groups]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[int] = [0]
+
+        for rank, (_, keywords) in enumerate(groups):
+            bit = 1 << rank
+            for keyword in keywords:
+                self._add_keyword(keyword, bit)
+
+        self._fail: List[int] = [0] * len(self._goto)
+        self._build_failure_links()
+
+    def _add_keyword(self, keyword: str, bit: int) -> None:
+        """Insert a keyword into the trie, tagging its final node with the group bit."""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._output.append(0)
+            state = next_state
+        self._output[state] |= bit
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first construction of failure links and merged outputs."""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def _scan(self, text: str, stop_mask: int = 0) -> int:
+        """
+        Return the bitmask of all groups with a keyword occurring in text.
+
+        Stops early once any bit of ``stop_mask`` has been found.
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found = output[0]
+        if found & stop_mask:
+            return found
+
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+                if found & stop_mask:
+                    break
+        return found
+
+    def match_all(self, text: str) -> List[str]:
+        """
+        Get every group that has at least one keyword in text.
+
+        Returns:
+            list: Matching group names, in priority order
+        """
+        found = self._scan(text)
+        return [name for rank, name in enumerate(self.names) if found >> rank & 1]
+
+    def first_match(self, text: str) -> Optional[str]:
+        """
+        Get the highest-priority group that has a keyword in text.
+
+        Returns:
+            str: Group name, or None if nothing matched
+        """
+        # Stop scanning as soon as the top-priority group is seen
+        found = self._scan(text, stop_mask=1)
+        if not found:
+            return None
+        return self.names[(found & -found).bit_length() - 1]
@@ -0,0 +1,89 @@
+"""
+Management command to benchmark chatbot keyword matching.
+Usage: python manage.py benchmark_chatbot [--sizes 17 100 1000 5000] [--iterations 2000]
+"""
+
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.resources.chatbot import EnhancedChatbot
+from apps.resources.keyword_matcher import KeywordAutomaton
+
+
+class Command(BaseCommand):
+    help = 'Compares the compiled keyword automaton with a per-keyword substring scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[100, 1000, 5000],
+            help='Total keyword counts to benchmark (in addition to the real table)'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=2000,
+            help='Messages matched per measurement'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        iterations = options['iterations']
+        messages = self.build_messages(rng, iterations)
+
+        real_groups = [
+            (category, EnhancedChatbot.RESPONSES[category]['keywords'])
+            for category in EnhancedChatbot.PRIORITY_ORDER
+        ]
+        tables = [('real', real_groups)]
+        for size in options['sizes']:
+            tables.append((str(size), self.build_groups(rng, real_groups, size)))
+
+        self.stdout.write(f"{'keywords':>10} {'naive us/msg':>14} {'automaton us/msg':>18}")
+        for label, groups in tables:
+            keyword_count = sum(len(keywords) for _, keywords in groups)
+            automaton = KeywordAutomaton(groups)
+
+            naive_time = self.time_it(lambda m: self.naive_match(groups, m), messages)
+            automaton_time = self.time_it(automaton.first_match, messages)
+
+            self.stdout.write(
+                f"{keyword_count:>10} {naive_time * 1e6:>14.2f} {automaton_time * 1e6:>18.2f}"
+                f"  ({label})"
+            )
+
+    @staticmethod
+    def naive_match(groups, message):
+        """Reference implementation: the original per-keyword scan."""
+        for category, keywords in groups:
+            for keyword in keywords:
+                if keyword in message:
+                    return category
+        return None
+
+    @staticmethod
+    def time_it(match, messages):
+        """Average seconds per message."""
+        start = time.perf_counter()
+        for message in messages:
+            match(message)
+        return (time.perf_counter() - start) / len(messages)
+
+    @staticmethod
+    def build_messages(rng, count):
+        """Realistic-length messages that mostly miss, the worst case for the naive scan."""
+        words = ['i', 'my', 'he', 'keeps', 'the', 'and', 'what', 'can', 'do', 'about', 'it', 'today']
+        return [
+            ' '.join(rng.choice(words) for _ in range(rng.randint(5, 40)))
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def build_groups(rng, real_groups, size):
+        """Pad the real keyword table with random keywords up to ``size`` total."""
+        groups = [(category, list(keywords)) for category, keywords in real_groups]
+        existing = sum(len(keywords) for _, keywords in groups)
+        for i in range(max(0, size - existing)):
+            keyword = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+            groups[i % len(groups)][1].append(keyword)
+        return groups
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+
+def create_search_index(apps, schema_editor):
+    """Build the GIN index and fill existing vectors (PostgreSQL only)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    model = apps.get_model('resources', 'resource')
+    schema_editor.add_index(model, INDEX)
+    model.objects.update(search_vector=(
+        SearchVector("title", weight="A", config="english")
+        + SearchVector(Cast("tags", models.TextField()), weight="B", config="english")
+        + SearchVector("description", weight="C", config="english")
+        + SearchVector("content", weight="D", config="english")
+    ))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('resources', 'resource'), INDEX)
+
+
+INDEX = django.contrib.postgres.indexes.GinIndex(
+    fields=["search_vector"], name="resources_search_vector_gin"
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("resources", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resource",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text="Weighted full-text search vector (PostgreSQL only)",
+                null=True,
+            ),
+        ),
+        # GIN indexes only exist on PostgreSQL; other databases search in memory
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="resource", index=INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_index, drop_search_index),
+            ],
+        ),
+    ]
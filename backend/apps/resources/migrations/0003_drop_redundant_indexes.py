@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0002_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='helpline',
+            name='priority',
+            field=models.IntegerField(default=0, help_text='Display priority (higher = shown first)'),
+        ),
+        migrations.AlterField(
+            model_name='helpline',
+            name='is_24_7',
+            field=models.BooleanField(default=False, help_text='Whether available 24/7'),
+        ),
+        migrations.AlterField(
+            model_name='helpline',
+            name='category',
+            field=models.CharField(choices=[('crisis', 'Crisis Support'), ('legal', 'Legal Assistance'), ('counseling', 'Counseling'), ('shelter', 'Shelter/Housing'), ('medical', 'Medical Services'), ('other', 'Other Support')], help_text='Helpline category', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='resource',
+            name='resource_type',
+            field=models.CharField(choices=[('article', 'Article'), ('guide', 'Guide'), ('directory', 'Directory'), ('law', 'Law/Legislation'), ('organization', 'Organization')], help_text='Type of resource', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='resource',
+            name='category',
+            field=models.CharField(choices=[('legal_rights', 'Legal Rights'), ('safety_planning', 'Safety Planning'), ('organizations', 'Support Organizations'), ('laws', 'Laws & Legislation'), ('financial', 'Financial Assistance'), ('healthcare', 'Healthcare Resources')], help_text='Resource category', max_length=20),
+        ),
+    ]
@@ -2,6 +2,8 @@
 Models for emergency resources and hotlines.
 """
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from apps.core.models import TimeStampedModel
 
@@ -45,7 +47,6 @@ class Helpline(TimeStampedModel):
     category = models.CharField(
         max_length=20,
         choices=CATEGORY_CHOICES,
-        db_index=True,
         help_text="Helpline category"
     )
     availability = models.CharField(
@@ -54,7 +55,6 @@ class Helpline(TimeStampedModel):
     )
     is_24_7 = models.BooleanField(
         default=False,
-        db_index=True,
         help_text="Whether available 24/7"
     )
     languages = models.JSONField(
@@ -68,7 +68,6 @@ class Helpline(TimeStampedModel):
     )
     priority = models.IntegerField(
         default=0,
-        db_index=True,
         help_text="Display priority (higher = shown first)"
     )
     
@@ -101,6 +100,7 @@ class Resource(TimeStampedModel):
         external_url: Optional external link
         is_published: Whether resource is visible to public
         tags: Searchable tags (JSON array)
+        search_vector: Weighted full-text search vector, refreshed on save
     """
     CATEGORY_CHOICES = [
         ('legal_rights', 'Legal Rights'),
@@ -132,13 +132,11 @@ class Resource(TimeStampedModel):
     category = models.CharField(
         max_length=20,
         choices=CATEGORY_CHOICES,
-        db_index=True,
         help_text="Resource category"
     )
     resource_type = models.CharField(
         max_length=20,
         choices=TYPE_CHOICES,
-        db_index=True,
         help_text="Type of resource"
     )
     external_url = models.URLField(
@@ -154,6 +152,15 @@ class Resource(TimeStampedModel):
         default=list,
         help_text="Searchable tags"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Weighted full-text search vector (PostgreSQL only)"
+    )
+    
+    # Full-text search weights (A highest) and the field snippets are taken from
+    SEARCH_WEIGHTS = {'title': 'A', 'tags': 'B', 'description': 'C', 'content': 'D'}
+    SEARCH_HEADLINE_FIELD = 'content'
     
     class Meta:
         verbose_name = "Resource"
@@ -163,6 +170,7 @@ class Resource(TimeStampedModel):
         indexes = [
             models.Index(fields=['category', 'is_published']),
             models.Index(fields=['resource_type', 'is_published']),
+            GinIndex(fields=['search_vector'], name='resources_search_vector_gin'),
         ]
     
     def __str__(self):
@@ -0,0 +1,47 @@
+"""
+Static payloads for helplines, resources and the chatbot (see apps.core.payloads).
+"""
+
+from apps.core.payloads import register_payload
+from .chatbot import EnhancedChatbot
+from .models import Helpline, Resource
+
+
+@register_payload('helplines.categories')
+def helpline_categories():
+    return {
+        'categories': [
+            {'value': choice[0], 'label': choice[1]}
+            for choice in Helpline.CATEGORY_CHOICES
+        ]
+    }
+
+
+@register_payload('resources.categories')
+def resource_categories():
+    return {
+        'categories': [
+            {'value': choice[0], 'label': choice[1]}
+            for choice in Resource.CATEGORY_CHOICES
+        ]
+    }
+
+
+@register_payload('resources.types')
+def resource_types():
+    return {
+        'types': [
+            {'value': choice[0], 'label': choice[1]}
+            for choice in Resource.TYPE_CHOICES
+        ]
+    }
+
+
+@register_payload('chatbot.suggestions')
+def chatbot_suggestions():
+    return {'suggestions': EnhancedChatbot.get_suggested_questions()}
+
+
+@register_payload('chatbot.resources')
+def chatbot_resources():
+    return {'resources': EnhancedChatbot.get_quick_resources()}
@@ -3,6 +3,7 @@ Serializers for resources and helplines API.
 """
 
 from rest_framework import serializers
+from apps.core.search import SearchResultSerializerMixin
 from .models import Helpline, Resource
 
 
@@ -66,7 +67,7 @@ class HelplineCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class ResourceListSerializer(serializers.ModelSerializer):
+class ResourceListSerializer(SearchResultSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for resource list view.
     Returns summary information for browsing.
@@ -0,0 +1,30 @@
+"""
+Signal handlers invalidating cached helpline and resource responses and
+keeping the resource search vectors current.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.cache import bump_cache_version
+from apps.core.search import update_search_vector
+from .models import Helpline, Resource
+
+
+@receiver([post_save, post_delete], sender=Helpline)
+def invalidate_helpline_cache(sender, using, **kwargs):
+    """Drop cached helpline responses when any helpline changes (on commit, see lessons.signals)."""
+    transaction.on_commit(lambda: bump_cache_version('helplines'), using=using)
+
+
+@receiver([post_save, post_delete], sender=Resource)
+def invalidate_resource_cache(sender, using, **kwargs):
+    """Drop cached resource responses when any resource changes (on commit, see lessons.signals)."""
+    transaction.on_commit(lambda: bump_cache_version('resources'), using=using)
+
+
+@receiver(post_save, sender=Resource)
+def update_resource_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Recompute the resource's full-text search vector."""
+    update_search_vector(instance, update_fields)
@@ -0,0 +1,55 @@
+"""
+Tests for invalidation of the cached helpline catalog.
+"""
+
+import pytest
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from apps.core.cache import get_cache_version, get_catalog_cache
+from apps.resources.models import Helpline
+
+
+@pytest.fixture(autouse=True)
+def catalog_cache(settings):
+    settings.DATABASE_REPLICA_MAX_LAG = 0
+    yield get_catalog_cache()
+
+
+def create_helpline(name='Crisis Line'):
+    return Helpline.objects.create(
+        name=name, phone_number='0800 000 000', description='Free support',
+        category='crisis', availability='24/7', is_24_7=True,
+    )
+
+
+def names(response):
+    return [helpline['name'] for helpline in response.data['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestHelplineCache:
+    """Helpline changes reach every cached response once committed."""
+
+    def test_deactivate_and_delete_invalidate(self):
+        helpline = create_helpline()
+        other = create_helpline('Legal Aid')
+        client = APIClient()
+        assert sorted(names(client.get('/api/helplines/'))) == ['Crisis Line', 'Legal Aid']
+
+        helpline.is_active = False
+        helpline.save()
+        assert names(client.get('/api/helplines/')) == ['Legal Aid']
+
+        other.delete()
+        assert names(client.get('/api/helplines/')) == []
+
+    def test_version_bumped_only_on_commit(self):
+        helpline = create_helpline()
+        version = get_cache_version('helplines')
+
+        with transaction.atomic():
+            helpline.delete()
+            assert get_cache_version('helplines') == version
+
+        assert get_cache_version('helplines') != version
@@ -0,0 +1,133 @@
+"""
+Tests for the chatbot's Aho-Corasick keyword matcher.
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from apps.resources.chatbot import EnhancedChatbot, get_chatbot_response
+from apps.resources.keyword_matcher import KeywordAutomaton
+
+GROUPS = [
+    ('danger', ['hurt me', 'danger']),
+    ('pronouns', ['he', 'she', 'his', 'hers']),
+    ('me', ['me']),
+]
+
+
+def naive_matches(groups, text):
+    """Groups with a keyword in text, checked one keyword at a time."""
+    return [name for name, keywords in groups if any(keyword in text for keyword in keywords)]
+
+
+def naive_first_match(groups, text):
+    matches = naive_matches(groups, text)
+    return matches[0] if matches else None
+
+
+class TestKeywordAutomaton:
+    """Matching is plain substring matching, reported in priority order."""
+
+    @pytest.fixture
+    def automaton(self):
+        return KeywordAutomaton(GROUPS)
+
+    @pytest.mark.parametrize('text, expected', [
+        ('ushers', ['pronouns']),
+        ('this', ['pronouns']),
+        ('hurt me', ['danger', 'me']),
+        ('they hurt mean people', ['danger', 'pronouns', 'me']),
+        ('hurt', []),
+        ('', []),
+    ])
+    def test_overlapping_keywords(self, automaton, text, expected):
+        assert automaton.match_all(text) == expected
+
+    def test_keywords_found_through_failure_links(self):
+        # 'abcd' fails after 'abc', where 'bc' and then 'c' must still be found
+        automaton = KeywordAutomaton([('long', ['abcx']), ('mid', ['bc']), ('short', ['c'])])
+
+        assert automaton.match_all('abcd') == ['mid', 'short']
+        assert automaton.match_all('abcx') == ['long', 'mid', 'short']
+
+    def test_groups_reported_in_priority_order_not_text_order(self, automaton):
+        assert automaton.match_all('me, then danger') == ['danger', 'pronouns', 'me']
+
+    def test_first_match_is_highest_priority(self, automaton):
+        assert automaton.first_match('call me, i am in danger') == 'danger'
+        assert automaton.first_match('call me') == 'me'
+        assert automaton.first_match('nothing to see') is None
+
+    def test_shared_keyword_counts_for_every_group(self):
+        automaton = KeywordAutomaton([('a', ['report']), ('b', ['file report', 'report'])])
+
+        assert automaton.match_all('i want to report it') == ['a', 'b']
+
+    def test_empty_keyword_matches_everything(self):
+        automaton = KeywordAutomaton([('never', ['zzz']), ('always', [''])])
+
+        assert automaton.match_all('') == ['always']
+        assert automaton.first_match('anything') == 'always'
+
+    def test_case_and_punctuation_are_literal(self, automaton):
+        # The automaton does not normalize; callers lowercase first
+        assert automaton.match_all('DANGER') == []
+        assert automaton.match_all('danger!') == ['danger']
+        assert automaton.match_all("i'm in danger.") == ['danger']
+        assert automaton.match_all('hurt, me') == ['me']
+
+    @pytest.mark.property
+    @settings(max_examples=300, deadline=None)
+    @given(
+        groups=st.lists(
+            st.lists(st.text(alphabet='abc ', min_size=1, max_size=4), max_size=4),
+            min_size=1, max_size=5,
+        ),
+        text=st.text(alphabet='abc d', max_size=30),
+    )
+    def test_same_as_checking_each_keyword(self, groups, text):
+        named = [(f'group{index}', keywords) for index, keywords in enumerate(groups)]
+        automaton = KeywordAutomaton(named)
+
+        assert automaton.match_all(text) == naive_matches(named, text)
+        assert automaton.first_match(text) == naive_first_match(named, text)
+
+
+class TestChatbotMatching:
+    """EnhancedChatbot's use of the automaton."""
+
+    def test_priority_order_covers_every_category(self):
+        assert sorted(EnhancedChatbot.PRIORITY_ORDER) == sorted(EnhancedChatbot.RESPONSES)
+        assert EnhancedChatbot._matcher.names == EnhancedChatbot.PRIORITY_ORDER
+
+    def test_matches_checking_categories_in_priority_order(self):
+        groups = [
+            (category, EnhancedChatbot.RESPONSES[category]['keywords'])
+            for category in EnhancedChatbot.PRIORITY_ORDER
+        ]
+        for text in [
+            'hi, i need a lawyer',
+            'I want to file a police report',
+            'my partner tracks my phone and i feel alone',
+            'thanks, that was helpful',
+            'what is the weather',
+        ]:
+            expected = naive_first_match(groups, text.lower()) or 'default'
+            assert get_chatbot_response(text)['category'] == expected, text
+
+    @pytest.mark.parametrize('message, category', [
+        ('I need help NOW, he said he will hurt me!', 'immediate_danger'),
+        ('  Hello?  ', 'greeting'),
+        ("I CAN'T TAKE IT anymore...", 'crisis'),
+        ('Can I get a restraining order? And a therapist?', 'legal'),
+        ('Thank you so much', 'thanks'),
+    ])
+    def test_case_and_punctuation_ignored(self, message, category):
+        assert get_chatbot_response(message)['category'] == category
+
+    @pytest.mark.parametrize('message', ['', '   ', 'the weather today'])
+    def test_no_match_is_default(self, message):
+        response = get_chatbot_response(message)
+
+        assert response['category'] == 'default'
+        assert response['response'] == EnhancedChatbot.DEFAULT_RESPONSE
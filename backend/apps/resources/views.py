@@ -7,7 +7,11 @@ from rest_framework.permissions import AllowAny
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.cache import CachedCatalogMixin
+from apps.core.payloads import payload_response
 from apps.core.permissions import IsAdminUser
+from apps.core.querybudget import query_budget
+from apps.core.search import FullTextSearchFilter
 from .models import Helpline, Resource
 from .serializers import (
     HelplineSerializer,
@@ -16,10 +20,10 @@ from .serializers import (
     ResourceDetailSerializer,
     ResourceCreateSerializer
 )
-from .chatbot import get_chatbot_response, EnhancedChatbot
+from .chatbot import get_chatbot_response
 
 
-class HelplineViewSet(viewsets.ModelViewSet):
+class HelplineViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     """
     ViewSet for helplines.
     
@@ -31,13 +35,18 @@ class HelplineViewSet(viewsets.ModelViewSet):
     - create: POST /api/helplines/
     - update: PUT/PATCH /api/helplines/{id}/
     - destroy: DELETE /api/helplines/{id}/
+    
+    list/retrieve responses are cached until a helpline changes.
     """
     queryset = Helpline.objects.all()
+    cache_namespace = 'helplines'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'is_24_7', 'is_active']
     search_fields = ['name', 'description', 'phone_number']
     ordering_fields = ['priority', 'name', 'created_at']
     ordering = ['-priority', 'name']
+    query_budgets = {'list': 4, 'retrieve': 3, 'categories': 1}
+    replica_actions = {'list', 'retrieve', 'categories'}
     
     def get_permissions(self):
         """
@@ -75,14 +84,10 @@ class HelplineViewSet(viewsets.ModelViewSet):
         Get list of available helpline categories.
         GET /api/helplines/categories/
         """
-        categories = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in Helpline.CATEGORY_CHOICES
-        ]
-        return Response({'categories': categories})
+        return payload_response(request, 'helplines.categories')
 
 
-class ResourceViewSet(viewsets.ModelViewSet):
+class ResourceViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     """
     ViewSet for resources.
     
@@ -94,13 +99,20 @@ class ResourceViewSet(viewsets.ModelViewSet):
     - create: POST /api/resources/
     - update: PUT/PATCH /api/resources/{id}/
     - destroy: DELETE /api/resources/{id}/
+    
+    ?search= runs a ranked full-text search over title, tags, description
+    and content; hits include search_rank and a highlighted search_headline.
+    
+    list/retrieve responses are cached until a resource changes.
     """
     queryset = Resource.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    cache_namespace = 'resources'
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['category', 'resource_type', 'is_published']
-    search_fields = ['title', 'description', 'content', 'tags']
     ordering_fields = ['created_at', 'title']
     ordering = ['-created_at']
+    query_budgets = {'list': 6, 'retrieve': 3, 'categories': 1, 'types': 1}
+    replica_actions = {'list', 'retrieve', 'categories', 'types'}
     
     def get_permissions(self):
         """
@@ -140,11 +152,7 @@ class ResourceViewSet(viewsets.ModelViewSet):
         Get list of available resource categories.
         GET /api/resources/categories/
         """
-        categories = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in Resource.CATEGORY_CHOICES
-        ]
-        return Response({'categories': categories})
+        return payload_response(request, 'resources.categories')
     
     @action(detail=False, methods=['get'])
     def types(self, request):
@@ -152,14 +160,11 @@ class ResourceViewSet(viewsets.ModelViewSet):
         Get list of available resource types.
         GET /api/resources/types/
         """
-        types = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in Resource.TYPE_CHOICES
-        ]
-        return Response({'types': types})
+        return payload_response(request, 'resources.types')
 
 
 
+@query_budget(1)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def chatbot_message(request):
@@ -208,6 +213,7 @@ def chatbot_message(request):
     return Response(response_data)
 
 
+@query_budget(1)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def chatbot_suggestions(request):
@@ -215,18 +221,17 @@ def chatbot_suggestions(request):
     Get suggested questions for chatbot.
     GET /api/chatbot/suggestions/
     
+    Served from a precomputed payload.
+    
     Response:
     {
         "suggestions": ["...", "..."]
     }
     """
-    suggestions = EnhancedChatbot.get_suggested_questions()
-    
-    return Response({
-        'suggestions': suggestions
-    })
+    return payload_response(request, 'chatbot.suggestions')
 
 
+@query_budget(1)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def chatbot_resources(request):
@@ -234,6 +239,8 @@ def chatbot_resources(request):
     Get quick access emergency resources.
     GET /api/chatbot/resources/
     
+    Served from a precomputed payload.
+    
     Response:
     {
         "resources": [
@@ -246,8 +253,4 @@ def chatbot_resources(request):
         ]
     }
     """
-    resources = EnhancedChatbot.get_quick_resources()
-    
-    return Response({
-        'resources': resources
-    })
+    return payload_response(request, 'chatbot.resources')
@@ -4,8 +4,10 @@ Base settings shared across all environments.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
+from corsheaders.defaults import default_headers as default_cors_headers
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -37,6 +39,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.MetricsMiddleware',  # First, so it times the whole stack
+    'apps.core.middleware.QueryBudgetMiddleware',
+    'apps.core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS must be before CommonMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -106,6 +111,46 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# CACHE_BACKEND selects the backend: 'file' (default, shared between workers on
+# one host), 'redis' (shared, requires the redis package; any Redis-compatible
+# server works) or 'locmem' (per process; only for DEBUG, since other workers
+# would keep serving catalog entries invalidated elsewhere). CACHE_LOCATION is
+# the file directory (default: outside the source tree) or redis URL.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+CACHE_DEFAULT_LOCATIONS = {
+    'locmem': 'shieldher',
+    'file': os.path.join(tempfile.gettempdir(), 'shieldher-cache'),
+    'redis': 'redis://localhost:6379/0',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION') or CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND],
+        'KEY_PREFIX': 'shieldher',
+    }
+}
+
+# Public catalog (lessons, helplines, resources) response cache.
+# Entries are invalidated on model changes; the timeout is only a safety net.
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Cache-Control max-age for precomputed static payloads (enums, quick resources)
+STATIC_PAYLOAD_MAX_AGE = int(os.environ.get('STATIC_PAYLOAD_MAX_AGE', 60 * 60 * 24))
+
+# Full-text search (lessons, resources).
+# SEARCH_CONFIG is the PostgreSQL text search configuration; other databases
+# use an in-memory index capped at SEARCH_FALLBACK_MAX_RESULTS hits.
+SEARCH_CONFIG = os.environ.get('SEARCH_CONFIG', 'english')
+SEARCH_FALLBACK_MAX_RESULTS = int(os.environ.get('SEARCH_FALLBACK_MAX_RESULTS', 200))
+
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -158,14 +203,116 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
 
 CORS_ALLOW_CREDENTIALS = False  # No cookies for anonymous users
 
+# Idempotency-Key makes donation retries safe; Location points at the status URL
+CORS_ALLOW_HEADERS = (*default_cors_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Location', 'Idempotent-Replayed']
+
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 X_FRAME_OPTIONS = 'DENY'
 SECURE_CONTENT_TYPE_NOSNIFF = True
 
-# Encryption key for sensitive fields
+# Encryption key for sensitive fields (a Fernet key). The default is a
+# placeholder: outside DEBUG an invalid key stops the app instead of
+# encrypting under a temporary one.
 ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY', 'change-this-to-a-32-byte-fernet-key')
 
+# Retired encryption keys, comma-separated, still accepted for decryption.
+# To rotate: move the old ENCRYPTION_KEY here, set a new one, then run
+# `python manage.py rotate_encryption_key`.
+ENCRYPTION_PREVIOUS_KEYS = [
+    key for key in os.environ.get('ENCRYPTION_PREVIOUS_KEYS', '').split(',') if key
+]
+
+# Admin report export: rows per decryption batch and decryption threads
+REPORT_EXPORT_CHUNK_SIZE = int(os.environ.get('REPORT_EXPORT_CHUNK_SIZE', 1000))
+REPORT_EXPORT_MAX_WORKERS = int(os.environ.get('REPORT_EXPORT_MAX_WORKERS', 4))
+
+# Admin donation export: rows per database fetch and per CSV chunk,
+# Parquet row group or Arrow record batch
+DONATION_EXPORT_CHUNK_SIZE = int(os.environ.get('DONATION_EXPORT_CHUNK_SIZE', 10000))
+
+# Confirmation codes (apps.core.codes): pre-checked codes kept per process
+# and prefix; 0 generates each code on save
+CONFIRMATION_CODE_POOL_SIZE = int(os.environ.get('CONFIRMATION_CODE_POOL_SIZE', 0))
+
+# Bulk report ingestion (POST /api/reports/bulk/): reports per upload and
+# reports per bulk_create transaction
+REPORT_INGEST_MAX_ITEMS = int(os.environ.get('REPORT_INGEST_MAX_ITEMS', 10000))
+REPORT_INGEST_CHUNK_SIZE = int(os.environ.get('REPORT_INGEST_CHUNK_SIZE', 500))
+
+# Request metrics (latency, queries, serializer time, response size) served
+# to admins in Prometheus format at /api/metrics/
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+
+# Query budget guard (QueryBudgetMiddleware): 'off', 'warn' or 'raise'.
+# Views declare budgets with query_budgets / @query_budget; undeclared views
+# get QUERY_BUDGET_DEFAULT. Repeating one query shape more than
+# QUERY_DUPLICATE_LIMIT times in a request is reported as a likely N+1.
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'off')
+QUERY_BUDGET_DEFAULT = int(os.environ.get('QUERY_BUDGET_DEFAULT', 20))
+QUERY_DUPLICATE_LIMIT = int(os.environ.get('QUERY_DUPLICATE_LIMIT', 3))
+
+# CPU seconds PII scanning may use per public submission (apps.core.pii);
+# report descriptions that cannot be scanned in time are rejected
+PII_SCAN_CPU_BUDGET = float(os.environ.get('PII_SCAN_CPU_BUDGET', 0.25))
+
+# Read replica (apps.core.dbrouter): safe requests to views declaring
+# replica_actions / @replica_reads read from this alias when it is configured
+# in DATABASES; writes, and reads after a request's first write, use 'default'.
+# Catalog responses are read from the primary for DATABASE_REPLICA_MAX_LAG
+# seconds after a catalog change, so stale rows are not cached.
+DATABASE_REPLICA_ALIAS = os.environ.get('DATABASE_REPLICA_ALIAS', 'replica')
+DATABASE_REPLICA_MAX_LAG = float(os.environ.get('DATABASE_REPLICA_MAX_LAG', 5))
+DATABASE_ROUTERS = ['apps.core.dbrouter.ReplicaRouter']
+
+# Benchmark results and baselines (manage.py benchmark_endpoints / benchmark_compare);
+# *-latest.json run results are gitignored, baselines are meant to be committed
+BENCHMARK_DIR = os.environ.get('BENCHMARK_DIR', str(BASE_DIR / 'benchmarks'))
+
+# Audit log writer: entries are buffered and written with bulk_create at
+# request end, every AUDIT_FLUSH_INTERVAL seconds or every AUDIT_BATCH_SIZE
+# entries. With AUDIT_SPOOL_PATH set, entries the database cannot take are
+# appended there (load them with `python manage.py drain_audit_spool`).
+AUDIT_BUFFER_ENABLED = os.environ.get('AUDIT_BUFFER_ENABLED', 'True') == 'True'
+AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', 100))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 2.0))
+AUDIT_FLUSH_ON_REQUEST_END = os.environ.get('AUDIT_FLUSH_ON_REQUEST_END', 'True') == 'True'
+AUDIT_MAX_PENDING = int(os.environ.get('AUDIT_MAX_PENDING', 5000))
+AUDIT_SPOOL_PATH = os.environ.get('AUDIT_SPOOL_PATH') or None
+
+# Audit log retention (python manage.py audit_retention), in days per action,
+# e.g. AUDIT_RETENTION_DAYS=view:180,delete:2555. Expired entries are archived
+# as gzip JSONL files in AUDIT_ARCHIVE_DIR before removal (the default
+# backend/archive/ is gitignored; point it at durable storage in production).
+AUDIT_RETENTION_DEFAULT_DAYS = int(os.environ.get('AUDIT_RETENTION_DEFAULT_DAYS', 730))
+AUDIT_RETENTION_DAYS = {
+    action.strip(): int(days)
+    for action, days in (
+        item.split(':') for item in os.environ.get('AUDIT_RETENTION_DAYS', 'view:180').split(',') if item.strip()
+    )
+}
+AUDIT_ARCHIVE_DIR = os.environ.get('AUDIT_ARCHIVE_DIR') or str(BASE_DIR / 'archive' / 'audit')
+
+# Background donation payment settlement threads per process (0 = settle inline)
+PAYMENT_SETTLEMENT_WORKERS = int(os.environ.get('PAYMENT_SETTLEMENT_WORKERS', 4))
+
+# Payment gateway: 'mock' (in-process) or 'http' (PAYMENT_GATEWAY_URL, e.g. the
+# local stub started with `python manage.py run_payment_stub`)
+PAYMENT_GATEWAYS = {
+    'mock': 'apps.donations.payment.MockPaymentProcessor',
+    'http': 'apps.donations.payment.HTTPPaymentGateway',
+}
+PAYMENT_GATEWAY = os.environ.get('PAYMENT_GATEWAY', 'mock')
+PAYMENT_GATEWAY_OPTIONS = {
+    'base_url': os.environ.get('PAYMENT_GATEWAY_URL', 'http://127.0.0.1:8765'),
+    'api_key': os.environ.get('PAYMENT_GATEWAY_API_KEY', ''),
+    'connect_timeout': float(os.environ.get('PAYMENT_GATEWAY_CONNECT_TIMEOUT', 3.05)),
+    'read_timeout': float(os.environ.get('PAYMENT_GATEWAY_READ_TIMEOUT', 10)),
+    'max_retries': int(os.environ.get('PAYMENT_GATEWAY_MAX_RETRIES', 2)),
+    'pool_size': int(os.environ.get('PAYMENT_GATEWAY_POOL_SIZE', PAYMENT_SETTLEMENT_WORKERS or 1)),
+}
+
 # Rate limiting
 RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True') == 'True'
 
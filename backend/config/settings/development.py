@@ -35,6 +35,18 @@ else:
         }
     }
 
+# Optional read replica, e.g. a second local SQLite or Postgres database
+# (python manage.py migrate --database replica); tests mirror the primary
+if os.environ.get('REPLICA_DATABASE_URL') and dj_database_url:
+    DATABASES[DATABASE_REPLICA_ALIAS] = dj_database_url.parse(
+        os.environ['REPLICA_DATABASE_URL'],
+        conn_max_age=600,
+    )
+    DATABASES[DATABASE_REPLICA_ALIAS]['TEST'] = {'MIRROR': 'default'}
+
+# Report endpoints that exceed their query budget (QUERY_BUDGET_MODE=raise in CI)
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'warn')
+
 # Email backend for development (console)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
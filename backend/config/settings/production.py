@@ -19,6 +19,15 @@ DATABASES = {
     )
 }
 
+# Optional read replica (see DATABASE_REPLICA_ALIAS); tests mirror the primary
+if os.environ.get('REPLICA_DATABASE_URL'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = dj_database_url.parse(
+        os.environ['REPLICA_DATABASE_URL'],
+        conn_max_age=600,
+        ssl_require=True,
+    )
+    DATABASES[DATABASE_REPLICA_ALIAS]['TEST'] = {'MIRROR': 'default'}
+
 # Security settings for production
 SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'True') == 'True'
 SESSION_COOKIE_SECURE = True
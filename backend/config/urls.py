@@ -6,7 +6,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from apps.core.views import health_check
+from apps.core.views import health_check, meta, metrics
 
 urlpatterns = [
     # Admin
@@ -15,6 +15,12 @@ urlpatterns = [
     # Health check
     path('api/health/', health_check, name='health-check'),
     
+    # Prometheus metrics (admin only)
+    path('api/metrics/', metrics, name='metrics'),
+    
+    # Enums and quick resources for frontend bootstrap
+    path('api/meta/', meta, name='meta'),
+    
     # Authentication
     path('api/auth/', include('apps.authentication.urls')),
     
@@ -0,0 +1,33 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+from cryptography.fernet import Fernet
+from django.core.cache import cache as default_cache
+
+TEST_ENCRYPTION_KEY = Fernet.generate_key().decode()
+
+
+@pytest.fixture(autouse=True)
+def encryption_key(settings):
+    """A real Fernet key: tests run with DEBUG off, where the placeholder key is refused."""
+    settings.ENCRYPTION_KEY = TEST_ENCRYPTION_KEY
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(settings):
+    """
+    An empty per-process cache for each test: the default file cache
+    outlives the test run, and would carry throttle counts and cached
+    catalog responses from one test (and run) to the next.
+    """
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tests',
+        }
+    }
+    default_cache.clear()
+    yield default_cache
+    default_cache.clear()
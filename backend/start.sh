@@ -9,6 +9,9 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+# Gunicorn workers must share the catalog cache to see each other's invalidations
+export CACHE_BACKEND="${CACHE_BACKEND:-file}"
+
 echo "Starting Gunicorn server..."
 gunicorn config.wsgi:application \
     --bind 0.0.0.0:8000 \